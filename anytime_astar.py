@@ -0,0 +1,229 @@
+"""
+Anytime repairing A* (ARA*) with a deadline
+-------------------------------------------
+An interactive caller often needs some path within a frame budget, even one
+that is a little too long, more than it needs the best path later. ARA*
+starts as a weighted A*, ordering the open list by g + w * h with w > 1.
+That finds a path quickly, and its cost is at most w times the optimum. The
+search then lowers w step by step and repairs the previous search instead
+of starting again:
+
+ • nodes whose g improved after they were expanded are kept in an INCONS
+   list, and only those (plus the open list) are searched again;
+ • everything else keeps the g values and parents it already has.
+
+The bound reported with each path is min(w, cost / lowest g + h left to
+search). That is a proven limit on how far the path can be from optimal,
+and it is often much tighter than w. A bound of 1 means the path is optimal.
+
+AnytimeAStar works on any states given a neighbour function and a heuristic.
+Its search(deadline) stops once time.perf_counter() passes the deadline and
+returns the best path so far. The search state is kept, so calling it again
+(say on the next frame) carries on improving:
+
+    planner = anytime_grid_planner(grid, (0, 0), (999, 999))
+    path, bound = planner.search(time.perf_counter() + 0.010)  # 10 ms budget
+
+anytime_astar_search() does the same for the graphs astar_core.astar_search
+takes (a Graph of Nodes or a CSRGraph).
+"""
+
+import heapq
+import time
+from itertools import count
+
+from astar_core import node_manhattan, position_heuristic
+from grid_astar import heuristic as grid_heuristic
+
+INF = float('inf')
+INITIAL_WEIGHT = 2.5  # first pass: path cost at most 2.5x the optimum
+WEIGHT_STEP = 0.5     # how much w is lowered after each pass
+CHECK_EVERY = 64      # expansions between clock checks
+
+
+class AnytimeAStar:
+    def __init__(self, neighbors, heuristic, start, goal, weight=INITIAL_WEIGHT, weight_step=WEIGHT_STEP):
+        """
+        :param neighbors: neighbors(state) -> iterable of (neighbor, cost), costs > 0.
+        :param heuristic: heuristic(state) -> admissible estimate of the cost to goal.
+        :param weight: starting inflation of the heuristic (>= 1).
+        :param weight_step: amount w is lowered between passes.
+        """
+        self.neighbors = neighbors
+        self.heuristic = heuristic
+        self.start = start
+        self.goal = goal
+        self.weight = max(1.0, weight)
+        self.weight_step = weight_step
+        self.h = {}  # heuristic values computed so far
+        self.g = {start: 0}
+        self.parent = {start: None}
+        self.open = {start}    # states waiting in the open list (heap entries may be stale)
+        self.closed = set()    # states expanded in the current pass
+        self.incons = set()    # closed states whose g improved during the pass
+        self.heap = []
+        self.tie = count()
+        self.push(start)
+        self.path = None       # best path found so far
+        self.cost = INF        # its cost
+        self.bound = INF       # cost <= bound * optimal cost
+        self.expansions = 0
+        self.done = False      # the path is proven optimal, or there is no path
+
+    def h_of(self, state):
+        """Heuristic value of state (cached)."""
+        value = self.h.get(state)
+        if value is None:
+            value = self.h[state] = self.heuristic(state)
+        return value
+
+    def push(self, state):
+        """
+        Add state to the heap keyed by g + w * h. Ties go to the smaller h (nearer
+        the goal); g is stored to spot stale entries.
+        """
+        g = self.g[state]
+        h = self.h_of(state)
+        heapq.heappush(self.heap, (g + self.weight * h, h, next(self.tie), g, state))
+
+    def improve_path(self, deadline):
+        """
+        One weighted A* pass from the current open list. Returns False if the
+        deadline came first (the pass can be resumed later), True once it is finished.
+        """
+        g, parent, heap = self.g, self.parent, self.heap
+        open_states, closed, incons = self.open, self.closed, self.incons
+        goal = self.goal
+        while heap:
+            key, _, _, state_g, state = heap[0]
+            if state not in open_states or state_g != g[state]:
+                heapq.heappop(heap)  # superseded by a cheaper entry, or already expanded
+                continue
+            if g.get(goal, INF) <= key:
+                return True  # nothing left in the open list can improve the goal at this w
+            if deadline is not None and self.expansions % CHECK_EVERY == 0 and time.perf_counter() >= deadline:
+                return False
+            heapq.heappop(heap)
+            open_states.discard(state)
+            closed.add(state)
+            self.expansions += 1
+            for neighbor, cost in self.neighbors(state):
+                new_g = state_g + cost
+                if new_g < g.get(neighbor, INF):
+                    g[neighbor] = new_g
+                    parent[neighbor] = state
+                    if neighbor in closed:
+                        incons.add(neighbor)  # revisited in the next pass, not this one
+                    else:
+                        open_states.add(neighbor)
+                        self.push(neighbor)
+        return True
+
+    def publish(self):
+        """Record the path to the goal and its suboptimality bound after a finished pass."""
+        if self.goal not in self.g:
+            return
+        path = []
+        state = self.goal
+        while state is not None:
+            path.append(state)
+            state = self.parent[state]
+        self.path = path[::-1]
+        self.cost = self.g[self.goal]
+        lowest = min((self.g[state] + self.h_of(state) for state in self.open | self.incons), default=INF)
+        self.bound = 1.0 if self.cost <= lowest else min(self.weight, self.cost / lowest)
+
+    def search(self, deadline=None):
+        """
+        Improve the path until time.perf_counter() reaches deadline (None: until optimal).
+        Returns (path, bound); path is None if no pass has finished yet or there is no path.
+        """
+        while not self.done:
+            if not self.improve_path(deadline):
+                break  # out of time; the next call resumes this pass
+            self.publish()
+            if self.path is None or self.bound <= 1 or self.weight <= 1:
+                self.done = True
+                if self.path is not None:
+                    self.bound = 1.0
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            # Next pass: lower w, reopen the inconsistent states and re-key the open list
+            self.weight = max(1.0, self.weight - self.weight_step)
+            self.open |= self.incons
+            self.incons = set()
+            self.closed = set()
+            self.heap = []
+            for state in self.open:
+                self.push(state)
+        return self.path, self.bound
+
+
+# --------------------------
+# Graphs (as taken by astar_core.astar_search)
+# --------------------------
+def anytime_astar_search(graph, start, goal, deadline=None, weight=INITIAL_WEIGHT, heuristic=None):
+    """
+    ARA* on an astar_core.Graph (start and goal are Nodes) or a CSRGraph (node
+    names, astar_core.position_heuristic as the default heuristic).
+    :param deadline: time.perf_counter() value to stop at (None: run until optimal).
+    :param heuristic: heuristic(node, goal), as for astar_core.astar_search.
+    Returns (path, bound).
+    """
+    if hasattr(graph, "offsets"):
+        planner = csr_planner(graph, start, goal, weight, heuristic)
+        path, bound = planner.search(deadline)
+        return (None if path is None else [graph.name_of(node) for node in path]), bound
+    if heuristic is None:
+        heuristic = node_manhattan
+    planner = AnytimeAStar(graph.get_neighbors, lambda node: heuristic(node, goal), start, goal, weight)
+    return planner.search(deadline)
+
+
+def csr_planner(csr, start, goal, weight=INITIAL_WEIGHT, heuristic=None):
+    """AnytimeAStar over the node ids of a CSRGraph (start and goal are names)."""
+    start, goal = csr.id_of(start), csr.id_of(goal)
+    offsets = memoryview(csr.offsets)
+    targets = memoryview(csr.targets)
+    weights = memoryview(csr.weights)
+
+    def neighbors(node):
+        start_edge, end_edge = offsets[node], offsets[node + 1]
+        return zip(targets[start_edge:end_edge], weights[start_edge:end_edge])
+
+    if heuristic is None:
+        heuristic = position_heuristic(csr)
+
+    def node_heuristic(node):
+        return heuristic(node, goal)
+    return AnytimeAStar(neighbors, node_heuristic, start, goal, weight)
+
+
+# --------------------------
+# Occupancy grids (as taken by grid_astar.astar_steps)
+# --------------------------
+class GridPlanner(AnytimeAStar):
+    def __init__(self, grid, start, goal, weight=INITIAL_WEIGHT):
+        """AnytimeAStar over the flat cell indices of an OccupancyGrid; paths are (x, y) positions."""
+        self.grid = grid
+        cells = grid.flat_cells()
+        offsets = grid.neighbor_offsets
+
+        def neighbors(index):
+            return [(index + offset, 1) for offset in offsets if not cells[index + offset]]
+
+        def heuristic(index):
+            return grid_heuristic(grid.position(index), goal)
+
+        super().__init__(neighbors, heuristic, grid.index(start), grid.index(goal), weight)
+
+    def search(self, deadline=None):
+        """As AnytimeAStar.search, with the path as (x, y) positions."""
+        path, bound = super().search(deadline)
+        return (None if path is None else [self.grid.position(index) for index in path]), bound
+
+
+def anytime_grid_planner(grid, start, goal, weight=INITIAL_WEIGHT):
+    """A resumable ARA* planner for a grid; call .search(deadline) once per frame."""
+    return GridPlanner(grid, start, goal, weight)
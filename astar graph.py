@@ -1,8 +1,15 @@
 import pygame
-import heapq
 import sys
 import random
 
+import astar_core
+from astar_core import manhattan
+from decision_log import DecisionLog, SUMMARY, STEPS, DETAIL
+from incremental_astar import LPAStar
+from k_shortest import k_shortest_paths
+from path_cache import PathCache
+from spatial_index import SpatialGrid
+
 pygame.init()
 
 # --------------------------
@@ -32,19 +39,39 @@ ORANGE = (255, 165, 0)      # Goal node
 LIGHT_BLUE = (173, 216, 230)# Open set in A*
 YELLOW = (255, 255, 0)      # Current node
 DARK_GRAY = (100, 100, 100)
+# Alternative routes, from the second best onwards
+ALTERNATIVE_COLORS = [(160, 32, 240), (0, 160, 160), (200, 120, 0), (120, 120, 120)]
 
 # Speed of A* visualization (frames per second)
 ANIMATION_SPEED = 5
 
+# Decision log settings: how many recent messages to keep, how much detail
+# to record (see decision_log.py) and whether to also print them
+LOG_CAPACITY = 1000
+LOG_LEVEL = DETAIL
+LOG_ECHO = False
+
+# How many ranked paths the 'k' key shows (the best one included)
+K_PATHS = 3
+
 # --------------------------
 # Global Variables for Graph and UI
 # --------------------------
-nodes = []       # List of Node objects
-edges = []       # List of Edge objects
+graph = astar_core.Graph()  # Search core: nodes, edges and the adjacency map
+nodes = graph.nodes          # List of Node objects
+edges = graph.edges          # List of Edge objects
+adjacency = graph.adjacency  # Node -> list of Edge objects touching it (kept in sync with nodes/edges)
+spatial = SpatialGrid(cell_size=50, edge_tolerance=10)  # Finds the node/edge under the cursor
 buttons = []     # List of UI Button objects
-log_messages = []  # Log panel messages
+decision_log = DecisionLog(LOG_CAPACITY, LOG_LEVEL, LOG_ECHO)  # Log panel messages (ring buffer)
+path_cache = PathCache(graph)  # Paths from earlier runs, until the graph changes (graph.version)
 
 final_path = None  # Will hold the final A* path once computed
+alternative_paths = []  # (cost, path) pairs ranked by cost, shown after pressing 'k'
+
+# Incremental planner (LPA*) created after A* has run; it repairs final_path
+# live as the graph is edited, until the start or goal changes
+planner = None
 
 # Modes for user interaction
 # Modes: "add_node", "add_edge", "select_start", "select_goal", "edit_value", "delete", "drag", "none"
@@ -74,9 +101,8 @@ clock = pygame.time.Clock()
 # Helper Functions
 # --------------------------
 def log_decision(message):
-    """Append a log message to the log_messages list and print it."""
-    log_messages.append(message)
-    print(message)
+    """Record a user-facing message in the decision log."""
+    decision_log.add(SUMMARY, message)
 
 
 def draw_text(surface, text, pos, color=BLACK):
@@ -85,11 +111,6 @@ def draw_text(surface, text, pos, color=BLACK):
     surface.blit(text_surface, pos)
 
 
-def manhattan(p1, p2):
-    """Calculate Manhattan distance between two points."""
-    return abs(p1[0] - p2[0]) + abs(p1[1] - p2[1])
-
-
 def update_all_values():
     """
     Recalculate values for all nodes and default edges.
@@ -110,20 +131,11 @@ def update_all_values():
 # --------------------------
 # Classes for Graph Elements and UI
 # --------------------------
-class Node:
-    next_id = 1  # For labeling nodes
-
+class Node(astar_core.Node):
     def __init__(self, pos):
-        self.id = Node.next_id
-        Node.next_id += 1
-        self.pos = pos  # (x, y) tuple in drawing area coordinates
+        super().__init__(pos)  # pos is an (x, y) tuple in drawing area coordinates
         self.radius = 15
-        self.g = None  # Actual cost (can be manually overridden)
-        self.h = None  # Heuristic cost (can be manually overridden)
-        self.f = None  # g + h (computed automatically)
         self.drag_offset = (0, 0)  # For dragging
-        # For A* algorithm use (not persistent for editing)
-        self.parent = None
 
     def draw(self, surface):
         """Draw the node as a circle with its label and cost values."""
@@ -161,18 +173,7 @@ class Node:
         return dx * dx + dy * dy <= self.radius * self.radius
 
 
-class Edge:
-    def __init__(self, node1, node2, cost=None):
-        self.node1 = node1
-        self.node2 = node2
-        # If cost is not provided, use Manhattan distance and mark as default.
-        if cost is None:
-            self.cost = manhattan(node1.pos, node2.pos)
-            self.default = True
-        else:
-            self.cost = cost
-            self.default = False
-
+class Edge(astar_core.Edge):
     def draw(self, surface):
         """Draw the edge as a line between node1 and node2 with cost label at the midpoint."""
         # If this is a default edge, update its cost based on current positions.
@@ -217,6 +218,64 @@ class Button:
         return self.rect.collidepoint(pos)
 
 
+# --------------------------
+# Graph Editing (keeps the adjacency map in sync)
+# --------------------------
+def add_node(node):
+    """Add a node to the graph."""
+    graph.add_node(node)
+    spatial.add_node(node)
+
+
+def add_edge(edge):
+    """Add an edge to the graph and index it under both of its nodes."""
+    graph.add_edge(edge)
+    spatial.add_edge(edge)
+    if planner is not None:
+        planner.edge_changed(edge)
+
+
+def remove_edge(edge):
+    """Remove an edge from the graph and from both nodes' adjacency lists."""
+    graph.remove_edge(edge)
+    spatial.remove_edge(edge)
+    if planner is not None:
+        planner.edge_changed(edge)
+
+
+def remove_node(node):
+    """Remove a node together with every edge touching it."""
+    former_neighbors = [neighbor for neighbor, _ in graph.get_neighbors(node)]
+    for edge in adjacency[node]:
+        spatial.remove_edge(edge)
+    spatial.remove_node(node)
+    graph.remove_node(node)
+    if planner is not None:
+        planner.node_removed(node, former_neighbors)
+
+
+def clear_graph():
+    """Remove all nodes and edges."""
+    global planner
+    graph.clear()
+    spatial.clear()
+    planner = None
+
+
+def replan():
+    """After a graph edit, let the incremental planner repair the path (once A* has been run)."""
+    global final_path, alternative_paths
+    alternative_paths = []  # the edit may have changed them; press 'k' again
+    if planner is None:
+        return
+    expanded_before = planner.expansions
+    final_path = planner.compute_shortest_path()
+    # Show the repaired costs on the nodes
+    for node, g in planner.g.items():
+        node.g = g
+    decision_log.add(STEPS, "Replanned after edit: {} nodes re-expanded.", planner.expansions - expanded_before)
+
+
 # --------------------------
 # In-Game Popup for Editing Values
 # --------------------------
@@ -255,69 +314,27 @@ def popup_edit_value(initial_value, prompt="Enter new value:"):
 # A* Algorithm on Graph (Step-by-Step)
 # --------------------------
 def get_neighbors(node):
-    """Return a list of tuples (neighbor, edge_cost) for the given node using the global edges list."""
-    neighbors = []
-    for edge in edges:
-        if edge.node1 == node:
-            neighbors.append((edge.node2, edge.cost))
-        elif edge.node2 == node:
-            neighbors.append((edge.node1, edge.cost))
-    return neighbors
+    """Return a list of tuples (neighbor, edge_cost) for the given node using the adjacency map."""
+    return graph.get_neighbors(node)
 
 
 def astar_search(start, goal, update_callback=None):
-    """Perform A* search on the graph. Uses the global nodes/edges.
+    """Perform A* search on the graph (see astar_core.astar_search).
        update_callback is called after each step for visualization."""
-    open_list = []
-    closed_set = set()
+    return astar_core.astar_search(graph, start, goal, update_callback, log=decision_log)
 
-    # Initialize: set all nodes' g to infinity, h to Manhattan distance, and f to infinity.
-    for node in nodes:
-        node.g = float('inf')
-        node.h = manhattan(node.pos, goal.pos)
-        node.f = float('inf')
-        node.parent = None
-    start.g = 0
-    start.f = start.h  # f = g + h
-
-    heapq.heappush(open_list, (start.f, start.id, start))
-    log_decision(f"Starting A* search from node {start.id} to node {goal.id}. The algorithm will explore nodes to determine the lowest cost path.")
-
-    while open_list:
-        current = heapq.heappop(open_list)[2]
-        log_decision(f"Processing node {current.id}: f = {current.f} (total estimated cost = g + h), where g = {current.g} and h = {current.h}.")
-
-        if update_callback:
-            update_callback(current, open_list, closed_set)
-
-        if current == goal:
-            log_decision(f"Goal reached at node {current.id}: reconstructing path.")
-            path = []
-            while current:
-                path.append(current)
-                current = current.parent
-            return path[::-1]
-
-        closed_set.add(current)
-
-        for neighbor, cost in get_neighbors(current):
-            if neighbor in closed_set:
-                log_decision(f"Skipping neighbor node {neighbor.id}: already evaluated.")
-                continue
 
-            tentative_g = current.g + cost
-            if tentative_g < neighbor.g:
-                neighbor.parent = current
-                neighbor.g = tentative_g
-                neighbor.h = manhattan(neighbor.pos, goal.pos)
-                neighbor.f = neighbor.g + neighbor.h
-                log_decision(f"Updating neighbor node {neighbor.id}: new g = {neighbor.g}, h = {neighbor.h}, f = {neighbor.f}.")
-                heapq.heappush(open_list, (neighbor.f, neighbor.id, neighbor))
-            else:
-                log_decision(f"Skipping neighbor node {neighbor.id}: existing path has lower cost (g = {neighbor.g}) than tentative g = {tentative_g}.")
-
-    log_decision("No path found: the algorithm could not find a viable route.")
-    return None
+def show_alternative_paths():
+    """Find the K_PATHS cheapest loopless paths from start to goal (Yen's algorithm) and list them."""
+    global alternative_paths
+    if start_node is None or goal_node is None:
+        log_decision("Error: Select both start and goal nodes before asking for alternative paths.")
+        return
+    alternative_paths = k_shortest_paths(graph, start_node, goal_node, K_PATHS)
+    if not alternative_paths:
+        log_decision("No path found between the start and goal nodes.")
+    for rank, (cost, path) in enumerate(alternative_paths, 1):
+        log_decision(f"Path {rank} (cost {cost:g}): " + " -> ".join(str(node.id) for node in path))
 
 
 # --------------------------
@@ -382,6 +399,15 @@ def draw_drawing_area():
     for node in nodes:
         node.draw(screen)
 
+    # Alternatives underneath the best path, each offset a little so shared edges stay visible
+    for rank, (_, path) in reversed(list(enumerate(alternative_paths[1:]))):
+        color = ALTERNATIVE_COLORS[rank % len(ALTERNATIVE_COLORS)]
+        shift = 4 * (rank + 1)
+        for i in range(len(path) - 1):
+            start_pos = (path[i].pos[0] + shift, path[i].pos[1] + shift)
+            end_pos = (path[i + 1].pos[0] + shift, path[i + 1].pos[1] + shift)
+            pygame.draw.line(screen, color, start_pos, end_pos, 3)
+
     if final_path is not None and len(final_path) > 1:
         for i in range(len(final_path) - 1):
             start_pos = final_path[i].pos
@@ -396,7 +422,7 @@ def draw_log_panel():
     pygame.draw.rect(screen, BLACK, log_rect, 2)
     line_height = FONT.get_linesize()
     max_lines = LOG_PANEL_HEIGHT // line_height
-    messages = log_messages[-max_lines:]
+    messages = decision_log.recent(max_lines)  # only the visible lines are formatted
     for i, msg in enumerate(messages):
         draw_text(screen, msg, (5, TOP_PANEL_HEIGHT + DRAWING_AREA_HEIGHT + i * line_height))
 
@@ -405,7 +431,7 @@ def draw_log_panel():
 # Main Event Loop
 # --------------------------
 def main_loop():
-    global current_mode, edge_start_node, dragging_node, start_node, goal_node, nodes, edges, log_messages, final_path
+    global current_mode, edge_start_node, dragging_node, start_node, goal_node, final_path, planner, alternative_paths
     running = True
     astar_path = None
 
@@ -421,24 +447,39 @@ def main_loop():
                     for btn in buttons:
                         if btn.is_clicked(pos):
                             if btn.mode == "reset":
-                                nodes.clear()
-                                edges.clear()
+                                clear_graph()
                                 start_node = None
                                 goal_node = None
                                 final_path = None
-                                log_messages.clear()
+                                alternative_paths = []
+                                decision_log.clear()
                                 log_decision("Graph reset: all nodes and edges cleared.")
                             elif btn.mode == "run_astar":
                                 if start_node is None or goal_node is None:
                                     log_decision("Error: Select both start and goal nodes before running A*.")
                                 else:
-                                    log_decision("Running A* algorithm...")
-                                    astar_path = astar_search(start_node, goal_node, update_callback=astar_update)
-                                    final_path = astar_path
-                                    if final_path:
-                                        log_decision("A* algorithm completed: path found.")
+                                    cached = path_cache.lookup(start_node, goal_node)
+                                    if cached is not None:
+                                        # Same start, goal and graph as an earlier run: show its result again
+                                        cost, final_path = cached
+                                        if final_path:
+                                            log_decision(f"Graph unchanged: reusing the cached path (cost {cost:g}).")
+                                        else:
+                                            log_decision("Graph unchanged: still no path found.")
                                     else:
-                                        log_decision("A* algorithm completed: no path found.")
+                                        log_decision("Running A* algorithm...")
+                                        astar_path = astar_search(start_node, goal_node, update_callback=astar_update)
+                                        final_path = astar_path
+                                        path_cache.store(start_node, goal_node,
+                                                         goal_node.g if final_path else float('inf'), final_path)
+                                        if final_path:
+                                            log_decision("A* algorithm completed: path found.")
+                                        else:
+                                            log_decision("A* algorithm completed: no path found.")
+                                    # From now on edits are repaired incrementally
+                                    if cached is None or planner is None:
+                                        planner = LPAStar(graph, start_node, goal_node)
+                                        planner.compute_shortest_path()
                             else:
                                 current_mode = btn.mode
                             break
@@ -446,77 +487,84 @@ def main_loop():
 
                 if current_mode == "add_node":
                     new_node = Node((pos[0], pos[1]))
-                    nodes.append(new_node)
+                    add_node(new_node)
                     log_decision(f"Added node {new_node.id} at {new_node.pos}.")
                 elif current_mode == "add_edge":
-                    for node in nodes:
-                        if node.is_clicked(pos):
-                            if edge_start_node is None:
-                                edge_start_node = node
-                                log_decision(f"Selected node {node.id} as start for new edge.")
-                            else:
-                                if node != edge_start_node:
-                                    new_edge = Edge(edge_start_node, node)
-                                    edges.append(new_edge)
-                                    log_decision(f"Created edge between node {edge_start_node.id} and node {node.id} with cost {new_edge.cost}.")
-                                    edge_start_node = None
-                            break
+                    node = spatial.node_at(pos)
+                    if node is not None:
+                        if edge_start_node is None:
+                            edge_start_node = node
+                            log_decision(f"Selected node {node.id} as start for new edge.")
+                        else:
+                            if node != edge_start_node:
+                                new_edge = Edge(edge_start_node, node)
+                                add_edge(new_edge)
+                                log_decision(f"Created edge between node {edge_start_node.id} and node {node.id} with cost {new_edge.cost}.")
+                                edge_start_node = None
+                                replan()
                 elif current_mode == "delete":
-                    deleted = False
-                    for node in nodes:
-                        if node.is_clicked(pos):
-                            log_decision(f"Deleted node {node.id}.")
-                            edges = [edge for edge in edges if edge.node1 != node and edge.node2 != node]
-                            if node == start_node:
-                                start_node = None
-                            if node == goal_node:
-                                goal_node = None
-                            nodes.remove(node)
-                            deleted = True
-                            break
-                    if not deleted:
-                        for edge in edges:
-                            if edge.is_clicked(pos):
-                                log_decision(f"Deleted edge between node {edge.node1.id} and node {edge.node2.id}.")
-                                edges.remove(edge)
-                                break
+                    node = spatial.node_at(pos)
+                    if node is not None:
+                        log_decision(f"Deleted node {node.id}.")
+                        if node == start_node or node == goal_node:
+                            planner = None
+                            alternative_paths = []
+                        if node == start_node:
+                            start_node = None
+                        if node == goal_node:
+                            goal_node = None
+                        remove_node(node)
+                        replan()
+                    else:
+                        edge = spatial.edge_at(pos)
+                        if edge is not None:
+                            log_decision(f"Deleted edge between node {edge.node1.id} and node {edge.node2.id}.")
+                            remove_edge(edge)
+                            replan()
                 elif current_mode == "edit_value":
-                    for node in nodes:
-                        if node.is_clicked(pos):
-                            if pos[1] < node.pos[1]:
-                                new_val = popup_edit_value(node.g if node.g is not None else 0, prompt=f"Enter new g for node {node.id}:")
-                                node.g = new_val
-                                log_decision(f"Updated node {node.id} g value to {node.g}.")
-                            else:
-                                new_val = popup_edit_value(node.h if node.h is not None else 0, prompt=f"Enter new h for node {node.id}:")
-                                node.h = new_val
-                                log_decision(f"Updated node {node.id} h value to {node.h}.")
-                            break
-                    for edge in edges:
-                        if edge.is_clicked(pos):
-                            new_cost = popup_edit_value(edge.cost, prompt=f"Enter new cost for edge between {edge.node1.id} and {edge.node2.id}:")
-                            edge.cost = new_cost
-                            edge.default = False
-                            log_decision(f"Updated cost for edge between node {edge.node1.id} and node {edge.node2.id} to {edge.cost}.")
-                            break
+                    node = spatial.node_at(pos)
+                    if node is not None:
+                        if pos[1] < node.pos[1]:
+                            new_val = popup_edit_value(node.g if node.g is not None else 0, prompt=f"Enter new g for node {node.id}:")
+                            node.g = new_val
+                            log_decision(f"Updated node {node.id} g value to {node.g}.")
+                        else:
+                            new_val = popup_edit_value(node.h if node.h is not None else 0, prompt=f"Enter new h for node {node.id}:")
+                            node.h = new_val
+                            log_decision(f"Updated node {node.id} h value to {node.h}.")
+                    edge = spatial.edge_at(pos)
+                    if edge is not None:
+                        new_cost = popup_edit_value(edge.cost, prompt=f"Enter new cost for edge between {edge.node1.id} and {edge.node2.id}:")
+                        edge.cost = new_cost
+                        edge.default = False
+                        graph.touch()
+                        log_decision(f"Updated cost for edge between node {edge.node1.id} and node {edge.node2.id} to {edge.cost}.")
+                        if planner is not None:
+                            planner.edge_changed(edge)
+                            replan()
                 elif current_mode == "select_start":
-                    for node in nodes:
-                        if node.is_clicked(pos):
-                            start_node = node
-                            log_decision(f"Node {node.id} set as START node.")
-                            break
+                    node = spatial.node_at(pos)
+                    if node is not None:
+                        start_node = node
+                        planner = None
+                        alternative_paths = []
+                        log_decision(f"Node {node.id} set as START node.")
                 elif current_mode == "select_goal":
-                    for node in nodes:
-                        if node.is_clicked(pos):
-                            goal_node = node
-                            log_decision(f"Node {node.id} set as GOAL node.")
-                            break
+                    node = spatial.node_at(pos)
+                    if node is not None:
+                        goal_node = node
+                        planner = None
+                        alternative_paths = []
+                        log_decision(f"Node {node.id} set as GOAL node.")
                 elif current_mode == "drag":
-                    for node in nodes:
-                        if node.is_clicked(pos):
-                            dragging_node = node
-                            dragging_node.drag_offset = (node.pos[0] - pos[0], node.pos[1] - pos[1])
-                            break
+                    node = spatial.node_at(pos)
+                    if node is not None:
+                        dragging_node = node
+                        dragging_node.drag_offset = (node.pos[0] - pos[0], node.pos[1] - pos[1])
+
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_k:
+                    show_alternative_paths()
 
             elif event.type == pygame.MOUSEBUTTONUP:
                 if current_mode == "drag":
@@ -530,8 +578,14 @@ def main_loop():
                     new_x = max(dragging_node.radius, new_x)
                     new_x = min(WINDOW_WIDTH - dragging_node.radius, new_x)
                     dragging_node.pos = (new_x, new_y)
+                    graph.touch()
+                    spatial.move_node(dragging_node, adjacency[dragging_node])
                     # Recalculate heuristic and default edge costs for all nodes and edges
                     update_all_values()
+                    # Repair the path for the moved node so it updates live while dragging
+                    if planner is not None:
+                        planner.node_moved(dragging_node)
+                        replan()
 
         screen.fill(WHITE)
         draw_top_panel()
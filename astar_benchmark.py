@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Headless benchmark for astar_search on large random geometric graphs
+--------------------------------------------------------------------
+Builds graphs of the requested sizes with graph_generators.random_geometric_graph,
+runs a batch of random start/goal queries with astar_core.astar_search and reports
+build time, node expansions per second and memory use.
+
+With --landmarks N the same queries are also answered with the ALT landmark
+heuristic and with bidirectional A* (see landmarks.py), so their expansions can be
+compared with the plain Manhattan search. --cost-noise stretches every edge cost by
+a random factor, imitating user-edited costs that make Manhattan distance a weak bound.
+
+Usage:  python astar_benchmark.py [--nodes 1000 10000 100000] [--queries N] [--degree D]
+                                  [--landmarks N] [--cost-noise F] [--seed N]
+"""
+
+import argparse
+import random
+import sys
+import time
+
+import astar_core
+from graph_generators import random_geometric_graph
+from landmarks import LandmarkHeuristic, bidirectional_astar
+
+try:
+    import resource  # Unix only; used for the peak resident memory figure
+except ImportError:
+    resource = None
+
+
+def peak_memory_mb():
+    """Peak resident memory of this process in MB (None where it can't be measured)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def path_cost(graph, path):
+    """Total edge cost along a path of nodes."""
+    total = 0
+    for node, next_node in zip(path, path[1:]):
+        total += min(cost for neighbor, cost in graph.get_neighbors(node) if neighbor is next_node)
+    return total
+
+
+def run_queries(search, graph, pairs):
+    """
+    Answer every (start, goal) pair with search(start, goal, count_expansion).
+    Returns (expansions, seconds, list of path costs or None).
+    """
+    expansions = 0
+
+    def count_expansion(*args):
+        nonlocal expansions
+        expansions += 1
+
+    costs = []
+    start_time = time.perf_counter()
+    for start, goal in pairs:
+        path = search(start, goal, count_expansion)
+        costs.append(None if path is None else path_cost(graph, path))
+    return expansions, time.perf_counter() - start_time, costs
+
+
+def benchmark_size(num_nodes, queries, degree, seed, landmarks=0, cost_noise=0.0):
+    """Build one graph and time a batch of queries on it. Returns a dict of results."""
+    start_time = time.perf_counter()
+    graph = random_geometric_graph(num_nodes, average_degree=degree, seed=seed)
+    rng = random.Random(seed)
+    if cost_noise:
+        for edge in graph.edges:
+            edge.cost *= 1 + rng.random() * cost_noise
+            edge.default = False
+    build_seconds = time.perf_counter() - start_time
+    pairs = [tuple(rng.sample(graph.nodes, 2)) for _ in range(queries)]
+
+    searches = {
+        "astar": lambda s, g, cb: astar_core.astar_search(graph, s, g, update_callback=cb),
+    }
+    preprocess_seconds = None
+    if landmarks:
+        start_time = time.perf_counter()
+        landmark_heuristic = LandmarkHeuristic(graph, count=landmarks, seed=seed)
+        preprocess_seconds = time.perf_counter() - start_time
+        searches["astar+alt"] = lambda s, g, cb: astar_core.astar_search(
+            graph, s, g, update_callback=cb, heuristic=landmark_heuristic)
+        searches["bidir"] = lambda s, g, cb: bidirectional_astar(graph, s, g, update_callback=cb)
+        searches["bidir+alt"] = lambda s, g, cb: bidirectional_astar(
+            graph, s, g, heuristic=landmark_heuristic, update_callback=cb)
+
+    results = {}
+    reference = None
+    for name, search in searches.items():
+        expansions, seconds, costs = run_queries(search, graph, pairs)
+        if reference is None:
+            reference = costs
+        mismatches = sum(1 for a, b in zip(costs, reference)
+                         if (a is None) != (b is None) or (a is not None and abs(a - b) > 1e-6))
+        results[name] = {
+            "found": sum(1 for cost in costs if cost is not None),
+            "expansions": expansions,
+            "search_seconds": seconds,
+            "cost_mismatches": mismatches,
+        }
+
+    return {
+        "nodes": len(graph.nodes),
+        "edges": len(graph.edges),
+        "build_seconds": build_seconds,
+        "preprocess_seconds": preprocess_seconds,
+        "queries": queries,
+        "searches": results,
+        "peak_memory_mb": peak_memory_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark astar_search on random geometric graphs")
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="graph sizes to test (10^3 to 10^6 nodes)")
+    parser.add_argument("--queries", type=int, default=20, help="random start/goal queries per graph")
+    parser.add_argument("--degree", type=float, default=6, help="average node degree")
+    parser.add_argument("--landmarks", type=int, default=0,
+                        help="also compare ALT and bidirectional A* using this many landmarks")
+    parser.add_argument("--cost-noise", type=float, default=0.0,
+                        help="multiply each edge cost by a random factor in [1, 1 + F]")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+
+    print(f"{'nodes':>9} {'edges':>9} {'search':>10} {'found':>7} {'expansions':>11} "
+          f"{'search s':>9} {'exp/s':>10} {'wrong':>6} {'peak MB':>8}")
+    for num_nodes in args.nodes:
+        result = benchmark_size(num_nodes, args.queries, args.degree, args.seed,
+                                args.landmarks, args.cost_noise)
+        memory = f"{result['peak_memory_mb']:.0f}" if result["peak_memory_mb"] is not None else "n/a"
+        for name, search in result["searches"].items():
+            rate = search["expansions"] / search["search_seconds"] if search["search_seconds"] else 0
+            print(f"{result['nodes']:>9} {result['edges']:>9} {name:>10} "
+                  f"{search['found']:>3}/{result['queries']:<3} {search['expansions']:>11} "
+                  f"{search['search_seconds']:>9.2f} {rate:>10,.0f} {search['cost_mismatches']:>6} {memory:>8}")
+        extra = f", landmarks {result['preprocess_seconds']:.2f} s" if result["preprocess_seconds"] is not None else ""
+        print(f"{'':>9} build {result['build_seconds']:.2f} s{extra}")
+
+
+if __name__ == "__main__":
+    main()
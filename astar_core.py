@@ -0,0 +1,284 @@
+"""
+A* search core for the graph teaching tool
+------------------------------------------
+The graph model and search from "astar graph.py" without any pygame/display
+dependency, so they can be imported, tested and benchmarked on large
+generated graphs. "astar graph.py" subclasses Node and Edge to add drawing.
+
+astar_search also accepts a csr_graph.CSRGraph (for example a road network
+loaded with graph_loaders.load_graph); see astar_search_csr.
+"""
+
+import heapq
+
+from decision_log import OFF, SUMMARY, STEPS, DETAIL
+
+
+def manhattan(p1, p2):
+    """Calculate Manhattan distance between two points."""
+    return abs(p1[0] - p2[0]) + abs(p1[1] - p2[1])
+
+
+# --------------------------
+# Graph Elements
+# --------------------------
+class Node:
+    next_id = 1  # For labeling nodes
+
+    def __init__(self, pos):
+        self.id = Node.next_id
+        Node.next_id += 1
+        self.pos = pos  # (x, y) position
+        self.g = None  # Actual cost (can be manually overridden)
+        self.h = None  # Heuristic cost (can be manually overridden)
+        self.f = None  # g + h (computed automatically)
+        # For A* algorithm use (not persistent for editing)
+        self.parent = None
+
+
+class Edge:
+    def __init__(self, node1, node2, cost=None):
+        self.node1 = node1
+        self.node2 = node2
+        # If cost is not provided, use Manhattan distance and mark as default.
+        if cost is None:
+            self.cost = manhattan(node1.pos, node2.pos)
+            self.default = True
+        else:
+            self.cost = cost
+            self.default = False
+
+    def other(self, node):
+        """Return the node at the other end of the edge."""
+        return self.node2 if self.node1 is node else self.node1
+
+
+class Graph:
+    """
+    Undirected graph of Node and Edge objects.
+    Keeps an adjacency map (node -> touching edges) in sync with the node and edge lists,
+    so neighbour lookups only touch the edges of one node.
+    version goes up on every change, so cached results (see path_cache.py) can tell
+    when they are stale. Code that edits an edge's cost or moves a node in place
+    should call touch().
+    """
+
+    def __init__(self):
+        self.nodes = []       # List of Node objects
+        self.edges = []       # List of Edge objects
+        self.adjacency = {}   # Node -> list of Edge objects touching it
+        self.version = 0      # Bumped on every mutation
+
+    def touch(self):
+        """Record a change made outside these methods (an edited edge cost, a moved node)."""
+        self.version += 1
+
+    def add_node(self, node):
+        """Add a node to the graph."""
+        self.nodes.append(node)
+        self.adjacency[node] = []
+        self.version += 1
+        return node
+
+    def add_edge(self, edge):
+        """Add an edge to the graph and index it under both of its nodes."""
+        self.edges.append(edge)
+        self.adjacency[edge.node1].append(edge)
+        self.adjacency[edge.node2].append(edge)
+        self.version += 1
+        return edge
+
+    def remove_edge(self, edge):
+        """Remove an edge from the graph and from both nodes' adjacency lists."""
+        self.edges.remove(edge)
+        self.adjacency[edge.node1].remove(edge)
+        self.adjacency[edge.node2].remove(edge)
+        self.version += 1
+
+    def remove_node(self, node):
+        """Remove a node together with every edge touching it."""
+        for edge in list(self.adjacency[node]):
+            self.remove_edge(edge)
+        del self.adjacency[node]
+        self.nodes.remove(node)
+        self.version += 1
+
+    def clear(self):
+        """Remove all nodes and edges (the lists are cleared in place)."""
+        self.nodes.clear()
+        self.edges.clear()
+        self.adjacency.clear()
+        self.version += 1
+
+    def get_neighbors(self, node):
+        """Return a list of tuples (neighbor, edge_cost) for the given node using the adjacency map.
+           Edges are stored (not their costs), so edited or re-costed edges are always up to date."""
+        neighbors = []
+        for edge in self.adjacency[node]:
+            if edge.node1 == node:
+                neighbors.append((edge.node2, edge.cost))
+            else:
+                neighbors.append((edge.node1, edge.cost))
+        return neighbors
+
+
+# --------------------------
+# A* Algorithm on Graph (Step-by-Step)
+# --------------------------
+def node_manhattan(node, goal):
+    """Default A* heuristic: Manhattan distance between two nodes' positions."""
+    return manhattan(node.pos, goal.pos)
+
+
+def astar_search(graph, start, goal, update_callback=None, log=None, heuristic=None):
+    """Perform A* search on the graph using its adjacency map,
+       so each expansion only looks at the edges of the current node (O(E log V) overall).
+       update_callback is called after each step for visualization.
+       log, if given, is a decision_log.DecisionLog that records each decision
+       up to its verbosity level; with no log (or level OFF) nothing is formatted or stored.
+       heuristic(node, goal) estimates the remaining cost (default: Manhattan distance;
+       see landmarks.py for tighter landmark bounds)."""
+    if hasattr(graph, "offsets"):
+        # A CSRGraph: nodes are ids/names rather than Node objects
+        return astar_search_csr(graph, start, goal, update_callback, heuristic, log)
+    if heuristic is None:
+        heuristic = node_manhattan
+    open_list = []
+    closed_set = set()
+    level = log.level if log is not None else OFF
+    steps = level >= STEPS
+    detail = level >= DETAIL
+
+    # Initialize: set all nodes' g to infinity, h to the heuristic estimate, and f to infinity.
+    for node in graph.nodes:
+        node.g = float('inf')
+        node.h = heuristic(node, goal)
+        node.f = float('inf')
+        node.parent = None
+    start.g = 0
+    start.f = start.h  # f = g + h
+
+    heapq.heappush(open_list, (start.f, start.id, start))
+    if level >= SUMMARY:
+        log.add(SUMMARY, "Starting A* search from node {} to node {}. The algorithm will explore nodes to determine the lowest cost path.", start.id, goal.id)
+
+    while open_list:
+        current = heapq.heappop(open_list)[2]
+        if steps:
+            log.add(STEPS, "Processing node {}: f = {} (total estimated cost = g + h), where g = {} and h = {}.", current.id, current.f, current.g, current.h)
+
+        if update_callback:
+            update_callback(current, open_list, closed_set)
+
+        if current == goal:
+            if level >= SUMMARY:
+                log.add(SUMMARY, "Goal reached at node {}: reconstructing path.", current.id)
+            path = []
+            while current:
+                path.append(current)
+                current = current.parent
+            return path[::-1]
+
+        closed_set.add(current)
+
+        for neighbor, cost in graph.get_neighbors(current):
+            if neighbor in closed_set:
+                if detail:
+                    log.add(DETAIL, "Skipping neighbor node {}: already evaluated.", neighbor.id)
+                continue
+
+            tentative_g = current.g + cost
+            if tentative_g < neighbor.g:
+                neighbor.parent = current
+                neighbor.g = tentative_g
+                neighbor.f = neighbor.g + neighbor.h
+                if detail:
+                    log.add(DETAIL, "Updating neighbor node {}: new g = {}, h = {}, f = {}.", neighbor.id, neighbor.g, neighbor.h, neighbor.f)
+                heapq.heappush(open_list, (neighbor.f, neighbor.id, neighbor))
+            elif detail:
+                log.add(DETAIL, "Skipping neighbor node {}: existing path has lower cost (g = {}) than tentative g = {}.", neighbor.id, neighbor.g, tentative_g)
+
+    if level >= SUMMARY:
+        log.add(SUMMARY, "No path found: the algorithm could not find a viable route.")
+    return None
+
+
+def position_heuristic(csr):
+    """
+    Default heuristic(node_id) -> estimate for a CSRGraph search towards goal_id:
+    the Manhattan distance between csr.positions times csr.heuristic_scale(),
+    which keeps it admissible whatever units the coordinates are in. Without
+    positions (or with a scale of 0) it is 0, so the search is a Dijkstra.
+    Returns a function of (node, goal).
+    """
+    scale = csr.heuristic_scale() if csr.positions is not None else 0.0
+    if not scale:
+        def heuristic(node, goal):
+            return 0
+        return heuristic
+    xs = memoryview(csr.positions[:, 0] * scale)
+    ys = memoryview(csr.positions[:, 1] * scale)
+
+    def heuristic(node, goal):
+        return abs(xs[node] - xs[goal]) + abs(ys[node] - ys[goal])
+    return heuristic
+
+
+def astar_search_csr(csr, start, goal, update_callback=None, heuristic=None, log=None):
+    """A* over a csr_graph.CSRGraph, reading its arrays directly (nothing is stored on nodes).
+       start and goal are node names (ids for unnamed graphs) and so is the returned path.
+       heuristic(node_id, goal_id) estimates the remaining cost; the default is
+       position_heuristic (scaled Manhattan distance over csr.positions, or 0).
+       update_callback is called with each node id as it is expanded.
+       log, if given, is a decision_log.DecisionLog, as for astar_search."""
+    start_name, goal_name = start, goal
+    start, goal = csr.id_of(start), csr.id_of(goal)
+    offsets = memoryview(csr.offsets)
+    targets = memoryview(csr.targets)
+    weights = memoryview(csr.weights)
+    if heuristic is None:
+        heuristic = position_heuristic(csr)
+    level = log.level if log is not None else OFF
+    steps = level >= STEPS
+    detail = level >= DETAIL
+
+    g = {start: 0}
+    parent = {start: None}
+    closed_set = set()
+    open_list = [(heuristic(start, goal), start)]
+    if level >= SUMMARY:
+        log.add(SUMMARY, "Starting A* search from node {} to node {}.", start_name, goal_name)
+    while open_list:
+        f, current = heapq.heappop(open_list)
+        if current in closed_set:
+            continue
+        if steps:
+            log.add(STEPS, "Processing node {}: f = {}, g = {}.", csr.name_of(current), f, g[current])
+        if update_callback:
+            update_callback(current)
+        if current == goal:
+            if level >= SUMMARY:
+                log.add(SUMMARY, "Goal reached at node {}: reconstructing path.", goal_name)
+            path = []
+            while current is not None:
+                path.append(csr.name_of(current))
+                current = parent[current]
+            return path[::-1]
+        closed_set.add(current)
+        current_g = g[current]
+        start_edge, end_edge = offsets[current], offsets[current + 1]
+        for neighbor, weight in zip(targets[start_edge:end_edge], weights[start_edge:end_edge]):
+            if neighbor in closed_set:
+                continue
+            tentative_g = current_g + weight
+            if tentative_g < g.get(neighbor, float('inf')):
+                g[neighbor] = tentative_g
+                parent[neighbor] = current
+                neighbor_f = tentative_g + heuristic(neighbor, goal)
+                if detail:
+                    log.add(DETAIL, "Updating neighbor node {}: new g = {}, f = {}.",
+                            csr.name_of(neighbor), tentative_g, neighbor_f)
+                heapq.heappush(open_list, (neighbor_f, neighbor))
+    if level >= SUMMARY:
+        log.add(SUMMARY, "No path found: the algorithm could not find a viable route.")
+    return None
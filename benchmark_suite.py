@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Pathfinding benchmark suite
+---------------------------
+Runs every search in the repo on the same scenarios and writes the results as
+JSON, so one run can be compared with another to catch regressions:
+
+ • Grid maps: MovingAI benchmark maps (.map) with their scenario files (.scen),
+   or generated cluttered, cave and maze maps with random scenarios. The
+   searches are grid A*, Jump Point Search, HPA* and ARA* (run to optimal).
+ • Graphs: random geometric graphs (graph_generators) searched with A*,
+   bidirectional A*, A* with ALT landmarks, contraction hierarchies and ARA*.
+
+For every scenario and search it records the path cost, node expansions, wall
+time and peak memory (the largest amount traced by tracemalloc during a second,
+traced run). Each cost is checked against a Dijkstra from the start over the
+same graph. The search is bounded at the largest cost found, so it only
+settles nodes up to that cost. HPA* is near-optimal by design, so it is
+reported with its extra cost but is not counted as wrong.
+
+MovingAI maps are 8-connected, but the searches here move in 4 directions.
+Scenario files are therefore only used for their start and goal cells, and
+their listed optimal lengths are ignored.
+
+Usage:  python benchmark_suite.py [--scen FILE.scen ...] [--map FILE.map ...]
+                                  [--scenarios 20] [--grid-size 256] [--graph-nodes 5000]
+                                  [--no-memory] [--output results.json]
+                                  [--compare baseline.json] [--tolerance 0.05] [--seed 0]
+
+With --compare, it exits with status 1 if an exact search returns a
+non-optimal path, or if any search's total expansions on a map grew by more
+than --tolerance compared with the baseline file.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import astar_core
+import grid_astar
+import jump_point_search
+from anytime_astar import AnytimeAStar, anytime_grid_planner
+from astar_benchmark import path_cost
+from contraction_hierarchy import ContractionHierarchy
+from csr_graph import CSRGraph
+from dijkstra import shortest_distances
+from graph_generators import random_geometric_graph
+from grid_benchmark import random_free_cells
+from hpa_star import HierarchicalGrid
+from landmarks import LandmarkHeuristic, bidirectional_astar
+from occupancy_grid import OccupancyGrid
+
+INF = float('inf')
+COST_TOLERANCE = 1e-6  # relative difference still counted as the same cost
+
+
+# --------------------------
+# Scenarios
+# --------------------------
+def load_scenarios(path):
+    """
+    Parse a MovingAI .scen file. Returns {map file: [(start, goal), ...]}; map
+    files are resolved relative to the .scen file's directory.
+    """
+    scenarios = {}
+    directory = os.path.dirname(path)
+    with open(path) as file:
+        for line in file:
+            fields = line.split()
+            if len(fields) < 9 or fields[0] == "version":
+                continue
+            map_path = os.path.join(directory, os.path.basename(fields[1]))
+            start = (int(fields[4]), int(fields[5]))
+            goal = (int(fields[6]), int(fields[7]))
+            scenarios.setdefault(map_path, []).append((start, goal))
+    return scenarios
+
+
+def spread(items, count):
+    """count items taken evenly across the list (MovingAI scenarios are sorted by length)."""
+    if len(items) <= count:
+        return list(items)
+    return [items[i * len(items) // count] for i in range(count)]
+
+
+def grid_graph(grid):
+    """
+    CSRGraph of a grid's free cells for the Dijkstra reference: node ids are the
+    grid's flat indices (walls are nodes without edges), every move costs 1.
+    """
+    free = np.frombuffer(grid.flat_cells(), dtype=np.uint8) == 0
+    cells = np.flatnonzero(free)
+    sources, targets = [], []
+    for offset in grid.neighbor_offsets:
+        neighbors = cells + offset
+        open_moves = free[neighbors]  # the wall border keeps every neighbour in range
+        sources.append(cells[open_moves])
+        targets.append(neighbors[open_moves])
+    sources, targets = np.concatenate(sources), np.concatenate(targets)
+    return CSRGraph.from_edges(sources, targets, np.ones(len(sources), dtype=np.int64), len(free))
+
+
+# --------------------------
+# Searches
+# --------------------------
+# Each search takes (start, goal) and returns (path or None, expansions).
+def grid_searches(grid):
+    """The grid searches by name, plus their preprocessing times and which are inexact."""
+    start_time = time.perf_counter()
+    hierarchy = HierarchicalGrid(grid)
+    preprocess = {"hpa": time.perf_counter() - start_time}
+
+    def hpa(start, goal):
+        expansions = 0
+        for result in hierarchy.search_steps(start, goal):
+            if result[0] == "step":
+                expansions += 1
+            else:
+                return result[1], expansions
+        return None, expansions
+
+    def ara(start, goal):
+        planner = anytime_grid_planner(grid, start, goal)
+        path, _ = planner.search()
+        return path, planner.expansions
+
+    searches = {
+        "astar": lambda start, goal: grid_astar.find_path(grid, start, goal),
+        "jps": lambda start, goal: jump_point_search.find_path(grid, start, goal),
+        "hpa": hpa,
+        "ara": ara,
+    }
+    return searches, preprocess, {"hpa"}
+
+
+def graph_searches(graph, seed):
+    """The graph searches by name, plus their preprocessing times and which are inexact."""
+    preprocess = {}
+    start_time = time.perf_counter()
+    landmark_heuristic = LandmarkHeuristic(graph, count=8, seed=seed)
+    preprocess["alt"] = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    hierarchy = ContractionHierarchy.from_graph(graph)
+    preprocess["ch"] = time.perf_counter() - start_time
+    nodes_by_id = {node.id: node for node in graph.nodes}
+
+    def counting(search):
+        def run(start, goal):
+            expansions = 0
+
+            def count_expansion(*args):
+                nonlocal expansions
+                expansions += 1
+
+            return search(start, goal, count_expansion), expansions
+        return run
+
+    def ch(start, goal):
+        _, path = hierarchy.shortest_path(start.id, goal.id)
+        return (None if path is None else [nodes_by_id[key] for key in path]), None
+
+    def ara(start, goal):
+        planner = AnytimeAStar(graph.get_neighbors, lambda node: astar_core.node_manhattan(node, goal), start, goal)
+        path, _ = planner.search()
+        return path, planner.expansions
+
+    searches = {
+        "astar": counting(lambda s, g, cb: astar_core.astar_search(graph, s, g, update_callback=cb)),
+        "bidir": counting(lambda s, g, cb: bidirectional_astar(graph, s, g, update_callback=cb)),
+        "alt": counting(lambda s, g, cb: astar_core.astar_search(graph, s, g, update_callback=cb,
+                                                                 heuristic=landmark_heuristic)),
+        "ch": ch,
+        "ara": ara,
+    }
+    return searches, preprocess, set()
+
+
+def measure(search, start, goal, memory):
+    """Run one search. Returns (path, expansions, seconds, peak traced KB or None)."""
+    start_time = time.perf_counter()
+    path, expansions = search(start, goal)
+    seconds = time.perf_counter() - start_time
+    peak_kb = None
+    if memory:
+        # A second run under tracemalloc, so tracing does not slow the timed one
+        tracemalloc.start()
+        search(start, goal)
+        peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+    return path, expansions, seconds, peak_kb
+
+
+# --------------------------
+# Running a map
+# --------------------------
+def run_map(name, kind, searches, preprocess, inexact, pairs, reference, cost_of, memory):
+    """
+    Run every search on every (start, goal) pair of one map.
+    :param reference: reference(start, goal, limit) -> Dijkstra cost (INF if unreachable).
+    :param cost_of: cost_of(path) -> path cost.
+    Returns the map's result dict.
+    """
+    scenarios = []
+    totals = {search: {"expansions": 0, "seconds": 0.0, "peak_kb": 0.0, "found": 0,
+                       "wrong": 0, "excess_cost": 0.0} for search in searches}
+    for start, goal in pairs:
+        results = {}
+        for search_name, search in searches.items():
+            path, expansions, seconds, peak_kb = measure(search, start, goal, memory)
+            results[search_name] = {"cost": None if path is None else cost_of(path),
+                                    "expansions": expansions, "seconds": seconds, "peak_kb": peak_kb}
+        found = [result["cost"] for result in results.values() if result["cost"] is not None]
+        start_time = time.perf_counter()
+        optimal = reference(start, goal, max(found) if found else None)
+        reference_seconds = time.perf_counter() - start_time
+        for search_name, result in results.items():
+            cost = result["cost"]
+            if cost is None:
+                result["optimal"] = optimal == INF
+            else:
+                result["optimal"] = abs(cost - optimal) <= COST_TOLERANCE * max(1.0, abs(optimal))
+            total = totals[search_name]
+            total["expansions"] += result["expansions"] or 0
+            total["seconds"] += result["seconds"]
+            total["peak_kb"] = max(total["peak_kb"], result["peak_kb"] or 0.0)
+            total["found"] += cost is not None
+            if not result["optimal"]:
+                if search_name in inexact and cost is not None:
+                    total["excess_cost"] += cost - optimal
+                else:
+                    total["wrong"] += 1
+        scenarios.append({"start": label(start), "goal": label(goal),
+                          "optimal_cost": None if optimal == INF else optimal,
+                          "dijkstra_seconds": reference_seconds, "results": results})
+    for search_name, total in totals.items():
+        total["exact"] = search_name not in inexact
+        if not memory:
+            total["peak_kb"] = None
+    return {"name": name, "kind": kind, "preprocess_seconds": preprocess,
+            "scenarios": scenarios, "totals": totals}
+
+
+def label(point):
+    """JSON-friendly label of a scenario endpoint: a grid cell or a graph node id."""
+    return list(point) if isinstance(point, tuple) else point.id
+
+
+def grid_map(name, grid, pairs, memory):
+    """Benchmark the grid searches on an OccupancyGrid."""
+    csr = grid_graph(grid)
+
+    def reference(start, goal, limit):
+        distances = shortest_distances(csr, grid.index(start), limit=limit)
+        return float(distances[grid.index(goal)])
+
+    searches, preprocess, inexact = grid_searches(grid)
+    return run_map(name, "grid", searches, preprocess, inexact, pairs, reference,
+                   lambda path: len(path) - 1, memory)
+
+
+def graph_map(name, graph, pairs, seed, memory):
+    """Benchmark the graph searches on an astar_core.Graph."""
+    csr = CSRGraph.from_dict({node: graph.get_neighbors(node) for node in graph.nodes})
+
+    def reference(start, goal, limit):
+        # A little slack on the limit, so a float rounding difference can't cut the goal off
+        distances = shortest_distances(csr, csr.id_of(start), limit=None if limit is None else limit * 1.001)
+        return float(distances[csr.id_of(goal)])
+
+    searches, preprocess, inexact = graph_searches(graph, seed)
+    return run_map(name, "graph", searches, preprocess, inexact, pairs, reference,
+                   lambda path: path_cost(graph, path), memory)
+
+
+# --------------------------
+# Regression check
+# --------------------------
+def compare(results, baseline, tolerance):
+    """Problems found when comparing results with a baseline results dict (a list of strings)."""
+    problems = []
+    previous = {entry["name"]: entry["totals"] for entry in baseline["maps"]}
+    for entry in results["maps"]:
+        for search_name, total in entry["totals"].items():
+            if total["wrong"]:
+                problems.append(f"{entry['name']} {search_name}: {total['wrong']} non-optimal paths")
+            old = previous.get(entry["name"], {}).get(search_name)
+            if old is None or not old["expansions"]:
+                continue
+            growth = total["expansions"] / old["expansions"] - 1
+            if growth > tolerance:
+                problems.append(f"{entry['name']} {search_name}: expansions {old['expansions']} -> "
+                                f"{total['expansions']} (+{100 * growth:.1f}%)")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every pathfinding search on grid maps and graphs")
+    parser.add_argument("--scen", nargs="*", default=[], help="MovingAI .scen files (their maps are loaded too)")
+    parser.add_argument("--map", nargs="*", default=[], help="MovingAI .map files to run with random scenarios")
+    parser.add_argument("--scenarios", type=int, default=20, help="scenarios per map")
+    parser.add_argument("--grid-size", type=int, default=256,
+                        help="size of the generated grid maps (0 to skip them)")
+    parser.add_argument("--graph-nodes", type=int, nargs="*", default=[5000],
+                        help="sizes of the random geometric graphs")
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced peak-memory runs")
+    parser.add_argument("--output", help="write the JSON results here (default: standard output)")
+    parser.add_argument("--compare", help="baseline JSON results to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.05,
+                        help="allowed growth in total expansions per map and search")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    memory = not args.no_memory
+
+    # Every grid map with its scenarios: (name, grid, pairs)
+    grid_maps = []
+    for scen in args.scen:
+        for map_path, pairs in load_scenarios(scen).items():
+            grid_maps.append((os.path.basename(map_path), OccupancyGrid.from_movingai(map_path),
+                              spread(pairs, args.scenarios)))
+    for map_path in args.map:
+        grid = OccupancyGrid.from_movingai(map_path)
+        cells = random_free_cells(grid, 2 * args.scenarios, rng)
+        grid_maps.append((os.path.basename(map_path) + " (random)", grid, list(zip(cells[::2], cells[1::2]))))
+    if args.grid_size:
+        size = args.grid_size
+        for name, grid in (("cluttered", OccupancyGrid.random(size, size, 0.3, args.seed)),
+                           ("cave", OccupancyGrid.noise(size, size, seed=args.seed)),
+                           ("maze", OccupancyGrid.maze(size, size, args.seed))):
+            cells = random_free_cells(grid, 2 * args.scenarios, rng)
+            grid_maps.append((f"{name}-{size}", grid, list(zip(cells[::2], cells[1::2]))))
+
+    results = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "seed": args.seed,
+        "maps": [],
+    }
+    for name, grid, pairs in grid_maps:
+        print(f"{name}: {len(pairs)} scenarios", file=sys.stderr)
+        results["maps"].append(grid_map(name, grid, pairs, memory))
+    for num_nodes in args.graph_nodes:
+        graph = random_geometric_graph(num_nodes, seed=args.seed)
+        pairs = [tuple(rng.sample(graph.nodes, 2)) for _ in range(args.scenarios)]
+        print(f"geometric-{num_nodes}: {len(pairs)} scenarios", file=sys.stderr)
+        results["maps"].append(graph_map(f"geometric-{num_nodes}", graph, pairs, args.seed, memory))
+
+    # Summary table on stderr; the JSON goes to the output
+    print(f"{'map':>16} {'search':>6} {'found':>6} {'expansions':>11} {'seconds':>8} {'peak KB':>8} {'wrong':>6}",
+          file=sys.stderr)
+    for entry in results["maps"]:
+        for search_name, total in entry["totals"].items():
+            peak = f"{total['peak_kb']:.0f}" if total["peak_kb"] is not None else "n/a"
+            wrong = total["wrong"] if total["exact"] else f"+{total['excess_cost']:g}"
+            print(f"{entry['name']:>16} {search_name:>6} {total['found']:>6} {total['expansions']:>11} "
+                  f"{total['seconds']:>8.2f} {peak:>8} {wrong:>6}", file=sys.stderr)
+    text = json.dumps(results, indent=1)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as file:
+            problems = compare(results, json.load(file), args.tolerance)
+        for problem in problems:
+            print("REGRESSION", problem, file=sys.stderr)
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Priority queues for shortest-path searches
+------------------------------------------
+BucketQueue is Dial's bucket queue: priorities must be integers and the searches
+must pop them in non-decreasing order. Both hold for Dijkstra and for A* with a
+consistent heuristic. Every push lands within max_increase of the last priority
+popped, so max_increase + 1 buckets used in a circle are enough. Push and pop
+are O(1) list operations instead of O(log n) heap sifts.
+
+HeapQueue wraps heapq behind the same interface so a search can use either:
+
+    queue = BucketQueue(max_weight) if integer_weights else HeapQueue()
+    queue.push(priority, item)
+    priority, item = queue.pop()
+
+Neither removes entries whose priority later improves: searches skip such stale
+entries when they are popped, as they always have with heapq.
+"""
+
+import heapq
+
+MAX_BUCKET_WEIGHT = 1024  # above this a heap is usually faster than scanning empty buckets
+
+
+class BucketQueue:
+    def __init__(self, max_increase, start=0):
+        """
+        :param max_increase: largest amount a pushed priority can exceed the last popped one by
+                             (the largest edge weight for Dijkstra).
+        :param start: the smallest priority that will ever be pushed.
+        """
+        self.size = max_increase + 1
+        self.buckets = [[] for _ in range(self.size)]
+        self.current = start  # priority of the bucket being emptied
+        self.count = 0
+
+    def push(self, priority, item):
+        self.buckets[priority % self.size].append(item)
+        self.count += 1
+
+    def pop(self):
+        """Remove and return (priority, item) with the smallest priority (newest first among equals)."""
+        if not self.count:
+            raise IndexError("pop from an empty BucketQueue")
+        bucket = self.buckets[self.current % self.size]
+        while not bucket:
+            self.current += 1
+            bucket = self.buckets[self.current % self.size]
+        self.count -= 1
+        return self.current, bucket.pop()
+
+    def __len__(self):
+        return self.count
+
+
+class HeapQueue:
+    def __init__(self):
+        self.heap = []
+
+    def push(self, priority, item):
+        heapq.heappush(self.heap, (priority, item))
+
+    def pop(self):
+        """Remove and return (priority, item) with the smallest priority (then smallest item)."""
+        return heapq.heappop(self.heap)
+
+    def __len__(self):
+        return len(self.heap)
+
+
+def bucket_width(weights):
+    """
+    The BucketQueue max_increase to use for these edge weights (a NumPy array),
+    or None if they are not all integers between 0 and MAX_BUCKET_WEIGHT.
+    """
+    if weights.dtype.kind not in "iu":
+        return None
+    if len(weights) == 0:
+        return 0
+    if weights.min() < 0 or weights.max() > MAX_BUCKET_WEIGHT:
+        return None
+    return int(weights.max())
+
+
+def make_queue(queue, max_increase, start=0):
+    """
+    Pick a queue for a search.
+    :param queue: "auto" (buckets when max_increase is not None), "bucket" or "heap".
+    :param max_increase: from bucket_width(), or None when buckets can't be used.
+    """
+    if queue == "heap" or (queue == "auto" and max_increase is None):
+        return HeapQueue()
+    if max_increase is None:
+        raise ValueError("a bucket queue needs integer weights between 0 and %d" % MAX_BUCKET_WEIGHT)
+    return BucketQueue(max_increase, start)
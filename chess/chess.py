@@ -14,6 +14,7 @@ Note: The piece images are assumed to be in PNG format.
 
 import pygame
 import sys
+import threading
 
 # Global constants for board and piece sizes
 BOARD_SIZE = 512          # Board image is 512x512 pixels
@@ -38,10 +39,12 @@ class Piece:
 # Main Chess Game Class
 # ------------------------------
 class ChessGame:
-    def __init__(self, mode):
+    def __init__(self, mode, background_moves=True):
         """
         Initialize the chess game.
         :param mode: 1 for single–player (human = white, AI = black), 2 for two–player.
+        :param background_moves: if True, the legal moves for the next position are generated
+                                 in a background thread straight after each move.
         """
         self.mode = mode
         # Create an 8x8 board (list of lists). Each cell is either None or a Piece.
@@ -52,14 +55,23 @@ class ChessGame:
         self.valid_moves = []         # List of valid moves for the selected piece
         self.en_passant_target = None # Square available for en passant capture (if any)
         self.move_history = []        # History of moves made (for potential further expansion)
+        # Legal moves of the side to move, keyed by position and grouped by square.
+        # Filled once per ply and cleared whenever a move is made.
+        self.move_cache = {}
+        self.move_lock = threading.RLock()  # Guards the board while moves are generated off-thread
+        self.background_moves = background_moves
         self.load_assets()            # Load board and piece images
         self.initialize_board()       # Set up initial board state
+        if self.background_moves:
+            self.prefetch_moves()     # Have white's first moves ready before the first click
 
     def load_assets(self):
         """
         Load images for the board and all pieces.
+        Everything is scaled (and converted to the display format) once here,
+        so drawing only ever blits ready-made surfaces.
         """
-        # Load and scale the board image
+        # Load and scale the board image; this is the pre-rendered empty board
         self.board_img = pygame.image.load("assets/board.png")
         self.board_img = pygame.transform.scale(self.board_img, (BOARD_SIZE, BOARD_SIZE))
         # Dictionary to store piece images with keys: (color, piece_type)
@@ -73,6 +85,18 @@ class ChessGame:
                 img = pygame.image.load(path)
                 # Scale the image to PIECE_SIZE x PIECE_SIZE
                 self.images[key] = pygame.transform.scale(img, (PIECE_SIZE, PIECE_SIZE))
+        # Converting to the screen's pixel format makes every later blit much cheaper.
+        # This needs a display, so it is skipped when running headless without one.
+        if pygame.display.get_surface() is not None:
+            self.board_img = self.board_img.convert()
+            for key, img in self.images.items():
+                self.images[key] = img.convert_alpha()
+        # Semi-transparent square used to highlight the selection and its moves
+        self.highlight = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE))
+        self.highlight.set_alpha(100)
+        self.highlight.fill((0, 255, 0))
+        # What each square looked like when it was last drawn: (col, row) -> (piece key, highlighted)
+        self.drawn_squares = {}
 
     def initialize_board(self):
         """
@@ -104,36 +128,62 @@ class ChessGame:
         for col in range(8):
             self.board[1][col] = Piece('black', 'pawn')
 
+    def square_state(self, col, row, highlighted):
+        """
+        Describe what a square should look like: the piece on it (if any) and whether it is highlighted.
+        """
+        piece = self.board[row][col]
+        piece_key = None if piece is None else (piece.color, piece.type)
+        return (piece_key, (col, row) in highlighted)
+
+    def draw_square(self, screen, col, row, state):
+        """
+        Draw a single square: the board underneath, its piece and the highlight.
+        :return: the Rect that was drawn.
+        """
+        piece_key, is_highlighted = state
+        rect = pygame.Rect(col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE)
+        # Restore the empty board for this square from the pre-rendered surface
+        screen.blit(self.board_img, rect, rect)
+        if piece_key is not None:
+            # Center the piece image within the square
+            x = rect.x + (SQUARE_SIZE - PIECE_SIZE) // 2
+            y = rect.y + (SQUARE_SIZE - PIECE_SIZE) // 2
+            screen.blit(self.images[piece_key], (x, y))
+        if is_highlighted:
+            screen.blit(self.highlight, rect)
+        return rect
+
     def draw(self, screen):
         """
         Draw the board and all pieces onto the screen.
         Highlights the selected piece and its valid moves.
+        Only squares that changed since the last draw (the squares touched by the
+        last move or by the selection) are repainted.
+        :return: list of dirty Rects to pass to pygame.display.update().
         """
-        # Draw board background
-        screen.blit(self.board_img, (0, 0))
-        # Draw each piece on the board
-        for row in range(8):
-            for col in range(8):
-                piece = self.board[row][col]
-                if piece is not None:
-                    img = self.images[(piece.color, piece.type)]
-                    # Center the piece image within the square
-                    x = col * SQUARE_SIZE + (SQUARE_SIZE - PIECE_SIZE) // 2
-                    y = row * SQUARE_SIZE + (SQUARE_SIZE - PIECE_SIZE) // 2
-                    screen.blit(img, (x, y))
-        # If a piece is selected, highlight its square and valid moves
+        highlighted = set()
         if self.selected_piece is not None:
-            highlight = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE))
-            highlight.set_alpha(100)
-            highlight.fill((0, 255, 0))
-            # Highlight the selected piece's square
-            sel_col, sel_row = self.selected_pos
-            screen.blit(highlight, (sel_col * SQUARE_SIZE, sel_row * SQUARE_SIZE))
-            # Highlight each valid destination square
+            highlighted.add(self.selected_pos)
             for move in self.valid_moves:
                 # move is a tuple: (start_col, start_row, end_col, end_row, special)
-                end_col, end_row = move[2], move[3]
-                screen.blit(highlight, (end_col * SQUARE_SIZE, end_row * SQUARE_SIZE))
+                highlighted.add((move[2], move[3]))
+        dirty_rects = []
+        for row in range(8):
+            for col in range(8):
+                state = self.square_state(col, row, highlighted)
+                if self.drawn_squares.get((col, row)) != state:
+                    dirty_rects.append(self.draw_square(screen, col, row, state))
+                    self.drawn_squares[(col, row)] = state
+        return dirty_rects
+
+    def redraw_all(self, screen):
+        """
+        Forget what is on screen and repaint every square (e.g. after another screen was shown).
+        :return: list of dirty Rects covering the whole board.
+        """
+        self.drawn_squares.clear()
+        return self.draw(screen)
 
     def handle_click(self, pos):
         """
@@ -148,7 +198,7 @@ class ChessGame:
             if piece is not None and piece.color == self.turn:
                 self.selected_piece = piece
                 self.selected_pos = (col, row)
-                self.valid_moves = self.get_valid_moves(col, row)
+                self.valid_moves = self.get_cached_moves().get((col, row), [])
         else:
             # If a piece is already selected, check if the click is on a valid destination.
             for move in self.valid_moves:
@@ -163,7 +213,7 @@ class ChessGame:
             if piece is not None and piece.color == self.turn:
                 self.selected_piece = piece
                 self.selected_pos = (col, row)
-                self.valid_moves = self.get_valid_moves(col, row)
+                self.valid_moves = self.get_cached_moves().get((col, row), [])
             else:
                 # Click on an invalid square deselects.
                 self.selected_piece = None
@@ -208,6 +258,53 @@ class ChessGame:
                 legal_moves.append(move)
         return legal_moves
 
+    def position_key(self):
+        """
+        Build a hashable key for the current position.
+        Includes every piece (with its has_moved flag, which decides castling),
+        the side to move and the en passant square.
+        """
+        pieces = tuple(None if piece is None else (piece.color, piece.type, piece.has_moved)
+                       for board_row in self.board for piece in board_row)
+        return (pieces, self.turn, self.en_passant_target)
+
+    def generate_legal_moves(self):
+        """
+        Generate the legal moves for every piece of the side to move.
+        :return: dict mapping (col, row) to the list of legal moves from that square.
+        """
+        moves_by_square = {}
+        for row in range(8):
+            for col in range(8):
+                piece = self.board[row][col]
+                if piece is not None and piece.color == self.turn:
+                    moves = self.get_valid_moves(col, row)
+                    if moves:
+                        moves_by_square[(col, row)] = moves
+        return moves_by_square
+
+    def get_cached_moves(self):
+        """
+        Return the legal moves of the side to move, grouped by square.
+        They are generated at most once per position; later clicks and
+        highlights are served straight from the cache.
+        """
+        with self.move_lock:
+            key = self.position_key()
+            moves_by_square = self.move_cache.get(key)
+            if moves_by_square is None:
+                moves_by_square = self.generate_legal_moves()
+                self.move_cache[key] = moves_by_square
+            return moves_by_square
+
+    def prefetch_moves(self):
+        """
+        Start generating the legal moves for the current position in a background thread,
+        so they are ready by the time the player clicks.
+        """
+        worker = threading.Thread(target=self.get_cached_moves, daemon=True)
+        worker.start()
+
     def get_pawn_moves(self, col, row, piece):
         """
         Generate pawn moves (including captures, two–step move, promotion, and en passant).
@@ -515,6 +612,18 @@ class ChessGame:
         Execute a move on the actual game board and update game state.
         :param move: A tuple (start_col, start_row, end_col, end_row, special)
         """
+        with self.move_lock:
+            self.apply_move(move)
+            # The position has changed, so the cached legal moves are no longer valid.
+            self.move_cache.clear()
+        if self.background_moves:
+            self.prefetch_moves()
+
+    def apply_move(self, move):
+        """
+        Update the board, en passant square, move history and turn for a move.
+        Called by make_move() while it holds the move lock.
+        """
         start_col, start_row, end_col, end_row, special = move
         piece = self.board[start_row][start_col]
         # Handle castling moves
@@ -568,6 +677,12 @@ class ChessGame:
         """
         Generate all legal moves for the given color.
         """
+        if color == self.turn:
+            # The side to move is served from the per-position cache.
+            moves = []
+            for square_moves in self.get_cached_moves().values():
+                moves.extend(square_moves)
+            return moves
         moves = []
         for row in range(8):
             for col in range(8):
@@ -718,8 +833,9 @@ def main():
             # Delay a bit so the AI move isn’t instantaneous.
             pygame.time.delay(500)
             game.ai_move()
-        game.draw(screen)
-        pygame.display.flip()
+        # Only push the squares that actually changed to the display.
+        dirty_rects = game.draw(screen)
+        pygame.display.update(dirty_rects)
         clock.tick(60)
     pygame.quit()
     sys.exit()
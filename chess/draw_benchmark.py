@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Frame-time benchmark for ChessGame.draw
+---------------------------------------
+Plays a random game and times two ways of drawing each frame:
+ • full:  repaint all 64 squares and every piece (the old behaviour)
+ • dirty: repaint only the squares that changed since the last frame
+
+Between moves several idle frames are drawn, the way the real main loop
+keeps drawing at 60 FPS while a player thinks.
+
+Usage:  python draw_benchmark.py [--plies N] [--idle-frames N] [--seed N]
+Runs headless (SDL dummy video driver) unless a display is already set.
+"""
+
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+# The assets are loaded with paths relative to this folder
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+import pygame
+from chess import ChessGame, BOARD_SIZE, SQUARE_SIZE
+
+
+def run(draw_frame, plies, idle_frames, seed):
+    """
+    Play a random game, calling draw_frame(game, screen) every frame.
+    Returns a list of frame times in milliseconds.
+    """
+    random.seed(seed)
+    screen = pygame.display.get_surface()
+    game = ChessGame(2, background_moves=False)
+    game.redraw_all(screen)
+    frame_times = []
+    for _ in range(plies):
+        moves = game.get_all_moves(game.turn)
+        if not moves:
+            break
+        # Select a piece first so highlighting is part of the measurement
+        move = random.choice(moves)
+        game.handle_click((move[0] * SQUARE_SIZE, move[1] * SQUARE_SIZE))
+        for _ in range(idle_frames):
+            start = time.perf_counter()
+            draw_frame(game, screen)
+            frame_times.append((time.perf_counter() - start) * 1000)
+        game.handle_click((move[2] * SQUARE_SIZE, move[3] * SQUARE_SIZE))
+        start = time.perf_counter()
+        draw_frame(game, screen)
+        frame_times.append((time.perf_counter() - start) * 1000)
+    return frame_times
+
+
+def full_frame(game, screen):
+    """Repaint everything and flip the whole display."""
+    game.redraw_all(screen)
+    pygame.display.flip()
+
+
+def dirty_frame(game, screen):
+    """Repaint the changed squares and update only those rectangles."""
+    pygame.display.update(game.draw(screen))
+
+
+def report(name, frame_times):
+    frame_times = sorted(frame_times)
+    mean = sum(frame_times) / len(frame_times)
+    p95 = frame_times[int(len(frame_times) * 0.95) - 1]
+    print(f"{name:>6}: {len(frame_times)} frames, mean {mean:.3f} ms, p95 {p95:.3f} ms, max {frame_times[-1]:.3f} ms")
+    return mean
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare full and dirty-rect frame times for ChessGame.draw")
+    parser.add_argument("--plies", type=int, default=60, help="number of half-moves to play")
+    parser.add_argument("--idle-frames", type=int, default=10, help="frames drawn between moves")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the game")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((BOARD_SIZE, BOARD_SIZE))
+    full = report("full", run(full_frame, args.plies, args.idle_frames, args.seed))
+    dirty = report("dirty", run(dirty_frame, args.plies, args.idle_frames, args.seed))
+    print(f"speed-up: {full / dirty:.1f}x")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
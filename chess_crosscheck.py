@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Cross-engine differential test for the two chess move generators
+-----------------------------------------------------------------
+The repo has two independent move generators:
+ • chess/chess.py        ChessGame.get_all_moves(color)
+ • newChess/ChessEngine  GameState.get_valid_moves()
+
+This script plays random legal games with chess/chess.py and, at every position,
+loads the same position into newChess and compares the two sets of legal moves.
+The first position where they disagree is reported (moves only one engine found,
+or an engine error). Both engines' move generation is also timed over the same
+stream of positions, so their throughput can be tracked.
+
+Usage:  python chess_crosscheck.py [--games N] [--max-plies N] [--seed N] [--keep-going]
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+PIECE_LETTERS = {'king': 'K', 'queen': 'Q', 'rook': 'R', 'bishop': 'B', 'knight': 'N', 'pawn': 'p'}
+
+
+def load_module(name, path):
+    """Load a module straight from its file (the two engines live in separate folders)."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+old_chess = load_module("old_chess", os.path.join(REPO_DIR, "chess", "chess.py"))
+new_chess = load_module("new_chess_engine", os.path.join(REPO_DIR, "newChess", "ChessEngine.py"))
+
+
+def new_old_game():
+    """Create a chess.py game (its images are loaded relative to the chess folder)."""
+    cwd = os.getcwd()
+    os.chdir(os.path.join(REPO_DIR, "chess"))
+    try:
+        return old_chess.ChessGame(2, background_moves=False)
+    finally:
+        os.chdir(cwd)
+
+
+def to_new_state(game):
+    """
+    Build a newChess GameState holding the same position as a chess.py game.
+    Castling rights are worked out from the has_moved flags of the kings and rooks.
+    """
+    state = new_chess.GameState()
+    for row in range(8):
+        for col in range(8):
+            piece = game.board[row][col]
+            if piece is None:
+                state.board[row][col] = "--"
+            else:
+                state.board[row][col] = piece.color[0] + PIECE_LETTERS[piece.type]
+                if piece.type == 'king':
+                    if piece.color == 'white':
+                        state.whiteKingLocation = (row, col)
+                    else:
+                        state.blackKingLocation = (row, col)
+    state.whiteToMove = game.turn == 'white'
+    if game.en_passant_target is not None:
+        ep_col, ep_row = game.en_passant_target
+        state.enpassantPossible = (ep_row, ep_col)
+
+    def unmoved(row, col, ptype, color):
+        piece = game.board[row][col]
+        return piece is not None and piece.type == ptype and piece.color == color and not piece.has_moved
+
+    state.whiteCastleKing_side = unmoved(7, 4, 'king', 'white') and unmoved(7, 7, 'rook', 'white')
+    state.whiteCastleQueen_side = unmoved(7, 4, 'king', 'white') and unmoved(7, 0, 'rook', 'white')
+    state.blackCastleKing_side = unmoved(0, 4, 'king', 'black') and unmoved(0, 7, 'rook', 'black')
+    state.blackCastleQueen_side = unmoved(0, 4, 'king', 'black') and unmoved(0, 0, 'rook', 'black')
+    return state
+
+
+def old_engine_moves(game):
+    """Legal moves from chess.py as a set of (start_row, start_col, end_row, end_col)."""
+    return {(m[1], m[0], m[3], m[2]) for m in game.get_all_moves(game.turn)}
+
+
+def new_engine_moves(state):
+    """Legal moves from newChess as a set of (start_row, start_col, end_row, end_col)."""
+    moves = state.get_valid_moves()
+    if not isinstance(moves, list):
+        raise TypeError(f"get_valid_moves() returned {moves!r} instead of a list of moves")
+    return {(m.startRow, m.startCol, m.endRow, m.endCol) for m in moves}
+
+
+def square_name(row, col):
+    return "abcdefgh"[col] + str(8 - row)
+
+
+def move_names(moves):
+    return " ".join(sorted(square_name(a, b) + square_name(c, d) for a, b, c, d in moves))
+
+
+def board_diagram(game):
+    """Plain-text picture of a chess.py board (upper case = white)."""
+    lines = []
+    for row in range(8):
+        cells = []
+        for col in range(8):
+            piece = game.board[row][col]
+            if piece is None:
+                cells.append(".")
+            else:
+                letter = PIECE_LETTERS[piece.type].upper()
+                cells.append(letter if piece.color == 'white' else letter.lower())
+        lines.append(f"{8 - row} " + " ".join(cells))
+    lines.append("  a b c d e f g h")
+    return "\n".join(lines)
+
+
+def timed(function, *args):
+    """Call function(*args) and return (result, error, seconds)."""
+    start = time.perf_counter()
+    try:
+        result, error = function(*args), None
+    except Exception as exc:  # an engine crash is a divergence, not a harness failure
+        result, error = None, exc
+    return result, error, time.perf_counter() - start
+
+
+def crosscheck(games, max_plies, seed, keep_going):
+    """
+    Play random games and compare both engines at every position.
+    Returns a list of divergences (stops after the first unless keep_going is set).
+    """
+    rng = random.Random(seed)
+    stats = {"old": [0, 0, 0.0], "new": [0, 0, 0.0]}  # positions, moves, seconds
+    divergences = []
+    for game_number in range(games):
+        game = new_old_game()
+        for ply in range(max_plies):
+            old_moves, old_error, old_time = timed(old_engine_moves, game)
+            new_moves, new_error, new_time = timed(new_engine_moves, to_new_state(game))
+            for name, moves, seconds in (("old", old_moves, old_time), ("new", new_moves, new_time)):
+                if moves is not None:
+                    stats[name][0] += 1
+                    stats[name][1] += len(moves)
+                    stats[name][2] += seconds
+
+            if old_error or new_error or old_moves != new_moves:
+                divergences.append({
+                    "game": game_number, "ply": ply, "turn": game.turn,
+                    "diagram": board_diagram(game),
+                    "old_error": old_error, "new_error": new_error,
+                    "only_old": (old_moves or set()) - (new_moves or set()),
+                    "only_new": (new_moves or set()) - (old_moves or set()),
+                })
+                if not keep_going:
+                    return divergences, stats
+            if not old_moves:
+                break  # checkmate or stalemate (or chess.py failed), start the next game
+            move = rng.choice(sorted(game.get_all_moves(game.turn)))
+            game.make_move(move)
+    return divergences, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare chess/chess.py and newChess move generation")
+    parser.add_argument("--games", type=int, default=20, help="number of random games to play")
+    parser.add_argument("--max-plies", type=int, default=200, help="maximum half-moves per game")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--keep-going", action="store_true", help="report every divergence, not just the first")
+    args = parser.parse_args()
+
+    divergences, stats = crosscheck(args.games, args.max_plies, args.seed, args.keep_going)
+
+    for d in divergences[:1] if not args.keep_going else divergences:
+        print(f"Divergence in game {d['game']} at ply {d['ply']} ({d['turn']} to move):")
+        print(d["diagram"])
+        if d["old_error"]:
+            print(f"  chess.py error: {d['old_error']!r}")
+        if d["new_error"]:
+            print(f"  newChess error: {d['new_error']!r}")
+        if d["only_old"]:
+            print(f"  only chess.py: {move_names(d['only_old'])}")
+        if d["only_new"]:
+            print(f"  only newChess: {move_names(d['only_new'])}")
+        print()
+    if not divergences:
+        print("No divergences found.")
+    elif args.keep_going:
+        print(f"{len(divergences)} divergent positions.")
+
+    print("Move generation throughput over the same positions:")
+    for name, label in (("old", "chess.py"), ("new", "newChess")):
+        positions, moves, seconds = stats[name]
+        if positions and seconds > 0:
+            print(f"  {label:>8}: {positions} positions, {positions / seconds:,.0f} positions/s, "
+                  f"{moves / seconds:,.0f} moves/s")
+        else:
+            print(f"  {label:>8}: no positions generated successfully")
+
+
+if __name__ == "__main__":
+    main()
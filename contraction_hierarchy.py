@@ -0,0 +1,293 @@
+"""
+Contraction hierarchies for repeated shortest-path queries
+-----------------------------------------------------------
+When many start/goal queries run over the same static graph, re-running A* from
+scratch each time wastes work. A contraction hierarchy (CH) does the expensive
+part once:
+
+ • Preprocessing: nodes are "contracted" one at a time, least important first.
+   Contracting v removes it and adds a shortcut u -> w (remembering v as its
+   middle node) for every pair of neighbours whose only shortest path ran through
+   v. Each node gets a rank: the order it was contracted in.
+ • Query: a bidirectional Dijkstra that only ever moves to higher-ranked nodes,
+   upwards from the start and (backwards) from the goal. It settles a tiny part of
+   the graph compared with a normal search.
+ • Path unpacking: shortcuts are expanded recursively through their middle nodes
+   back into original edges.
+
+The preprocessed hierarchy can be saved to a JSON file and loaded again in later
+runs. Graphs can come from "astar graph.py" (astar_core.Graph; nodes are keyed
+by their id) or from the dict format used in "dijkstra 1.py":
+
+    graph = {'A': [('B', 1), ('C', 4)], 'B': [('A', 1), ...], ...}
+
+    ch = ContractionHierarchy.from_dict(graph)
+    ch.save("graph.ch.json")
+    ch = ContractionHierarchy.load("graph.ch.json")
+    cost, path = ch.shortest_path('A', 'D')
+"""
+
+import heapq
+import json
+
+INF = float('inf')
+
+
+class ContractionHierarchy:
+    def __init__(self, keys, edges, witness_settle_limit=50):
+        """
+        Preprocess a directed graph.
+        :param keys: list of node keys (ids or names); their positions are the internal node numbers.
+        :param edges: iterable of (from_index, to_index, weight).
+        :param witness_settle_limit: how many nodes a witness search may settle before giving up
+                                     (lower = faster preprocessing but a few unnecessary shortcuts).
+        """
+        self.keys = list(keys)
+        self.index = {key: i for i, key in enumerate(self.keys)}
+        self.witness_settle_limit = witness_settle_limit
+        count = len(self.keys)
+        # Working copy of the graph; contracted nodes are removed from it as we go
+        self.out_edges = [dict() for _ in range(count)]  # u -> {w: weight}
+        self.in_edges = [dict() for _ in range(count)]   # w -> {u: weight}
+        self.middle = {}  # (u, w) -> middle node of a shortcut (absent for original edges)
+        self.weights = {}  # (u, w) -> weight of every original edge and shortcut
+        for u, w, weight in edges:
+            if u != w and weight < self.out_edges[u].get(w, INF):
+                self.out_edges[u][w] = weight
+                self.in_edges[w][u] = weight
+                self.weights[(u, w)] = weight
+        self.rank = [0] * count
+        self.contract_all()
+        self.build_search_graphs()
+        del self.out_edges, self.in_edges
+
+    # --------------------------
+    # Building from the repo's graph formats
+    # --------------------------
+    @classmethod
+    def from_graph(cls, graph, **options):
+        """Build from an astar_core.Graph (undirected); nodes are keyed by node.id."""
+        keys = [node.id for node in graph.nodes]
+        index = {node: i for i, node in enumerate(graph.nodes)}
+        edges = []
+        for edge in graph.edges:
+            u, w = index[edge.node1], index[edge.node2]
+            edges.append((u, w, edge.cost))
+            edges.append((w, u, edge.cost))
+        return cls(keys, edges, **options)
+
+    @classmethod
+    def from_dict(cls, graph, **options):
+        """Build from a dict of lists of (neighbor, weight) tuples, as used by dijkstra()."""
+        keys = list(graph)
+        for neighbors in graph.values():
+            for neighbor, _ in neighbors:
+                if neighbor not in graph and neighbor not in keys:
+                    keys.append(neighbor)
+        index = {key: i for i, key in enumerate(keys)}
+        edges = [(index[u], index[w], weight) for u, neighbors in graph.items() for w, weight in neighbors]
+        return cls(keys, edges, **options)
+
+    # --------------------------
+    # Preprocessing
+    # --------------------------
+    def witness_distance(self, source, target, skip, limit):
+        """
+        Cost of the shortest source -> target path that avoids node skip, searching only
+        as far as limit (returns INF if none is found within the limit or settle budget).
+        """
+        distances = {source: 0}
+        queue = [(0, source)]
+        settled = 0
+        while queue:
+            distance, node = heapq.heappop(queue)
+            if node == target:
+                return distance
+            if distance > limit or settled >= self.witness_settle_limit:
+                break
+            if distance > distances[node]:
+                continue
+            settled += 1
+            for neighbor, weight in self.out_edges[node].items():
+                if neighbor == skip:
+                    continue
+                candidate = distance + weight
+                if candidate < distances.get(neighbor, INF):
+                    distances[neighbor] = candidate
+                    heapq.heappush(queue, (candidate, neighbor))
+        return INF
+
+    def shortcuts_for(self, node):
+        """List the shortcuts (u, w, weight) needed if node were contracted now."""
+        shortcuts = []
+        incoming = self.in_edges[node]
+        outgoing = self.out_edges[node]
+        if not outgoing:
+            return shortcuts
+        max_out = max(outgoing.values())
+        for u, weight_in in incoming.items():
+            limit = weight_in + max_out
+            for w, weight_out in outgoing.items():
+                if w == u:
+                    continue
+                via = weight_in + weight_out
+                if self.witness_distance(u, w, node, limit) > via:
+                    shortcuts.append((u, w, via))
+        return shortcuts
+
+    def priority(self, node, shortcuts, contracted_neighbors):
+        """Edge difference (shortcuts added minus edges removed) plus already-contracted neighbours."""
+        removed = len(self.in_edges[node]) + len(self.out_edges[node])
+        return len(shortcuts) - removed + contracted_neighbors[node]
+
+    def contract_all(self):
+        """Contract every node, always picking the (lazily updated) lowest priority next."""
+        count = len(self.keys)
+        contracted_neighbors = [0] * count
+        queue = [(self.priority(node, self.shortcuts_for(node), contracted_neighbors), node)
+                 for node in range(count)]
+        heapq.heapify(queue)
+        next_rank = 0
+        while queue:
+            _, node = heapq.heappop(queue)
+            # Lazy update: the priority may be out of date, re-check it against the next best
+            shortcuts = self.shortcuts_for(node)
+            current = self.priority(node, shortcuts, contracted_neighbors)
+            if queue and current > queue[0][0]:
+                heapq.heappush(queue, (current, node))
+                continue
+            for u, w, weight in shortcuts:
+                if weight < self.out_edges[u].get(w, INF):
+                    self.out_edges[u][w] = weight
+                    self.in_edges[w][u] = weight
+                    self.weights[(u, w)] = weight
+                    self.middle[(u, w)] = node
+            # Remove the node from the working graph
+            for u in self.in_edges[node]:
+                del self.out_edges[u][node]
+                contracted_neighbors[u] += 1
+            for w in self.out_edges[node]:
+                del self.in_edges[w][node]
+                contracted_neighbors[w] += 1
+            self.in_edges[node] = {}
+            self.out_edges[node] = {}
+            self.rank[node] = next_rank
+            next_rank += 1
+
+    def build_search_graphs(self):
+        """
+        Split every edge and shortcut by rank:
+        up[u] holds u -> w with rank[w] > rank[u] (forward search),
+        down[w] holds u -> w with rank[u] > rank[w], stored at w (backward search).
+        """
+        count = len(self.keys)
+        self.up = [[] for _ in range(count)]
+        self.down = [[] for _ in range(count)]
+        for (u, w), weight in self.weights.items():
+            if self.rank[w] > self.rank[u]:
+                self.up[u].append((w, weight))
+            else:
+                self.down[w].append((u, weight))
+
+    # --------------------------
+    # Queries
+    # --------------------------
+    def search(self, source, target):
+        """Upward bidirectional Dijkstra. Returns (cost, meeting node, forward parents, backward parents)."""
+        distances = ({source: 0}, {target: 0})
+        parents = ({source: None}, {target: None})
+        queues = ([(0, source)], [(0, target)])
+        graphs = (self.up, self.down)
+        best_cost, meeting = INF, None
+        if source == target:
+            return 0, source, parents[0], parents[1]
+        while queues[0] or queues[1]:
+            for side in (0, 1):
+                if not queues[side]:
+                    continue
+                distance, node = heapq.heappop(queues[side])
+                if distance > distances[side][node]:
+                    continue
+                if distance >= best_cost:
+                    queues[side].clear()  # nothing cheaper left on this side
+                    continue
+                other = distances[1 - side].get(node)
+                if other is not None and distance + other < best_cost:
+                    best_cost, meeting = distance + other, node
+                for neighbor, weight in graphs[side][node]:
+                    candidate = distance + weight
+                    if candidate < distances[side].get(neighbor, INF):
+                        distances[side][neighbor] = candidate
+                        parents[side][neighbor] = node
+                        heapq.heappush(queues[side], (candidate, neighbor))
+        return best_cost, meeting, parents[0], parents[1]
+
+    def distance(self, source_key, target_key):
+        """Shortest-path cost between two node keys (INF if unreachable)."""
+        return self.search(self.index[source_key], self.index[target_key])[0]
+
+    def unpack(self, u, w, path):
+        """Append the original nodes of edge/shortcut u -> w (excluding u) to path."""
+        stack = [(u, w)]
+        while stack:
+            a, b = stack.pop()
+            middle = self.middle.get((a, b))
+            if middle is None:
+                path.append(b)
+            else:
+                # Expand a -> middle first, so push it last
+                stack.append((middle, b))
+                stack.append((a, middle))
+
+    def shortest_path(self, source_key, target_key):
+        """Return (cost, list of node keys from source to target), or (INF, None) if unreachable."""
+        source, target = self.index[source_key], self.index[target_key]
+        cost, meeting, forward_parents, backward_parents = self.search(source, target)
+        if meeting is None:
+            return INF, None
+        # Chain of hierarchy nodes: source ... meeting ... target
+        chain = []
+        node = meeting
+        while node is not None:
+            chain.append(node)
+            node = forward_parents[node]
+        chain.reverse()
+        node = backward_parents[meeting]
+        while node is not None:
+            chain.append(node)
+            node = backward_parents[node]
+        path = [chain[0]]
+        for u, w in zip(chain, chain[1:]):
+            self.unpack(u, w, path)
+        return cost, [self.keys[i] for i in path]
+
+    # --------------------------
+    # Serialisation
+    # --------------------------
+    def save(self, filename):
+        """Write the preprocessed hierarchy to a JSON file (node keys must be JSON values)."""
+        data = {
+            "keys": self.keys,
+            "rank": self.rank,
+            "edges": [[u, w, weight, self.middle.get((u, w), -1)] for (u, w), weight in self.weights.items()],
+        }
+        with open(filename, "w") as file:
+            json.dump(data, file)
+
+    @classmethod
+    def load(cls, filename):
+        """Load a hierarchy written by save() without redoing the preprocessing."""
+        with open(filename) as file:
+            data = json.load(file)
+        ch = cls.__new__(cls)
+        ch.keys = data["keys"]
+        ch.index = {key: i for i, key in enumerate(ch.keys)}
+        ch.rank = data["rank"]
+        ch.weights = {}
+        ch.middle = {}
+        for u, w, weight, middle in data["edges"]:
+            ch.weights[(u, w)] = weight
+            if middle >= 0:
+                ch.middle[(u, w)] = middle
+        ch.build_search_graphs()
+        return ch
@@ -0,0 +1,149 @@
+"""
+Compressed sparse row (CSR) graph
+---------------------------------
+A dict of lists of (neighbor, weight) tuples, as "dijkstra 1.py" uses, costs a
+Python object per node, per list and per tuple. With millions of edges, memory
+and pointer chasing dominate the run time. CSRGraph keeps the whole graph in
+three flat NumPy arrays instead:
+
+    offsets[n + 1]  - the edges leaving node i are offsets[i] .. offsets[i + 1] - 1
+    targets[m]      - node id each edge leads to
+    weights[m]      - weight of each edge
+
+Nodes are the integers 0 .. n - 1. names[i] is the original name of node i
+(a string, a grid cell, ...) and index maps names back to ids. positions, when
+known, is an (n, 2) array of node coordinates for A* heuristics. Coordinates
+are often in other units than the weights (DIMACS .co files use microdegrees,
+the .gr weights metres or seconds), so heuristic_scale() finds the factor that
+turns a coordinate distance into a lower bound on the cost.
+
+    csr = CSRGraph.from_dict({'A': [('B', 1), ('C', 4)], 'B': [('C', 2)]})
+    csr.index['B']  -> 1
+"""
+
+import numpy as np
+
+SCALE_BLOCK = 1 << 22  # edges per block while computing heuristic_scale()
+
+
+class CSRGraph:
+    def __init__(self, offsets, targets, weights, names=None, positions=None):
+        """
+        :param offsets, targets, weights: the CSR arrays (see the module docstring).
+        :param names: optional list or array of node names (default: the ids themselves).
+        :param positions: optional (n, 2) array of node coordinates.
+        """
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.num_nodes = len(offsets) - 1
+        self.has_names = names is not None
+        self.names = names if names is not None else range(self.num_nodes)
+        self.positions = positions
+        self.name_index = None  # built the first time a name is looked up
+        self.position_scale = None  # cached heuristic_scale()
+
+    @property
+    def index(self):
+        """Dict of name -> node id (None when nodes have no names)."""
+        if self.name_index is None and self.has_names:
+            self.name_index = {name: i for i, name in enumerate(self.names.tolist()
+                                                                if hasattr(self.names, "tolist") else self.names)}
+        return self.name_index
+
+    # --------------------------
+    # Building
+    # --------------------------
+    @classmethod
+    def from_edges(cls, sources, targets, weights, num_nodes=None, names=None, positions=None):
+        """
+        Build from parallel sequences of edge sources, targets (node ids) and weights.
+        Integer weights are stored as integers, anything else as float64.
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        weights = np.asarray(weights)
+        if num_nodes is None:
+            num_nodes = len(names) if names is not None else \
+                int(max(sources.max(initial=-1), targets.max(initial=-1))) + 1
+        order = np.argsort(sources, kind="stable")  # group the edges by their source node
+        counts = np.bincount(sources, minlength=num_nodes)
+        offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        id_type = np.int32 if num_nodes < 2 ** 31 else np.int64
+        if weights.dtype.kind in "iub":
+            weight_type = np.int32 if len(weights) == 0 or \
+                (weights.min() >= -2 ** 31 and weights.max() < 2 ** 31) else np.int64
+        else:
+            weight_type = np.float64
+        return cls(offsets, targets[order].astype(id_type), weights[order].astype(weight_type), names, positions)
+
+    @classmethod
+    def from_dict(cls, graph):
+        """Build from a dict of lists of (neighbor, weight) tuples, as used by dijkstra()."""
+        names = list(graph)
+        index = {name: i for i, name in enumerate(names)}
+        sources, targets, weights = [], [], []
+        for name, neighbors in graph.items():
+            source = index[name]
+            for neighbor, weight in neighbors:
+                if neighbor not in index:  # a node that only appears as a neighbour
+                    index[neighbor] = len(names)
+                    names.append(neighbor)
+                sources.append(source)
+                targets.append(index[neighbor])
+                weights.append(weight)
+        csr = cls.from_edges(sources, targets, weights, len(names), names)
+        csr.name_index = index
+        return csr
+
+    # --------------------------
+    # Access
+    # --------------------------
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    def id_of(self, name):
+        """Node id of a name (names are ids when the graph has no names)."""
+        return self.index[name] if self.index is not None else name
+
+    def name_of(self, node):
+        """Name of a node id, as a plain Python value."""
+        name = self.names[node]
+        return name.item() if isinstance(name, np.generic) else name
+
+    def neighbors(self, node):
+        """(targets, weights) array views of the edges leaving node id."""
+        start, end = self.offsets[node], self.offsets[node + 1]
+        return self.targets[start:end], self.weights[start:end]
+
+    def integer_weights(self):
+        """True if every weight is an integer (so distances can stay integers too)."""
+        return self.weights.dtype.kind in "iu"
+
+    def heuristic_scale(self):
+        """
+        Largest factor s such that every edge's weight is at least s times the
+        Manhattan distance between its endpoints' positions. By the triangle
+        inequality, s * Manhattan distance to the goal is then an admissible
+        heuristic. 0 when there are no positions (or an edge of weight 0 joins
+        two different positions).
+        """
+        if self.position_scale is None:
+            scale = float('inf')
+            if self.positions is not None:
+                positions = np.asarray(self.positions, dtype=np.float64)
+                sources = np.repeat(np.arange(self.num_nodes, dtype=np.int64), np.diff(self.offsets))
+                for start in range(0, self.num_edges, SCALE_BLOCK):
+                    block = slice(start, start + SCALE_BLOCK)
+                    distance = np.abs(positions[sources[block]] - positions[self.targets[block]]).sum(axis=1)
+                    moving = distance > 0
+                    if moving.any():
+                        scale = min(scale, float(np.min(self.weights[block][moving] / distance[moving])))
+            self.position_scale = max(scale, 0.0) if scale != float('inf') else 0.0
+        return self.position_scale
+
+    def nbytes(self):
+        """Memory used by the three arrays, in bytes."""
+        return self.offsets.nbytes + self.targets.nbytes + self.weights.nbytes
@@ -0,0 +1,62 @@
+"""
+Low-overhead decision log for the A* tools
+------------------------------------------
+Searches log every neighbour they skip or update. Formatting and printing each of
+those messages used to dominate the runtime of big searches, and the message list
+grew without bound. DecisionLog instead:
+ • keeps only the most recent events in a fixed-size ring buffer,
+ • stores each event as a compact (template, args) tuple and only formats it
+   when it is actually shown (e.g. when the log panel is drawn),
+ • has verbosity levels, so callers can skip logging entirely.
+
+Callers in hot loops should test the level once, outside the loop:
+
+    detail = log is not None and log.level >= DETAIL
+    ...
+    if detail:
+        log.add(DETAIL, "Skipping neighbor {}: obstacle", pos)
+"""
+
+from collections import deque
+
+# Verbosity levels
+OFF = 0      # log nothing
+SUMMARY = 1  # search start/end and user actions
+STEPS = 2    # every node taken from the open list
+DETAIL = 3   # every neighbour skipped or updated
+
+
+class DecisionLog:
+    def __init__(self, capacity=1000, level=DETAIL, echo=False):
+        """
+        :param capacity: number of most recent events to keep.
+        :param level: highest verbosity level that is recorded (OFF records nothing).
+        :param echo: also print each recorded event (formats it straight away).
+        """
+        self.events = deque(maxlen=capacity)
+        self.level = level
+        self.echo = echo
+
+    def add(self, level, template, *args):
+        """Record an event; template is a str.format template filled in from args when displayed."""
+        if level > self.level:
+            return
+        self.events.append((template, args))
+        if self.echo:
+            print(template.format(*args) if args else template)
+
+    def recent(self, count):
+        """Return the last count events as formatted strings (oldest first)."""
+        start = max(0, len(self.events) - count)
+        messages = []
+        for i in range(start, len(self.events)):
+            template, args = self.events[i]
+            messages.append(template.format(*args) if args else template)
+        return messages
+
+    def clear(self):
+        """Forget all recorded events."""
+        self.events.clear()
+
+    def __len__(self):
+        return len(self.events)
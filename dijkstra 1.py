@@ -1,25 +1,4 @@
-import heapq
-
-def dijkstra(graph, start):
-    priority_queue = []
-    heapq.heappush(priority_queue, (0, start))
-    distances = {node: float('inf') for node in graph}
-    distances[start] = 0
-
-    while priority_queue:
-        current_distance, current_node = heapq.heappop(priority_queue)
-
-        if current_distance > distances[current_node]:
-            continue
-
-        for neighbor, weight in graph[current_node]:
-            distance = current_distance + weight
-
-            if distance < distances[neighbor]:
-                distances[neighbor] = distance
-                heapq.heappush(priority_queue, (distance, neighbor))
-
-    return distances
+from dijkstra import dijkstra  # the search itself lives in dijkstra.py
 
 # Example weighted graph
 graph = {
@@ -0,0 +1,232 @@
+"""
+Dijkstra's shortest paths over CSR graphs
+-----------------------------------------
+dijkstra(graph, start) keeps the dict-of-lists API from "dijkstra 1.py": pass a
+dict of lists of (neighbor, weight) tuples and get back {node: distance}.
+Internally the graph is converted to a csr_graph.CSRGraph, and the search reads
+the flat arrays through memoryviews. No per-node Python objects are created
+apart from the queue entries.
+
+For big graphs build the CSRGraph once and pass it in directly; the result is
+then a NumPy array of distances indexed by node id (inf where unreachable):
+
+    csr = CSRGraph.from_dict(graph)
+    distances = dijkstra(csr, 'B')
+
+When every weight is an integer between 0 and bucket_queue.MAX_BUCKET_WEIGHT,
+as in the example graph, the search uses a bucket queue instead of heapq. Pass
+queue="heap" or queue="bucket" to choose one yourself.
+
+Many sources at once:
+
+ • multi_source=True treats a list of start nodes as one virtual super-source
+   joined to each of them by a zero-weight edge. Each node then gets its
+   distance to the nearest start, and nearest=True also says which start that is.
+ • distance_matrix() runs one search per source across a ProcessPoolExecutor.
+   The CSR arrays are placed in shared memory once, so workers use them without
+   a copy, and dense results are written straight into a shared output matrix.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from bucket_queue import bucket_width, make_queue
+from csr_graph import CSRGraph
+
+try:
+    import scipy.sparse as scipy_sparse  # optional: sparse matrices are returned as scipy csr_matrix
+except ImportError:
+    scipy_sparse = None
+
+INF = float('inf')
+
+
+def shortest_distances(csr, source, queue="auto", limit=None, nearest=False):
+    """
+    Distances from node id source to every node of a CSRGraph, as a float64 array.
+    :param source: a node id, or a list of ids searched from all at once (a virtual super-source).
+    :param queue: "auto", "bucket" or "heap" (see bucket_queue.make_queue).
+    :param limit: stop once every node within this distance is settled (the rest stay inf).
+    :param nearest: also return an int array with the source each node is nearest to (-1 if unreachable).
+    """
+    sources = [source] if isinstance(source, (int, np.integer)) else list(source)
+    priority_queue = make_queue(queue, bucket_width(csr.weights))
+    push, pop = priority_queue.push, priority_queue.pop
+    distances = np.full(csr.num_nodes, INF)
+    distance_of = memoryview(distances)
+    offsets = memoryview(csr.offsets)
+    targets = memoryview(csr.targets)
+    weights = memoryview(csr.weights)
+    origins = origin_of = None
+    if nearest:
+        origins = np.full(csr.num_nodes, -1, dtype=np.int64)
+        origin_of = memoryview(origins)
+    for node in sources:
+        distance_of[node] = 0
+        if origin_of is not None:
+            origin_of[node] = node
+        push(0, node)
+
+    while priority_queue:
+        current_distance, current_node = pop()
+
+        if current_distance > distance_of[current_node]:
+            continue
+        if limit is not None and current_distance > limit:
+            distances[distances > limit] = INF  # drop tentative distances beyond the limit
+            break
+
+        start, end = offsets[current_node], offsets[current_node + 1]
+        for neighbor, weight in zip(targets[start:end], weights[start:end]):
+            distance = current_distance + weight
+
+            if distance < distance_of[neighbor]:
+                distance_of[neighbor] = distance
+                if origin_of is not None:
+                    origin_of[neighbor] = origin_of[current_node]
+                push(distance, neighbor)
+
+    if nearest:
+        origins[distances == INF] = -1
+        return distances, origins
+    return distances
+
+
+def dijkstra(graph, start, queue="auto", multi_source=False):
+    """
+    Shortest distances from start.
+    :param graph: dict of lists of (neighbor, weight) tuples, or a CSRGraph.
+    :param queue: "auto", "bucket" or "heap" priority queue.
+    :param multi_source: start is a list of nodes; each distance is to the nearest of them.
+    :return: {node: distance} for a dict (inf where unreachable), or a NumPy array
+             indexed by node id for a CSRGraph.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_dict(graph)
+    source = [csr.id_of(node) for node in start] if multi_source else csr.id_of(start)
+    if isinstance(graph, CSRGraph):
+        return shortest_distances(csr, source, queue)
+    distances = shortest_distances(csr, source, queue).tolist()
+    if csr.integer_weights():
+        # Integer weights give integer distances, as the dict version always returned
+        distances = [int(distance) if distance != INF else INF for distance in distances]
+    return dict(zip(csr.names, distances))
+
+
+# --------------------------
+# Batched searches across processes
+# --------------------------
+worker_state = {}  # per worker process: shared-memory handles and the attached graph
+
+
+def share_array(array):
+    """Copy an array into a new shared-memory block. Returns (block, spec for attach_array)."""
+    memory = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, array.dtype, buffer=memory.buf)[...] = array
+    return memory, (memory.name, array.shape, array.dtype.str)
+
+
+def attach_array(spec):
+    """Map a shared array described by share_array's spec. Returns (block, array)."""
+    name, shape, dtype = spec
+    memory = shared_memory.SharedMemory(name=name)
+    return memory, np.ndarray(shape, dtype, buffer=memory.buf)
+
+
+def init_worker(graph_specs, result_spec, columns):
+    """Process pool initializer: attach the shared graph (and dense result) once per worker."""
+    memories = []
+    arrays = []
+    for spec in graph_specs:
+        memory, array = attach_array(spec)
+        memories.append(memory)
+        arrays.append(array)
+    worker_state["graph"] = CSRGraph(*arrays)
+    worker_state["result"] = None
+    if result_spec is not None:
+        memory, worker_state["result"] = attach_array(result_spec)
+        memories.append(memory)
+    worker_state["memories"] = memories  # keep the blocks mapped for the worker's lifetime
+    worker_state["columns"] = columns
+
+
+def run_batch(batch, queue, limit):
+    """
+    Search from each (row, source) in the batch. Dense results are written into the
+    shared matrix; sparse ones are returned as a list of (row, columns, distances).
+    """
+    graph, result, columns = worker_state["graph"], worker_state["result"], worker_state["columns"]
+    parts = []
+    for row, source in batch:
+        distances = shortest_distances(graph, source, queue, limit)
+        if columns is not None:
+            distances = distances[columns]
+        if result is not None:
+            result[row] = distances
+        else:
+            found = np.flatnonzero(distances != INF)
+            parts.append((row, found, distances[found]))
+    return parts
+
+
+def distance_matrix(graph, sources, targets=None, workers=None, queue="auto", limit=None,
+                    sparse=False, batch_size=None):
+    """
+    Shortest distances from every source to every target, one search per source,
+    spread over a pool of worker processes.
+    :param graph: CSRGraph or dict of lists of (neighbor, weight) tuples.
+    :param sources: nodes (names for a dict) giving the matrix rows, in order.
+    :param targets: nodes giving the columns (default: every node, by id).
+    :param workers: number of processes (default: one per CPU).
+    :param limit: ignore distances above this (useful with sparse=True).
+    :param sparse: return only reachable entries, as a scipy csr_matrix when scipy is
+                   installed, otherwise as its (indptr, indices, data) NumPy arrays.
+    :param batch_size: sources per task (default: about four tasks per worker).
+    :return: dense float64 matrix (inf where unreachable), or the sparse form.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_dict(graph)
+    rows = list(enumerate(csr.id_of(node) for node in sources))
+    columns = None if targets is None else np.array([csr.id_of(node) for node in targets], dtype=np.int64)
+    width = csr.num_nodes if columns is None else len(columns)
+    workers = workers or os.cpu_count() or 1
+    batch_size = batch_size or max(1, -(-len(rows) // (4 * workers)))
+    batches = [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+
+    memories = []
+    try:
+        graph_specs = []
+        for array in (csr.offsets, csr.targets, csr.weights):
+            memory, spec = share_array(array)
+            memories.append(memory)
+            graph_specs.append(spec)
+        result_spec = None
+        if not sparse:
+            memory = shared_memory.SharedMemory(create=True, size=max(len(rows) * width * 8, 1))
+            memories.append(memory)
+            result_spec = (memory.name, (len(rows), width), np.dtype(np.float64).str)
+
+        with ProcessPoolExecutor(workers, initializer=init_worker,
+                                 initargs=(graph_specs, result_spec, columns)) as pool:
+            futures = [pool.submit(run_batch, batch, queue, limit) for batch in batches]
+            parts = [part for future in futures for part in future.result()]
+
+        if not sparse:
+            return np.ndarray((len(rows), width), np.float64, buffer=memories[-1].buf).copy()
+    finally:
+        for memory in memories:
+            memory.close()
+            memory.unlink()
+
+    # Assemble the sparse rows in order
+    parts.sort(key=lambda part: part[0])
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    for row, found, _ in parts:
+        indptr[row + 1] = len(found)
+    np.cumsum(indptr, out=indptr)
+    indices = np.concatenate([found for _, found, _ in parts]) if parts else np.zeros(0, dtype=np.int64)
+    data = np.concatenate([values for _, _, values in parts]) if parts else np.zeros(0)
+    if scipy_sparse is not None:
+        return scipy_sparse.csr_matrix((data, indices, indptr), shape=(len(rows), width))
+    return indptr, indices, data
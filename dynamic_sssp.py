@@ -0,0 +1,177 @@
+"""
+Dynamic single-source shortest paths under edge weight changes
+--------------------------------------------------------------
+When traffic updates change edge weights, rerunning dijkstra() for every tracked
+source repeats almost all of the work. DynamicSSSP keeps each source's distances
+and its shortest-path tree (the edge each node was reached by), and repairs
+only what an update affects:
+
+ • Decrease of edge u -> v: if it now gives v a shorter distance, a Dijkstra
+   starting at v spreads the improvement and stops where nothing improves.
+ • Increase of a tree edge u -> v: only v's subtree in the tree can get longer.
+   Those nodes are reset, seeded with their best edge from the unaffected rest
+   of the graph, and settled again by a Dijkstra confined to them. Increasing
+   an edge that is not in the tree changes nothing.
+
+DynamicGraph holds the shared, writable weights plus a reverse (incoming edge)
+index, and tells every DynamicSSSP built on it about each change:
+
+    graph = DynamicGraph(csr)
+    trees = [DynamicSSSP(graph, depot) for depot in depots]
+    graph.set_weight(graph.edge_index(u, v), 42)  # every tree is repaired
+    trees[0].distances[v]
+"""
+
+import heapq
+
+import numpy as np
+
+from csr_graph import CSRGraph
+
+INF = float('inf')
+
+
+class DynamicGraph:
+    def __init__(self, csr):
+        """
+        Wrap a CSRGraph for weight updates. The weights are copied into a writable
+        float64 array (shared by all trees); offsets and targets are used as they are.
+        """
+        self.offsets = csr.offsets
+        self.targets = csr.targets
+        self.weights = np.array(csr.weights, dtype=np.float64)
+        self.csr = CSRGraph(csr.offsets, csr.targets, self.weights, csr.names if csr.has_names else None)
+        self.num_nodes = csr.num_nodes
+        # Source node of every edge, and the edges entering each node (a reverse CSR of edge ids)
+        self.sources = np.repeat(np.arange(self.num_nodes, dtype=np.int64), np.diff(csr.offsets))
+        self.in_edges = np.argsort(csr.targets, kind="stable")
+        self.in_offsets = np.zeros(self.num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(csr.targets, minlength=self.num_nodes), out=self.in_offsets[1:])
+        self.trees = []  # DynamicSSSP objects to notify
+        self.version = 0  # bumped on every weight change (see path_cache.py)
+
+    def edge_index(self, u, v):
+        """Index of the cheapest edge from node id u to node id v (raises KeyError if there is none)."""
+        start, end = self.offsets[u], self.offsets[u + 1]
+        matches = np.flatnonzero(self.targets[start:end] == v)
+        if not len(matches):
+            raise KeyError((u, v))
+        return int(start + matches[np.argmin(self.weights[start + matches])])
+
+    def set_weight(self, edge, weight):
+        """Change one edge's weight and repair every tree."""
+        old_weight = self.weights[edge]
+        if weight == old_weight:
+            return
+        self.weights[edge] = weight
+        self.version += 1
+        for tree in self.trees:
+            tree.weight_changed(edge, old_weight, weight)
+
+    def set_weights(self, changes):
+        """Apply a sequence of (edge, weight) changes."""
+        for edge, weight in changes:
+            self.set_weight(edge, weight)
+
+
+class DynamicSSSP:
+    def __init__(self, graph, source):
+        """
+        Run Dijkstra from node id source on a DynamicGraph, keeping the shortest-path
+        tree, and register for the graph's weight updates.
+        """
+        self.graph = graph
+        self.source = source
+        self.distances = np.full(graph.num_nodes, INF)
+        self.parent_edges = np.full(graph.num_nodes, -1, dtype=np.int64)  # edge each node was reached by
+        self.distance_of = memoryview(self.distances)
+        self.parent_of = memoryview(self.parent_edges)
+        self.offsets = memoryview(graph.offsets)
+        self.targets = memoryview(graph.targets)
+        self.weights = memoryview(graph.weights)
+        self.sources = memoryview(graph.sources)
+        self.in_edges = memoryview(graph.in_edges)
+        self.in_offsets = memoryview(graph.in_offsets)
+        self.settled = 0  # nodes settled by repairs so far (for statistics)
+        self.distance_of[source] = 0
+        self.settle([(0, source)])
+        graph.trees.append(self)
+
+    def settle(self, queue, allowed=None):
+        """
+        Dijkstra from the (distance, node) entries in queue, using and updating the
+        current distances. With allowed (a set), only those nodes are relaxed.
+        """
+        distance_of, parent_of = self.distance_of, self.parent_of
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        heapq.heapify(queue)
+        while queue:
+            current_distance, current_node = heapq.heappop(queue)
+            if current_distance > distance_of[current_node]:
+                continue
+            self.settled += 1
+            for edge in range(offsets[current_node], offsets[current_node + 1]):
+                neighbor = targets[edge]
+                distance = current_distance + weights[edge]
+                if distance < distance_of[neighbor] and (allowed is None or neighbor in allowed):
+                    distance_of[neighbor] = distance
+                    parent_of[neighbor] = edge
+                    heapq.heappush(queue, (distance, neighbor))
+
+    def subtree(self, root):
+        """Every node whose tree path passes through root (root included)."""
+        offsets, targets, parent_of = self.offsets, self.targets, self.parent_of
+        nodes = {root}
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            for edge in range(offsets[node], offsets[node + 1]):
+                child = targets[edge]
+                if parent_of[child] == edge and child not in nodes:
+                    nodes.add(child)
+                    stack.append(child)
+        return nodes
+
+    def weight_changed(self, edge, old_weight, new_weight):
+        """Repair the tree after an edge weight changed (called by DynamicGraph.set_weight)."""
+        u, v = self.sources[edge], self.targets[edge]
+        distance_of = self.distance_of
+        if new_weight < old_weight:
+            distance = distance_of[u] + new_weight
+            if distance < distance_of[v]:
+                distance_of[v] = distance
+                self.parent_of[v] = edge
+                self.settle([(distance, v)])
+            return
+        if self.parent_of[v] != edge:
+            return  # not a tree edge: no shortest path used it
+
+        # The edge got more expensive: reset v's subtree and re-attach it from outside
+        affected = self.subtree(v)
+        for node in affected:
+            distance_of[node] = INF
+            self.parent_of[node] = -1
+        weights, sources, in_edges, in_offsets = self.weights, self.sources, self.in_edges, self.in_offsets
+        queue = []
+        for node in affected:
+            best, best_edge = INF, -1
+            for position in range(in_offsets[node], in_offsets[node + 1]):
+                in_edge = in_edges[position]
+                distance = distance_of[sources[in_edge]] + weights[in_edge]
+                if distance < best:
+                    best, best_edge = distance, in_edge
+            if best_edge >= 0:
+                distance_of[node] = best
+                self.parent_of[node] = best_edge
+                queue.append((best, node))
+        self.settle(queue, affected)
+
+    def path(self, target):
+        """Node ids on the shortest path from the source to target (None if unreachable)."""
+        if self.distance_of[target] == INF:
+            return None
+        path = [target]
+        while target != self.source:
+            target = self.sources[self.parent_of[target]]
+            path.append(target)
+        return path[::-1]
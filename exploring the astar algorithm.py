@@ -1,10 +1,15 @@
 import pygame
-import heapq
-import random  # For generating random obstacles
+
+from decision_log import DecisionLog, DETAIL
+from occupancy_grid import OccupancyGrid
+import grid_astar
+import jump_point_search
+import hpa_star
 
 # Grid and window dimensions
-CELL_SIZE = 40  # Size of each cell in pixels
-GRID_WIDTH, GRID_HEIGHT = 10, 10  # You can adjust the grid size here
+GRID_WIDTH, GRID_HEIGHT = 10, 10  # You can adjust the grid size here (the search handles multi-million-cell maps)
+MAX_GRID_PIXELS = 800  # Cells shrink (down to 1 pixel) so large grids still fit on screen
+CELL_SIZE = max(1, min(40, MAX_GRID_PIXELS // max(GRID_WIDTH, GRID_HEIGHT)))  # Size of each cell in pixels
 LOG_PANEL_HEIGHT = 150  # Height of the log panel (in pixels)
 WINDOW_WIDTH = GRID_WIDTH * CELL_SIZE
 WINDOW_HEIGHT = GRID_HEIGHT * CELL_SIZE + LOG_PANEL_HEIGHT
@@ -12,6 +17,17 @@ WINDOW_HEIGHT = GRID_HEIGHT * CELL_SIZE + LOG_PANEL_HEIGHT
 # Animation speed (frames per second) when not in stepwise mode
 ANIMATION_SPEED = 0.5  # Adjust this value to change the speed of the visualization
 
+# Search algorithm: "astar" (plain A*), "jps" (Jump Point Search, which only
+# expands the cells where a shortest path may turn) or "hpa" (hierarchical A* over
+# clusters of cells, which expands entrances between clusters; near-optimal paths)
+SEARCH_ALGORITHM = "astar"
+
+# Turbo mode (toggle with 't') applies many search steps per displayed frame, so
+# large grids animate smoothly; the final state is always drawn
+TURBO_MODE = False
+TURBO_STEPS_PER_FRAME = 2000
+TURBO_FPS = 60
+
 # Colors (RGB tuples)
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -23,147 +39,81 @@ ORANGE = (255, 165, 0)  # Goal node
 LIGHT_BLUE = (173, 216, 230)  # Open set (nodes to be evaluated)
 YELLOW = (255, 255, 0)  # Current node being processed
 
-# Global list to store decision logs
-log_messages = []
+# Decision log settings: how many recent messages to keep, how much detail
+# to record (see decision_log.py; OFF for headless runs) and whether to also print them
+LOG_CAPACITY = 1000
+LOG_LEVEL = DETAIL
+LOG_ECHO = False
+
+# Global ring buffer storing the decision logs
+decision_log = DecisionLog(LOG_CAPACITY, LOG_LEVEL, LOG_ECHO)
 stepwise_mode = False  # Flag to control stepwise execution
+turbo_mode = TURBO_MODE  # Flag to control turbo (frame-skipping) execution
 
 
-def log_decision(message):
-    """Append a log message to the log_messages list and print it."""
-    log_messages.append(message)
-    print(message)
-
-
-# Define the Node class for pathfinding
-class Node:
-    def __init__(self, position, parent=None):
-        self.position = position  # (x, y) coordinate on the grid
-        self.parent = parent  # Reference to parent Node for path reconstruction
-        self.g = 0  # Cost from start node to current node
-        self.h = 0  # Heuristic cost from current node to goal
-        self.f = 0  # Total cost (g + h)
-
-    def __lt__(self, other):
-        # Allows Node objects to be compared based on f cost (needed for the priority queue)
-        return self.f < other.f
-
-
-# Heuristic function using Manhattan distance
-def heuristic(current, goal):
-    """Calculate the Manhattan distance between current and goal positions."""
-    return abs(current[0] - goal[0]) + abs(current[1] - goal[1])
-
-
-# Generator-based A* algorithm that yields state after each decision step.
-def astar_steps(grid, start, goal):
-    """
-    Perform the A* pathfinding algorithm as a generator.
-    Yields a tuple (current_node, open_list, closed_list) after processing each node.
-    When the goal is reached, yields a tuple ("path", final_path) and returns.
-    If no path is found, yields ("no_path", None) at the end.
-    """
-    open_list = []  # Priority queue for nodes to be evaluated
-    closed_list = set()  # Set for nodes that have already been evaluated
-
-    start_node = Node(start)
-    heapq.heappush(open_list, (start_node.f, start_node))
-    log_decision(f"Starting A* from {start} to {goal}")
-
-    while open_list:
-        # Pop the node with the lowest f cost
-        current_node = heapq.heappop(open_list)[1]
-        log_decision(
-            f"Processing node {current_node.position} (f={current_node.f}, g={current_node.g}, h={current_node.h})")
-
-        # Yield the current state for visualization
-        yield (current_node, list(open_list), closed_list)
-
-        # Check if the goal is reached
-        if current_node.position == goal:
-            log_decision(f"Goal reached at {current_node.position}. Reconstructing path...")
-            path = []
-            while current_node:
-                path.append(current_node.position)
-                current_node = current_node.parent
-            yield ("path", path[::-1])  # Yield final path (from start to goal)
-            return
-
-        closed_list.add(current_node.position)
-
-        # Explore neighbors (up, down, left, right)
-        for move in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
-            neighbor_pos = (current_node.position[0] + move[0],
-                            current_node.position[1] + move[1])
-
-            # Check if the neighbor is within grid boundaries
-            if neighbor_pos[0] < 0 or neighbor_pos[0] >= GRID_WIDTH or \
-                    neighbor_pos[1] < 0 or neighbor_pos[1] >= GRID_HEIGHT:
-                log_decision(f"Skipping neighbor {neighbor_pos}: out of bounds")
-                continue
-
-            # Skip if the neighbor is an obstacle
-            if grid[neighbor_pos[1]][neighbor_pos[0]] == 1:
-                log_decision(f"Skipping neighbor {neighbor_pos}: obstacle")
-                continue
-
-            # Skip if the neighbor has already been evaluated
-            if neighbor_pos in closed_list:
-                log_decision(f"Skipping neighbor {neighbor_pos}: already evaluated")
-                continue
-
-            neighbor_node = Node(neighbor_pos, current_node)
-            neighbor_node.g = current_node.g + 1  # Assuming each move costs 1
-            neighbor_node.h = heuristic(neighbor_pos, goal)
-            neighbor_node.f = neighbor_node.g + neighbor_node.h
-
-            # If a node with the same position and a lower g-cost is already in open_list, skip it
-            if any(node.position == neighbor_pos and node.g <= neighbor_node.g for _, node in open_list):
-                log_decision(f"Skipping neighbor {neighbor_pos}: already in open list with lower cost")
-                continue
-
-            heapq.heappush(open_list, (neighbor_node.f, neighbor_node))
-            log_decision(
-                f"Adding neighbor {neighbor_pos} to open list (f={neighbor_node.f}, g={neighbor_node.g}, h={neighbor_node.h})")
-
-    log_decision("No path found")
-    yield ("no_path", None)
-
-
-# Function to draw the grid and visualize algorithm elements
-def draw_grid(screen, grid, path, start, goal, open_list=[], closed_list=set(), current_node=None):
-    """Draw the grid, obstacles, and algorithm visualization elements."""
-    for y in range(len(grid)):
-        for x in range(len(grid[0])):
-            # Create a rectangle for each cell
-            rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-
-            # Determine the cell color based on its state
-            if (x, y) == start:
-                color = BLUE  # Start node
-            elif (x, y) == goal:
-                color = ORANGE  # Goal node
-            elif grid[y][x] == 1:
-                color = DARK_BROWN  # Wall
-            elif (x, y) in path:
-                color = GREEN  # Final path
-            elif (x, y) in closed_list:
-                color = RED  # Evaluated nodes (closed set)
-            elif any(node.position == (x, y) for _, node in open_list):
-                color = LIGHT_BLUE  # Nodes in the open set
-            else:
-                color = WHITE  # Unvisited cell
+# Generator-based searches that yield state after each decision step
+# (the searches themselves live in grid_astar.py and jump_point_search.py)
+SEARCHES = {
+    "astar": grid_astar.astar_steps,
+    "jps": jump_point_search.jps_steps,
+    "hpa": hpa_star.hpa_steps,
+}
+
+
+def astar_steps(grid, start, goal, log=decision_log, algorithm=SEARCH_ALGORITHM):
+    """Run the selected search on an OccupancyGrid, logging to the visualiser's decision log."""
+    return SEARCHES[algorithm](grid, start, goal, log)
+
+
+# Functions to draw the grid and visualize algorithm elements.
+# The grid lives on a persistent surface: it is drawn in full once, then each
+# search step only repaints the cells that changed.
+def cell_rect(position):
+    """Screen rectangle of the cell at (x, y)."""
+    return pygame.Rect(position[0] * CELL_SIZE, position[1] * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+
+
+def draw_cell(surface, position, color):
+    """Paint a single cell (with its border when cells are big enough to show one)."""
+    rect = cell_rect(position)
+    pygame.draw.rect(surface, color, rect)
+    if CELL_SIZE > 3:
+        pygame.draw.rect(surface, BLACK, rect, 1)  # Draw cell borders
+
 
-            pygame.draw.rect(screen, color, rect)
-            pygame.draw.rect(screen, BLACK, rect, 1)  # Draw cell borders
+def draw_grid(surface, grid, start, goal):
+    """Draw the empty grid, obstacles, start and goal of an OccupancyGrid onto the surface."""
+    surface.fill(WHITE)
+    if CELL_SIZE > 3:
+        for x in range(grid.width + 1):  # Cell borders
+            pygame.draw.line(surface, BLACK, (x * CELL_SIZE, 0), (x * CELL_SIZE, grid.height * CELL_SIZE))
+        for y in range(grid.height + 1):
+            pygame.draw.line(surface, BLACK, (0, y * CELL_SIZE), (grid.width * CELL_SIZE, y * CELL_SIZE))
+    for position in grid.obstacle_positions():
+        draw_cell(surface, position, DARK_BROWN)  # Wall
+    draw_cell(surface, start, BLUE)  # Start node
+    draw_cell(surface, goal, ORANGE)  # Goal node
 
-    # Optionally highlight the current node being processed
-    if current_node:
-        cx, cy = current_node.position
-        pygame.draw.rect(screen, YELLOW, (cx * CELL_SIZE, cy * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+
+def apply_step(surface, step, start, goal):
+    """Repaint only the cells changed by one ("step", position, pushed) result."""
+    _, current, pushed = step
+    for position in pushed:
+        if position != goal:
+            draw_cell(surface, position, LIGHT_BLUE)  # Nodes in the open set
+    if current not in (start, goal):
+        draw_cell(surface, current, RED)  # Evaluated nodes (closed set)
+
+
+def draw_path(surface, path, start, goal):
+    """Paint the final path onto the surface."""
+    for position in path:
+        if position not in (start, goal):
+            draw_cell(surface, position, GREEN)  # Final path
 
 
 # Function to draw the log panel below the grid
-def draw_logs(screen, log_messages, font):
+def draw_logs(screen, decision_log, font):
     """Draw the log panel displaying decision logs."""
     log_y_start = GRID_HEIGHT * CELL_SIZE  # Starting y coordinate for log panel
     log_panel_rect = pygame.Rect(0, log_y_start, WINDOW_WIDTH, LOG_PANEL_HEIGHT)
@@ -172,7 +122,7 @@ def draw_logs(screen, log_messages, font):
 
     line_height = font.get_linesize()
     max_lines = LOG_PANEL_HEIGHT // line_height
-    messages_to_draw = log_messages[-max_lines:]
+    messages_to_draw = decision_log.recent(max_lines)  # only the visible lines are formatted
 
     for i, message in enumerate(messages_to_draw):
         text_surface = font.render(message, True, BLACK)
@@ -183,89 +133,102 @@ def draw_logs(screen, log_messages, font):
 if __name__ == "__main__":
     pygame.init()
     screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-    pygame.display.set_caption("A* Algorithm Visualization with Logs")
+    pygame.display.set_caption(f"{SEARCH_ALGORITHM.upper()} Algorithm Visualization with Logs")
     clock = pygame.time.Clock()
     font = pygame.font.SysFont(None, 20)  # Default font, size 20 for logs
 
     # Generate a random grid with obstacles
-    grid = [[0 for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
     obstacle_probability = 0.2  # 20% chance for each cell to be an obstacle
-    for y in range(GRID_HEIGHT):
-        for x in range(GRID_WIDTH):
-            if random.random() < obstacle_probability:
-                grid[y][x] = 1
+    grid = OccupancyGrid.random(GRID_WIDTH, GRID_HEIGHT, obstacle_probability)
 
     # Ensure the start and goal positions are not obstacles
     start = (0, 0)
     goal = (GRID_WIDTH - 1, GRID_HEIGHT - 1)
-    grid[start[1]][start[0]] = 0
-    grid[goal[1]][goal[0]] = 0
+    grid.set_blocked(start, False)
+    grid.set_blocked(goal, False)
+
+    # Persistent surface holding the grid; search steps update it incrementally
+    grid_surface = pygame.Surface((GRID_WIDTH * CELL_SIZE, GRID_HEIGHT * CELL_SIZE))
+    draw_grid(grid_surface, grid, start, goal)
 
     # Variable to hold the final path (if found)
     final_path = []
     running = True
+    searching = True
 
     # Create the A* generator
     astar_gen = astar_steps(grid, start, goal)
 
     # Main loop to run the A* algorithm step by step
-    while running:
-        try:
-            result = next(astar_gen)
-        except StopIteration:
+    while running and searching:
+        # Process events (to allow toggling stepwise and turbo mode)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_s:
+                    stepwise_mode = not stepwise_mode
+                elif event.key == pygame.K_t:
+                    turbo_mode = not turbo_mode
+
+        # Advance the search: one step normally, many in turbo mode
+        current = None
+        for _ in range(TURBO_STEPS_PER_FRAME if turbo_mode and not stepwise_mode else 1):
+            try:
+                result = next(astar_gen)
+            except StopIteration:
+                searching = False
+                break
+
+            # Check the result from the generator
+            if result[0] == "path":
+                final_path = result[1]
+                searching = False
+                break
+            elif result[0] == "no_path":
+                final_path = []
+                searching = False
+                break
+            else:
+                apply_step(grid_surface, result, start, goal)
+                current = result[1]
+        if not searching:
             break
 
-        # Check the result from the generator
-        if isinstance(result, tuple) and result[0] == "path":
-            final_path = result[1]
-            break
-        elif isinstance(result, tuple) and result[0] == "no_path":
-            final_path = []
-            break
+        # Draw the current state, highlighting the current node being processed
+        screen.blit(grid_surface, (0, 0))
+        if current:
+            pygame.draw.rect(screen, YELLOW, cell_rect(current))
+        draw_logs(screen, decision_log, font)
+
+        # If stepwise mode is active, wait for ENTER to advance; otherwise, auto-advance
+        if stepwise_mode:
+            step_msg = "Stepwise Mode: Press ENTER to advance, 's' to toggle off"
+            text_surface = font.render(step_msg, True, BLACK)
+            screen.blit(text_surface, (5, WINDOW_HEIGHT - LOG_PANEL_HEIGHT - 30))
+            pygame.display.flip()
+            waiting = True
+            while waiting:
+                for event in pygame.event.get():
+                    if event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_RETURN:
+                            waiting = False
+                        elif event.key == pygame.K_s:
+                            stepwise_mode = False
+                            waiting = False
         else:
-            # Unpack current state: current_node, open_list, and closed_list
-            current_node, open_list, closed_list = result
-
-            # Process events (to allow toggling stepwise mode)
-            for event in pygame.event.get():
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_s:
-                        stepwise_mode = not stepwise_mode
-
-            # Clear screen and draw current state
-            screen.fill(WHITE)
-            # During the search, we don't have a final path yet so pass an empty list for path
-            draw_grid(screen, grid, [], start, goal, open_list, closed_list, current_node)
-            draw_logs(screen, log_messages, font)
-
-            # If stepwise mode is active, wait for ENTER to advance; otherwise, auto-advance
-            if stepwise_mode:
-                step_msg = "Stepwise Mode: Press ENTER to advance, 's' to toggle off"
-                text_surface = font.render(step_msg, True, BLACK)
-                screen.blit(text_surface, (5, WINDOW_HEIGHT - LOG_PANEL_HEIGHT - 30))
-                pygame.display.flip()
-                waiting = True
-                while waiting:
-                    for event in pygame.event.get():
-                        if event.type == pygame.KEYDOWN:
-                            if event.key == pygame.K_RETURN:
-                                waiting = False
-                            elif event.key == pygame.K_s:
-                                stepwise_mode = False
-                                waiting = False
-            else:
-                pygame.display.flip()
-                pygame.event.pump()
-                clock.tick(ANIMATION_SPEED)
+            pygame.display.flip()
+            clock.tick(TURBO_FPS if turbo_mode else ANIMATION_SPEED)
 
     # After the search finishes, display the final result (grid + log panel) until the window is closed
+    draw_path(grid_surface, final_path, start, goal)
     while running:
-        screen.fill(WHITE)
-        draw_grid(screen, grid, final_path, start, goal)
-        draw_logs(screen, log_messages, font)
+        screen.blit(grid_surface, (0, 0))
+        draw_logs(screen, decision_log, font)
         pygame.display.flip()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+        clock.tick(TURBO_FPS)
 
     pygame.quit()
\ No newline at end of file
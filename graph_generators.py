@@ -0,0 +1,53 @@
+"""
+Random graph generators for testing and benchmarking the A* graph search.
+"""
+
+import math
+import random
+
+import astar_core
+
+
+def random_geometric_graph(num_nodes, average_degree=6, seed=None, graph=None):
+    """
+    Build a random geometric graph: nodes are scattered uniformly over a square and
+    every pair closer than a connection radius is joined by an edge.
+
+    The square grows with the number of nodes (about 1000 units per 1000 nodes along
+    each side) and the radius is picked so that each node has about average_degree
+    neighbours. Edges get the default Manhattan cost, so the Manhattan heuristic used
+    by astar_search stays admissible.
+
+    Nearby pairs are found with a bucket grid of radius-sized cells, so building the
+    graph is linear in the number of nodes and edges (10^6 nodes is fine).
+
+    :return: an astar_core.Graph (or the given graph, filled in).
+    """
+    rng = random.Random(seed)
+    if graph is None:
+        graph = astar_core.Graph()
+    side = 1000 * math.sqrt(num_nodes / 1000)
+    # Expected neighbours = density * pi * r^2, so solve for r.
+    radius = math.sqrt(average_degree * side * side / (math.pi * num_nodes))
+
+    buckets = {}  # (cell_x, cell_y) -> list of nodes in that cell
+    for _ in range(num_nodes):
+        node = graph.add_node(astar_core.Node((rng.uniform(0, side), rng.uniform(0, side))))
+        cell = (int(node.pos[0] // radius), int(node.pos[1] // radius))
+        buckets.setdefault(cell, []).append(node)
+
+    radius_squared = radius * radius
+    for (cell_x, cell_y), cell_nodes in buckets.items():
+        # Only look "forward" at half of the 8 neighbouring cells so each pair is seen once.
+        for dx, dy in ((0, 0), (1, 0), (-1, 1), (0, 1), (1, 1)):
+            other_nodes = buckets.get((cell_x + dx, cell_y + dy))
+            if other_nodes is None:
+                continue
+            for i, node in enumerate(cell_nodes):
+                candidates = other_nodes[i + 1:] if (dx, dy) == (0, 0) else other_nodes
+                x, y = node.pos
+                for other in candidates:
+                    ox, oy = other.pos
+                    if (x - ox) * (x - ox) + (y - oy) * (y - oy) <= radius_squared:
+                        graph.add_edge(astar_core.Edge(node, other))
+    return graph
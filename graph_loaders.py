@@ -0,0 +1,213 @@
+"""
+Loaders for large graph files
+-----------------------------
+Reads road-network style graph files straight into a csr_graph.CSRGraph, so
+dijkstra() and astar_core.astar_search_csr() can run on them:
+
+ • DIMACS shortest-path files (.gr): "p sp <nodes> <arcs>" then one
+   "a <from> <to> <weight>" line per arc, with 1-based node ids. A matching
+   coordinate file (.co, "v <id> <x> <y>" lines) can be loaded too, for A*.
+ • Edge-list CSV files: one "source,target,weight" row per edge (a header row is
+   skipped). Node names may be any strings.
+
+Edges are streamed in blocks into flat arrays, so no Python tuple is built per
+edge. The first load of a file writes a binary cache next to it (a directory
+of .npy files). Later loads memory-map the cache, so they start almost
+instantly and only the pages a search touches are read from disk. The cache
+also records the options it was built with (undirected, the coordinate file
+and its modification time). It is rebuilt whenever the source file is newer or
+the options differ.
+
+    csr = load_graph("USA-road-d.NY.gr", coordinates="USA-road-d.NY.co")
+    distances = dijkstra(csr, 0)
+"""
+
+import csv
+import json
+import os
+from array import array
+from itertools import islice
+
+import numpy as np
+
+from csr_graph import CSRGraph
+
+BLOCK_LINES = 1 << 20  # lines parsed per block while streaming a file
+CACHE_SUFFIX = ".cache"
+CACHE_ARRAYS = ("offsets", "targets", "weights", "names", "positions")
+CACHE_OPTIONS = "options.json"  # the load_graph options the cache was built with
+SCALE_FILE = "position_scale.npy"  # CSRGraph.heuristic_scale(), so a cached load need not scan every edge
+
+
+# --------------------------
+# DIMACS
+# --------------------------
+def read_dimacs_lines(path, kind, columns):
+    """
+    Stream the lines of a DIMACS file starting with kind ("a" or "v") and parse
+    their numbers block by block. Returns an int64 array of shape (lines, columns).
+    """
+    blocks = []
+    with open(path) as file:
+        while True:
+            lines = list(islice(file, BLOCK_LINES))
+            if not lines:
+                break
+            text = " ".join(line[2:] for line in lines if line.startswith(kind))
+            blocks.append(np.fromstring(text, dtype=np.int64, sep=" "))
+    values = np.concatenate(blocks) if blocks else np.zeros(0, dtype=np.int64)
+    return values.reshape(-1, columns)
+
+
+def read_dimacs_size(path):
+    """Node count from the "p sp <nodes> <arcs>" problem line."""
+    with open(path) as file:
+        for line in file:
+            if line.startswith("p"):
+                return int(line.split()[2])
+    raise ValueError(f"{path}: no 'p sp' problem line")
+
+
+def load_dimacs(path, coordinates=None):
+    """
+    Parse a DIMACS .gr file (and optionally its .co coordinates) into a CSRGraph.
+    Node ids are the DIMACS ids minus one. With coordinates, the heuristic scale
+    (weight per coordinate unit, see CSRGraph.heuristic_scale) is computed here.
+    """
+    num_nodes = read_dimacs_size(path)
+    arcs = read_dimacs_lines(path, "a", 3)
+    positions = None
+    if coordinates is not None:
+        vertices = read_dimacs_lines(coordinates, "v", 3)
+        positions = np.zeros((num_nodes, 2), dtype=np.float64)
+        positions[vertices[:, 0] - 1] = vertices[:, 1:]
+    csr = CSRGraph.from_edges(arcs[:, 0] - 1, arcs[:, 1] - 1, arcs[:, 2], num_nodes, positions=positions)
+    if positions is not None:
+        csr.heuristic_scale()
+    return csr
+
+
+# --------------------------
+# CSV edge lists
+# --------------------------
+def load_csv(path, undirected=False):
+    """
+    Parse a source,target,weight CSV file into a CSRGraph with string node names.
+    :param undirected: also add every edge in the opposite direction.
+    """
+    index = {}
+    sources = array("q")
+    targets = array("q")
+    weights = array("d")
+    with open(path, newline="") as file:
+        for row in csv.reader(file):
+            if len(row) < 3 or not row[0].strip():
+                continue
+            try:
+                weight = float(row[2])
+            except ValueError:
+                continue  # the header row
+            for column, ids in ((0, sources), (1, targets)):
+                name = row[column].strip()
+                node = index.get(name)
+                if node is None:
+                    node = index[name] = len(index)
+                ids.append(node)
+            weights.append(weight)
+    sources = np.frombuffer(sources, dtype=np.int64)
+    targets = np.frombuffer(targets, dtype=np.int64)
+    weights = np.frombuffer(weights, dtype=np.float64)
+    if undirected:
+        sources, targets = np.concatenate([sources, targets]), np.concatenate([targets, sources])
+        weights = np.concatenate([weights, weights])
+    if len(weights) and np.all(weights == np.floor(weights)):
+        weights = weights.astype(np.int64)  # keep integer distances for integer weights
+    names = np.array(list(index)) if index else np.zeros(0, dtype=str)
+    csr = CSRGraph.from_edges(sources, targets, weights, len(index), names)
+    csr.name_index = index
+    return csr
+
+
+# --------------------------
+# Binary cache
+# --------------------------
+def save_cache(csr, directory):
+    """Write the graph's arrays as .npy files into directory."""
+    os.makedirs(directory, exist_ok=True)
+    for name in CACHE_ARRAYS:
+        value = getattr(csr, name)
+        if name == "names" and not csr.has_names:
+            value = None
+        filename = os.path.join(directory, name + ".npy")
+        if value is not None:
+            np.save(filename, np.asarray(value))
+        elif os.path.exists(filename):
+            os.remove(filename)  # left over from a build with other options (e.g. positions)
+    if csr.positions is not None:
+        np.save(os.path.join(directory, SCALE_FILE), np.float64(csr.heuristic_scale()))
+
+
+def load_cache(directory):
+    """Memory-map a graph written by save_cache (the arrays are read-only)."""
+    arrays = {}
+    for name in CACHE_ARRAYS:
+        filename = os.path.join(directory, name + ".npy")
+        arrays[name] = np.load(filename, mmap_mode="r") if os.path.exists(filename) else None
+    csr = CSRGraph(arrays["offsets"], arrays["targets"], arrays["weights"],
+                   arrays["names"], arrays["positions"])
+    scale_file = os.path.join(directory, SCALE_FILE)
+    if csr.positions is not None and os.path.exists(scale_file):
+        csr.position_scale = float(np.load(scale_file))
+    return csr
+
+
+def cache_options(coordinates, undirected):
+    """The load_graph options a cache depends on, as a JSON-friendly dict."""
+    return {
+        "undirected": bool(undirected),
+        "coordinates": os.path.abspath(coordinates) if coordinates is not None else None,
+        "coordinates_mtime": os.path.getmtime(coordinates) if coordinates is not None else None,
+    }
+
+
+def cache_is_fresh(directory, options, *sources):
+    """True if the cache exists, was built with the same options and is newer than every source file."""
+    marker = os.path.join(directory, "offsets.npy")
+    options_file = os.path.join(directory, CACHE_OPTIONS)
+    if not os.path.exists(marker) or not os.path.exists(options_file):
+        return False
+    with open(options_file) as file:
+        try:
+            if json.load(file) != options:
+                return False
+        except ValueError:
+            return False  # a cache written only partly
+    built = os.path.getmtime(marker)
+    return all(os.path.getmtime(source) <= built for source in sources if source is not None)
+
+
+def load_graph(path, coordinates=None, undirected=False, cache=True):
+    """
+    Load a .gr or .csv graph file as a CSRGraph, going through the binary cache
+    (path + ".cache") unless cache is False.
+    :param coordinates: DIMACS .co file with node positions (.gr files only).
+    :param undirected: add reverse edges (.csv files only; DIMACS lists both directions itself).
+    """
+    directory = path + CACHE_SUFFIX
+    options = cache_options(coordinates, undirected)
+    if cache and cache_is_fresh(directory, options, path, coordinates):
+        return load_cache(directory)
+    if path.endswith(".gr"):
+        csr = load_dimacs(path, coordinates)
+    elif path.endswith(".csv"):
+        csr = load_csv(path, undirected)
+    else:
+        raise ValueError(f"{path}: expected a DIMACS .gr or an edge-list .csv file")
+    if cache:
+        options_file = os.path.join(directory, CACHE_OPTIONS)
+        if os.path.exists(options_file):
+            os.remove(options_file)  # the old cache is invalid until the new one is complete
+        save_cache(csr, directory)
+        with open(options_file, "w") as file:
+            json.dump(options, file)
+    return csr
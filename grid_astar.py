@@ -0,0 +1,143 @@
+"""
+Grid A* search (no pygame needed)
+---------------------------------
+The step-by-step A* from "exploring the astar algorithm.py", working on an
+occupancy_grid.OccupancyGrid so it can be imported by benchmarks and other tools.
+
+Cells are handled by their flat index into the padded grid: neighbours are found
+by adding the grid's neighbour offsets, and the wall border means no bounds
+checks are needed. Costs, parents and the closed set are kept in flat
+dicts/bytearrays instead of one Node object per cell, which keeps
+multi-million-cell maps within memory.
+
+    for step in astar_steps(grid, (0, 0), (999, 999)):
+        ...
+
+Every move costs 1, so f grows by 0 or 2 per step and the open list is a
+bucket_queue.BucketQueue by default (queue="heap" uses heapq instead).
+"""
+
+from bucket_queue import make_queue
+from decision_log import OFF, SUMMARY, STEPS, DETAIL
+
+
+# Heuristic function using Manhattan distance
+def heuristic(current, goal):
+    """Calculate the Manhattan distance between current and goal positions."""
+    return abs(current[0] - goal[0]) + abs(current[1] - goal[1])
+
+
+# Generator-based A* algorithm that yields state after each decision step.
+def astar_steps(grid, start, goal, log=None, queue="auto"):
+    """
+    Perform the A* pathfinding algorithm on an OccupancyGrid as a generator.
+    After processing each node it yields only what changed in that step:
+        ("step", position, pushed)
+    position (x, y) was popped from the open list and is now closed, and pushed
+    lists the positions added to the open list while expanding it.
+    When the goal is reached, yields a tuple ("path", final_path) and returns.
+    If no path is found, yields ("no_path", None) at the end.
+    Decisions are recorded in log (a DecisionLog) up to its level; None skips logging.
+    queue picks the open list: "auto"/"bucket" (Dial's buckets) or "heap".
+    """
+    level = log.level if log is not None else OFF
+    steps = level >= STEPS
+    detail = level >= DETAIL
+
+    cells = grid.flat_cells()  # 1 = wall (the border included)
+    stride = grid.stride
+    offsets = grid.neighbor_offsets
+    start_index = grid.index(start)
+    goal_index = grid.index(goal)
+    goal_x, goal_y = goal[0] + 1, goal[1] + 1  # goal in padded coordinates
+
+    # Priority queue of f -> (h, index). With a heap, ties go to the node nearer the goal;
+    # with buckets, to the newest entry, which has a similar effect
+    start_h = heuristic(start, goal)
+    open_list = make_queue(queue, 2, start_h)  # a step changes f by 0 or +2
+    push, pop = open_list.push, open_list.pop
+    closed = bytearray(len(cells))  # closed[index] == 1 once a cell has been evaluated
+    best_g = {start_index: 0}  # Cheapest known cost to each cell pushed onto the open list
+    parent = {start_index: None}  # Parent cell for path reconstruction
+
+    push(start_h, (start_h, start_index))
+    if level >= SUMMARY:
+        log.add(SUMMARY, "Starting A* from {} to {}", start, goal)
+
+    while open_list:
+        # Pop the node with the lowest f cost
+        f, (h, current) = pop()
+        g = f - h
+        # Lazy deletion: skip entries superseded by a cheaper push of the same cell
+        if closed[current] or g > best_g[current]:
+            continue
+        if steps:
+            log.add(STEPS, "Processing node {} (f={}, g={}, h={})", grid.position(current), f, g, h)
+
+        # Check if the goal is reached
+        if current == goal_index:
+            yield ("step", goal, [])
+            if level >= SUMMARY:
+                log.add(SUMMARY, "Goal reached at {}. Reconstructing path...", goal)
+            path = []
+            while current is not None:
+                path.append(grid.position(current))
+                current = parent[current]
+            yield ("path", path[::-1])  # Yield final path (from start to goal)
+            return
+
+        closed[current] = 1
+        pushed = []  # Positions added to the open list in this step
+        neighbor_g = g + 1  # Each move costs 1
+
+        # Explore neighbors (up, down, left, right); the wall border makes bounds checks unnecessary
+        for offset in offsets:
+            neighbor = current + offset
+
+            # Skip if the neighbor is an obstacle (or the border)
+            if cells[neighbor]:
+                if detail:
+                    log.add(DETAIL, "Skipping neighbor {}: obstacle", grid.position(neighbor))
+                continue
+
+            # Skip if the neighbor has already been evaluated
+            if closed[neighbor]:
+                if detail:
+                    log.add(DETAIL, "Skipping neighbor {}: already evaluated", grid.position(neighbor))
+                continue
+
+            # If the cell is already in open_list with a lower or equal g-cost, skip it
+            if neighbor_g >= best_g.get(neighbor, neighbor_g + 1):
+                if detail:
+                    log.add(DETAIL, "Skipping neighbor {}: already in open list with lower cost",
+                            grid.position(neighbor))
+                continue
+
+            y, x = divmod(neighbor, stride)
+            neighbor_h = abs(x - goal_x) + abs(y - goal_y)
+            best_g[neighbor] = neighbor_g  # any older entry for this cell is now stale
+            parent[neighbor] = current
+            push(neighbor_g + neighbor_h, (neighbor_h, neighbor))
+            position = (x - 1, y - 1)
+            pushed.append(position)
+            if detail:
+                log.add(DETAIL, "Adding neighbor {} to open list (f={}, g={}, h={})",
+                        position, neighbor_g + neighbor_h, neighbor_g, neighbor_h)
+
+        # Yield the changes for visualization
+        yield ("step", grid.position(current), pushed)
+
+    if level >= SUMMARY:
+        log.add(SUMMARY, "No path found")
+    yield ("no_path", None)
+
+
+def find_path(grid, start, goal, log=None, queue="auto"):
+    """Run astar_steps to completion. Returns (path or None, number of nodes expanded)."""
+    expanded = 0
+    for result in astar_steps(grid, start, goal, log, queue):
+        if result[0] == "step":
+            expanded += 1
+        else:
+            return result[1], expanded
+    return None, expanded
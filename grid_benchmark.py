@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Headless benchmark for the grid searches
+----------------------------------------
+Runs the same random start/goal queries with plain grid A* (grid_astar) and Jump
+Point Search (jump_point_search) on three kinds of map and reports node
+expansions, wall time and whether the path lengths agree:
+
+    open      - no obstacles at all
+    cluttered - each cell is a wall with probability --clutter
+    maze      - a perfect maze with one-cell corridors
+
+Usage:  python grid_benchmark.py [--size 500] [--queries 20] [--clutter 0.3] [--seed 0]
+"""
+
+import argparse
+import random
+import time
+
+import grid_astar
+import jump_point_search
+from occupancy_grid import OccupancyGrid
+
+SEARCHES = {
+    "astar": grid_astar.find_path,
+    "jps": jump_point_search.find_path,
+}
+
+
+def make_maps(size, clutter, seed):
+    """The three benchmark maps, by name."""
+    return {
+        "open": OccupancyGrid(size, size),
+        "cluttered": OccupancyGrid.random(size, size, clutter, seed),
+        "maze": OccupancyGrid.maze(size, size, seed),
+    }
+
+
+def random_free_cells(grid, count, rng):
+    """count random (x, y) cells that are not walls."""
+    cells = []
+    while len(cells) < count:
+        position = (rng.randrange(grid.width), rng.randrange(grid.height))
+        if not grid.is_blocked(position):
+            cells.append(position)
+    return cells
+
+
+def benchmark_map(grid, pairs):
+    """Answer every pair with every search. Returns {name: {expansions, seconds, lengths}}."""
+    results = {}
+    for name, find_path in SEARCHES.items():
+        expansions = 0
+        lengths = []
+        start_time = time.perf_counter()
+        for start, goal in pairs:
+            path, expanded = find_path(grid, start, goal)
+            expansions += expanded
+            lengths.append(None if path is None else len(path) - 1)
+        results[name] = {
+            "expansions": expansions,
+            "seconds": time.perf_counter() - start_time,
+            "lengths": lengths,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare grid A* and Jump Point Search")
+    parser.add_argument("--size", type=int, default=500, help="width and height of each map")
+    parser.add_argument("--queries", type=int, default=20, help="random start/goal queries per map")
+    parser.add_argument("--clutter", type=float, default=0.3, help="wall probability of the cluttered map")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'map':>10} {'search':>7} {'expansions':>11} {'seconds':>8} {'ms/query':>9} {'wrong':>6}")
+    for map_name, grid in make_maps(args.size, args.clutter, args.seed).items():
+        cells = random_free_cells(grid, 2 * args.queries, rng)
+        pairs = list(zip(cells[::2], cells[1::2]))
+        results = benchmark_map(grid, pairs)
+        reference = results["astar"]["lengths"]
+        for name, result in results.items():
+            wrong = sum(1 for a, b in zip(result["lengths"], reference) if a != b)
+            print(f"{map_name:>10} {name:>7} {result['expansions']:>11} {result['seconds']:>8.2f} "
+                  f"{1000 * result['seconds'] / len(pairs):>9.1f} {wrong:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+"""
+Hierarchical pathfinding (HPA*) for large grid maps
+---------------------------------------------------
+Grid A* has to expand cells in proportion to the map area between start and
+goal. HPA* builds a small "abstract" graph over the map once and searches that
+instead:
+
+ • The map is cut into square clusters of cluster_size x cluster_size cells.
+ • Along each border between two clusters, every run of cells that is free on
+   both sides is an entrance. Short runs get one crossing in the middle, long
+   runs one at each end. The cells either side of a crossing become abstract
+   nodes, joined by an edge of cost 1.
+ • Inside each cluster, the cost between every pair of its abstract nodes is
+   found with a breadth-first search that stays inside the cluster.
+ • A query links start and goal into their clusters, runs A* on the abstract
+   graph, and refines the abstract path back into cells one edge at a time,
+   only when the cells are asked for (refine() is a generator).
+
+Paths are near-optimal: they must cross cluster borders at the chosen
+entrances. When cells change, set_cells() rebuilds only the borders and
+clusters that contain them.
+
+    hpa = HierarchicalGrid(grid, cluster_size=10)
+    path = hpa.find_path((0, 0), (999, 999))
+    hpa.set_cells([((5, 7), True)])  # wall at (5, 7); only its cluster is rebuilt
+"""
+
+import heapq
+from collections import deque
+
+from decision_log import OFF, SUMMARY, STEPS, DETAIL
+
+CLUSTER_SIZE = 10
+SHORT_ENTRANCE = 6  # entrances shorter than this get a single crossing in the middle
+
+
+class HierarchicalGrid:
+    def __init__(self, grid, cluster_size=CLUSTER_SIZE):
+        """
+        Build the abstract graph over an OccupancyGrid.
+        :param cluster_size: width/height of a cluster in cells.
+        """
+        self.grid = grid
+        self.cluster_size = cluster_size
+        self.cells = bytearray(grid.flat_cells())  # kept in step with grid by set_cells()
+        self.stride = grid.stride
+        self.clusters_x = (grid.width + cluster_size - 1) // cluster_size
+        self.clusters_y = (grid.height + cluster_size - 1) // cluster_size
+        self.border_pairs = {}   # border key -> list of (a, b) crossings (flat indices)
+        self.inter = {}          # node -> {node in the neighbouring cluster: 1}
+        self.intra = {}          # node -> {node in the same cluster: cost}
+        self.cluster_nodes = {}  # (cx, cy) -> set of abstract nodes in that cluster
+        for cy in range(self.clusters_y):
+            for cx in range(self.clusters_x):
+                if cx + 1 < self.clusters_x:
+                    self.build_border(("v", cx, cy))
+                if cy + 1 < self.clusters_y:
+                    self.build_border(("h", cx, cy))
+        for cy in range(self.clusters_y):
+            for cx in range(self.clusters_x):
+                self.build_cluster((cx, cy))
+
+    # --------------------------
+    # Clusters and borders
+    # --------------------------
+    def cluster_of(self, index):
+        """(cx, cy) of the cluster containing a flat index."""
+        y, x = divmod(index, self.stride)
+        return ((x - 1) // self.cluster_size, (y - 1) // self.cluster_size)
+
+    def cluster_bounds(self, cluster):
+        """(x0, y0, x1, y1): the cluster's cells in padded coordinates, inclusive."""
+        size = self.cluster_size
+        x0, y0 = cluster[0] * size + 1, cluster[1] * size + 1
+        x1 = min(x0 + size - 1, self.grid.width)
+        y1 = min(y0 + size - 1, self.grid.height)
+        return x0, y0, x1, y1
+
+    def build_border(self, key):
+        """Find the crossings of one border and add their inter-cluster edges."""
+        for a, b in self.border_pairs.pop(key, ()):
+            del self.inter[a][b]
+            del self.inter[b][a]
+        kind, cx, cy = key
+        x0, y0, x1, y1 = self.cluster_bounds((cx, cy))
+        cells, stride = self.cells, self.stride
+        if kind == "v":
+            # Right column of (cx, cy) against the left column of (cx + 1, cy)
+            line = [y * stride + x1 for y in range(y0, y1 + 1)]
+            across = 1
+        else:
+            # Bottom row of (cx, cy) against the top row of (cx, cy + 1)
+            line = [y1 * stride + x for x in range(x0, x1 + 1)]
+            across = stride
+        pairs = []
+        run = []
+        for index in line + [None]:
+            if index is not None and not cells[index] and not cells[index + across]:
+                run.append(index)
+                continue
+            if run:
+                crossings = [run[len(run) // 2]] if len(run) < SHORT_ENTRANCE else [run[0], run[-1]]
+                pairs.extend((a, a + across) for a in crossings)
+                run = []
+        for a, b in pairs:
+            self.inter.setdefault(a, {})[b] = 1
+            self.inter.setdefault(b, {})[a] = 1
+        self.border_pairs[key] = pairs
+
+    def borders_of(self, cluster):
+        """Keys of the (up to four) borders around a cluster."""
+        cx, cy = cluster
+        keys = []
+        if cx > 0:
+            keys.append(("v", cx - 1, cy))
+        if cx + 1 < self.clusters_x:
+            keys.append(("v", cx, cy))
+        if cy > 0:
+            keys.append(("h", cx, cy - 1))
+        if cy + 1 < self.clusters_y:
+            keys.append(("h", cx, cy))
+        return keys
+
+    def build_cluster(self, cluster):
+        """Recompute the cluster's abstract nodes and the costs between them."""
+        for node in self.cluster_nodes.get(cluster, ()):
+            self.intra.pop(node, None)
+            if not self.inter.get(node, True):
+                del self.inter[node]  # no crossings left at this cell
+        nodes = set()
+        for key in self.borders_of(cluster):
+            for a, b in self.border_pairs[key]:
+                nodes.add(a if self.cluster_of(a) == cluster else b)
+        for node in nodes:
+            self.intra[node] = {}
+        # Costs are symmetric, so each search only needs the nodes not searched from yet
+        remaining = set(nodes)
+        for node in nodes:
+            remaining.discard(node)
+            if not remaining:
+                break
+            distances = self.cluster_distances(node, cluster, remaining)
+            for other in remaining:
+                if other in distances:
+                    self.intra[node][other] = self.intra[other][node] = distances[other]
+        self.cluster_nodes[cluster] = nodes
+
+    def cluster_distances(self, source, cluster, targets=None, parents=None):
+        """
+        Breadth-first search from source that stays inside the cluster.
+        Returns {index: distance}. With a set of targets the search stops once all
+        of them are reached; with a parents dict, each reached cell's parent is stored in it.
+        """
+        x0, y0, x1, y1 = self.cluster_bounds(cluster)
+        cells, stride = self.cells, self.stride
+        distances = {source: 0}
+        if targets is not None and not targets:
+            return distances
+        left = len(targets) if targets is not None else -1
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            next_distance = distances[node] + 1
+            for neighbor in (node - stride, node + stride, node - 1, node + 1):
+                if cells[neighbor] or neighbor in distances:
+                    continue
+                y, x = divmod(neighbor, stride)
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    distances[neighbor] = next_distance
+                    if parents is not None:
+                        parents[neighbor] = node
+                    queue.append(neighbor)
+                    if targets is not None and neighbor in targets:
+                        left -= 1
+                        if left == 0:
+                            return distances
+        return distances
+
+    def cluster_path(self, source, target, cluster):
+        """Shortest list of flat indices from source to target inside the cluster (or None)."""
+        parents = {source: None}
+        if target not in self.cluster_distances(source, cluster, {target}, parents):
+            return None
+        path = []
+        node = target
+        while node is not None:
+            path.append(node)
+            node = parents[node]
+        return path[::-1]
+
+    # --------------------------
+    # Map edits
+    # --------------------------
+    def set_cells(self, changes):
+        """
+        Apply ((x, y), blocked) changes to the grid and rebuild only the borders
+        and clusters that contain the changed cells.
+        """
+        borders = set()
+        clusters = set()
+        for position, blocked in changes:
+            self.grid.set_blocked(position, blocked)
+            index = self.grid.index(position)
+            self.cells[index] = 1 if blocked else 0
+            cluster = self.cluster_of(index)
+            clusters.add(cluster)
+            x0, y0, x1, y1 = self.cluster_bounds(cluster)
+            y, x = divmod(index, self.stride)
+            cx, cy = cluster
+            if x == x0 and cx > 0:
+                borders.add(("v", cx - 1, cy))
+            if x == x1 and cx + 1 < self.clusters_x:
+                borders.add(("v", cx, cy))
+            if y == y0 and cy > 0:
+                borders.add(("h", cx, cy - 1))
+            if y == y1 and cy + 1 < self.clusters_y:
+                borders.add(("h", cx, cy))
+        for key in borders:
+            self.build_border(key)
+            kind, cx, cy = key
+            clusters.add((cx, cy))
+            clusters.add((cx + 1, cy) if kind == "v" else (cx, cy + 1))
+        for cluster in clusters:
+            self.build_cluster(cluster)
+        return clusters
+
+    # --------------------------
+    # Queries
+    # --------------------------
+    def search_steps(self, start, goal, log=None):
+        """
+        A* over the abstract graph as a generator, with the same protocol as
+        grid_astar.astar_steps: ("step", position, pushed) per abstract node
+        expanded, then ("path", cells) with the refined path, or ("no_path", None).
+        """
+        for result in self.abstract_steps(start, goal, log):
+            if result[0] == "abstract":
+                yield ("path", list(self.refine(result[1])))
+            else:
+                yield result
+
+    def abstract_steps(self, start, goal, log=None):
+        """Like search_steps, but finishes with ("abstract", node indices) instead of refining the path."""
+        level = log.level if log is not None else OFF
+        steps = level >= STEPS
+        detail = level >= DETAIL
+        grid, stride = self.grid, self.stride
+        start_index, goal_index = grid.index(start), grid.index(goal)
+        if level >= SUMMARY:
+            log.add(SUMMARY, "Starting HPA* from {} to {}", start, goal)
+        if self.cells[start_index] or self.cells[goal_index]:
+            if level >= SUMMARY:
+                log.add(SUMMARY, "No path found")
+            yield ("no_path", None)
+            return
+
+        # Temporary links from the start into its cluster and from the goal's cluster to the goal
+        start_cluster, goal_cluster = self.cluster_of(start_index), self.cluster_of(goal_index)
+        targets = self.cluster_nodes[start_cluster] | {goal_index} if start_cluster == goal_cluster \
+            else self.cluster_nodes[start_cluster]
+        targets = targets - {start_index}
+        start_distances = self.cluster_distances(start_index, start_cluster, targets)
+        start_links = {node: start_distances[node] for node in targets if node in start_distances}
+        targets = self.cluster_nodes[goal_cluster] - {goal_index}
+        goal_distances = self.cluster_distances(goal_index, goal_cluster, targets)
+        goal_links = {node: goal_distances[node] for node in targets if node in goal_distances}
+        goal_y, goal_x = divmod(goal_index, stride)
+
+        open_list = [(0, 0, start_index)]
+        closed = set()
+        best_g = {start_index: 0}
+        parent = {start_index: None}
+        while open_list:
+            f, h, current = heapq.heappop(open_list)
+            g = f - h
+            if current in closed or g > best_g[current]:
+                continue
+            if steps:
+                log.add(STEPS, "Processing abstract node {} (f={}, g={}, h={})", grid.position(current), f, g, h)
+            if current == goal_index:
+                yield ("step", goal, [])
+                abstract_path = []
+                while current is not None:
+                    abstract_path.append(current)
+                    current = parent[current]
+                abstract_path.reverse()
+                if level >= SUMMARY:
+                    log.add(SUMMARY, "Goal reached through {} abstract nodes. Refining path...", len(abstract_path))
+                yield ("abstract", abstract_path)
+                return
+            closed.add(current)
+
+            neighbors = list(self.inter.get(current, {}).items())
+            if current == start_index:
+                neighbors.extend(start_links.items())
+            else:
+                neighbors.extend(self.intra.get(current, {}).items())
+                if current in goal_links:
+                    neighbors.append((goal_index, goal_links[current]))
+            pushed = []
+            for neighbor, cost in neighbors:
+                neighbor_g = g + cost
+                if neighbor in closed or neighbor_g >= best_g.get(neighbor, neighbor_g + 1):
+                    continue
+                y, x = divmod(neighbor, stride)
+                neighbor_h = abs(x - goal_x) + abs(y - goal_y)
+                best_g[neighbor] = neighbor_g
+                parent[neighbor] = current
+                heapq.heappush(open_list, (neighbor_g + neighbor_h, neighbor_h, neighbor))
+                position = (x - 1, y - 1)
+                pushed.append(position)
+                if detail:
+                    log.add(DETAIL, "Adding abstract node {} to open list (f={}, g={}, h={})",
+                            position, neighbor_g + neighbor_h, neighbor_g, neighbor_h)
+            yield ("step", grid.position(current), pushed)
+
+        if level >= SUMMARY:
+            log.add(SUMMARY, "No path found")
+        yield ("no_path", None)
+
+    def abstract_path(self, start, goal):
+        """Abstract node indices from start to goal, unrefined (pass them to refine()), or None."""
+        for result in self.abstract_steps(start, goal):
+            if result[0] != "step":
+                return result[1]
+        return None
+
+    def refine(self, abstract_path):
+        """
+        Lazily turn a list of abstract node indices into (x, y) cells: each edge is
+        only searched (inside its cluster) when the generator reaches it.
+        """
+        position = self.grid.position
+        yield position(abstract_path[0])
+        for a, b in zip(abstract_path, abstract_path[1:]):
+            cluster = self.cluster_of(a)
+            if cluster != self.cluster_of(b):
+                yield position(b)  # a crossing between neighbouring clusters
+                continue
+            for index in self.cluster_path(a, b, cluster)[1:]:
+                yield position(index)
+
+    def find_path(self, start, goal):
+        """Refined path from start to goal as a list of (x, y) cells, or None."""
+        for result in self.search_steps(start, goal):
+            if result[0] != "step":
+                return result[1]
+        return None
+
+
+def hpa_steps(grid, start, goal, log=None, cluster_size=CLUSTER_SIZE):
+    """Build a HierarchicalGrid for the grid and search it (for one-off queries such as the visualiser's)."""
+    return HierarchicalGrid(grid, cluster_size).search_steps(start, goal, log)
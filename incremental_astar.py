@@ -0,0 +1,167 @@
+"""
+Incremental replanning (Lifelong Planning A*) for the graph tool
+----------------------------------------------------------------
+astar_search starts from scratch every time. LPAStar keeps its g and rhs values
+between queries instead, so after an edge cost edit, a node drag or a deletion
+only the part of the search tree that the edit affects is repaired.
+
+    g(n)   - cost of the best path to n found so far
+    rhs(n) - one-step lookahead: min over neighbours v of g(v) + cost(v, n)
+
+A node is "consistent" when g == rhs. Edits make some nodes inconsistent; they go
+back on the open list and compute_shortest_path() only re-expands those (and the
+nodes their changes reach) until the goal is consistent again.
+
+The start and goal stay fixed for the lifetime of the planner (make a new one
+when they change). Call the matching notify method after each graph edit, then
+compute_shortest_path() for the repaired path.
+"""
+
+import heapq
+
+from astar_core import manhattan
+
+INF = float('inf')
+
+
+class LPAStar:
+    def __init__(self, graph, start, goal, heuristic=None):
+        """
+        :param graph: astar_core.Graph to plan on.
+        :param heuristic: function(node) -> estimated cost to the goal (default: Manhattan distance).
+        """
+        self.graph = graph
+        self.start = start
+        self.goal = goal
+        self.heuristic = heuristic or (lambda node: manhattan(node.pos, self.goal.pos))
+        self.reset()
+
+    def reset(self):
+        """Forget all search effort (e.g. when every heuristic value changed)."""
+        self.g = {}
+        self.rhs = {self.start: 0}
+        self.open_list = []   # heap of (key, counter, node); stale entries are skipped when popped
+        self.open_keys = {}   # node -> its current key while it is on the open list
+        self.counter = 0      # tie-breaker so nodes never get compared
+        self.expansions = 0   # total number of nodes expanded (for statistics)
+        self.push(self.start)
+
+    # --------------------------
+    # Internal helpers
+    # --------------------------
+    def g_value(self, node):
+        return self.g.get(node, INF)
+
+    def rhs_value(self, node):
+        return self.rhs.get(node, INF)
+
+    def calculate_key(self, node):
+        best = min(self.g_value(node), self.rhs_value(node))
+        return (best + self.heuristic(node), best)
+
+    def push(self, node):
+        key = self.calculate_key(node)
+        self.open_keys[node] = key
+        self.counter += 1
+        heapq.heappush(self.open_list, (key, self.counter, node))
+
+    def top_key(self):
+        """Return the smallest valid key on the open list, dropping stale entries."""
+        while self.open_list:
+            key, _, node = self.open_list[0]
+            if self.open_keys.get(node) == key:
+                return key
+            heapq.heappop(self.open_list)
+        return (INF, INF)
+
+    def update_vertex(self, node):
+        """Recompute rhs(node) and put the node on (or take it off) the open list."""
+        if node not in self.graph.adjacency:
+            return  # the node has been deleted
+        if node is not self.start:
+            best = INF
+            for neighbor, cost in self.graph.get_neighbors(node):
+                candidate = self.g_value(neighbor) + cost
+                if candidate < best:
+                    best = candidate
+            self.rhs[node] = best
+        if self.g_value(node) != self.rhs_value(node):
+            self.push(node)
+        else:
+            self.open_keys.pop(node, None)
+
+    # --------------------------
+    # Search
+    # --------------------------
+    def compute_shortest_path(self):
+        """
+        Expand inconsistent nodes until the goal's cost is settled.
+        :return: the shortest path as a list of nodes from start to goal, or None.
+        """
+        while (self.top_key() < self.calculate_key(self.goal) or
+               self.rhs_value(self.goal) != self.g_value(self.goal)):
+            if not self.open_list:
+                break
+            _, _, node = heapq.heappop(self.open_list)
+            del self.open_keys[node]
+            self.expansions += 1
+            if self.g_value(node) > self.rhs_value(node):
+                # Over-consistent: the node got cheaper, settle it
+                self.g[node] = self.rhs_value(node)
+                for neighbor, _ in self.graph.get_neighbors(node):
+                    self.update_vertex(neighbor)
+            else:
+                # Under-consistent: the node got more expensive, raise it and re-evaluate
+                self.g[node] = INF
+                self.update_vertex(node)
+                for neighbor, _ in self.graph.get_neighbors(node):
+                    self.update_vertex(neighbor)
+        return self.path()
+
+    def path(self):
+        """Follow the cheapest predecessors back from the goal. Returns None if the goal is unreachable."""
+        if self.g_value(self.goal) == INF:
+            return None
+        path = [self.goal]
+        current = self.goal
+        while current is not self.start:
+            best, best_cost = None, INF
+            for neighbor, cost in self.graph.get_neighbors(current):
+                candidate = self.g_value(neighbor) + cost
+                if candidate < best_cost:
+                    best, best_cost = neighbor, candidate
+            if best is None or len(path) > len(self.graph.nodes):
+                return None
+            path.append(best)
+            current = best
+        return path[::-1]
+
+    # --------------------------
+    # Graph edit notifications
+    # --------------------------
+    def edge_changed(self, edge):
+        """Call after an edge was added, removed or had its cost changed."""
+        self.update_vertex(edge.node1)
+        self.update_vertex(edge.node2)
+
+    def node_removed(self, node, former_neighbors):
+        """Call after a node (and its edges) was removed from the graph."""
+        self.g.pop(node, None)
+        self.rhs.pop(node, None)
+        self.open_keys.pop(node, None)
+        for neighbor in former_neighbors:
+            self.update_vertex(neighbor)
+
+    def node_moved(self, node):
+        """
+        Call after a node was dragged: its default edge costs and its heuristic changed.
+        Moving the goal changes every heuristic value, so that starts the search again.
+        """
+        if node is self.goal:
+            self.reset()
+            return
+        self.update_vertex(node)
+        if node in self.open_keys:
+            self.push(node)  # re-key with the new heuristic value
+        for neighbor, _ in self.graph.get_neighbors(node):
+            self.update_vertex(neighbor)
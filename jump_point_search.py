@@ -0,0 +1,185 @@
+"""
+Jump Point Search for 4-connected, uniform-cost grids
+-----------------------------------------------------
+On an open grid every step costs 1, so plain A* finds huge numbers of equally
+short paths and pushes nearly every cell it touches onto the heap. Jump Point
+Search (JPS) only considers one "canonical" path out of each such family of
+symmetric paths, and instead of pushing every cell it jumps along straight
+lines and pushes only the cells where the canonical path may have to turn.
+
+For 4-connected grids the canonical paths go vertical first:
+
+ • Moving vertically, a path may carry on or turn left/right at any cell, so
+   every vertical step scans sideways; a cell is a jump point when a sideways
+   scan finds one (or the goal).
+ • Moving horizontally, a path only carries on, unless the cell diagonally
+   behind is a wall while the cell above/below is free. The vertical path that
+   would normally have got there first was blocked, so that turn is "forced"
+   and the cell is a jump point.
+
+The generator follows the same protocol as grid_astar.astar_steps, so the
+visualiser can run either one:
+
+    ("step", position, pushed)  - a jump point was expanded; pushed are the jump points it found
+    ("path", path)              - every cell from start to goal
+    ("no_path", None)
+"""
+
+import heapq
+
+from decision_log import OFF, SUMMARY, STEPS, DETAIL
+from grid_astar import heuristic
+
+
+def jps_steps(grid, start, goal, log=None):
+    """
+    Perform Jump Point Search on an OccupancyGrid as a generator (see the module docstring).
+    Decisions are recorded in log (a DecisionLog) up to its level; None skips logging.
+    """
+    level = log.level if log is not None else OFF
+    steps = level >= STEPS
+    detail = level >= DETAIL
+
+    cells = grid.flat_cells()  # 1 = wall (the border included)
+    stride = grid.stride
+    start_index = grid.index(start)
+    goal_index = grid.index(goal)
+    goal_x, goal_y = goal[0] + 1, goal[1] + 1  # goal in padded coordinates
+
+    def jump_horizontal(node, step):
+        """Walk sideways from node; return the first jump point, or None at a wall."""
+        while True:
+            node += step
+            if cells[node]:
+                return None
+            if node == goal_index:
+                return node
+            # Forced turn: free cell above/below whose neighbour behind it is a wall
+            if (not cells[node - stride] and cells[node - step - stride]) or \
+                    (not cells[node + stride] and cells[node - step + stride]):
+                return node
+
+    def jump_vertical(node, step):
+        """Walk up/down from node; return the first cell whose sideways scans find a jump point."""
+        while True:
+            node += step
+            if cells[node]:
+                return None
+            if node == goal_index:
+                return node
+            if jump_horizontal(node, 1) is not None or jump_horizontal(node, -1) is not None:
+                return node
+
+    def directions(node, parent):
+        """Directions to jump in from node, pruned by the direction it was reached from."""
+        if parent is None:
+            return (-stride, stride, -1, 1)
+        difference = node - parent
+        if -stride < difference < stride:
+            # Reached moving horizontally: carry on, plus any forced vertical turns
+            step = 1 if difference > 0 else -1
+            result = [step]
+            if not cells[node - stride] and cells[node - step - stride]:
+                result.append(-stride)
+            if not cells[node + stride] and cells[node - step + stride]:
+                result.append(stride)
+            return result
+        # Reached moving vertically: carry on, or turn either way
+        return (stride if difference > 0 else -stride, -1, 1)
+
+    open_list = []  # Priority queue of (f, h, index)
+    closed = set()  # Jump points that have already been evaluated
+    best_g = {start_index: 0}  # Cheapest known cost to each jump point pushed onto the open list
+    parent = {start_index: None}  # Previous jump point for path reconstruction
+
+    start_h = heuristic(start, goal)
+    heapq.heappush(open_list, (start_h, start_h, start_index))
+    if level >= SUMMARY:
+        log.add(SUMMARY, "Starting JPS from {} to {}", start, goal)
+
+    while open_list:
+        # Pop the jump point with the lowest f cost
+        f, h, current = heapq.heappop(open_list)
+        g = f - h
+        # Lazy deletion: skip entries superseded by a cheaper push of the same jump point
+        if current in closed or g > best_g[current]:
+            continue
+        if steps:
+            log.add(STEPS, "Processing jump point {} (f={}, g={}, h={})", grid.position(current), f, g, h)
+
+        # Check if the goal is reached
+        if current == goal_index:
+            yield ("step", goal, [])
+            if level >= SUMMARY:
+                log.add(SUMMARY, "Goal reached at {}. Reconstructing path...", goal)
+            yield ("path", expand_path(grid, current, parent))
+            return
+
+        closed.add(current)
+        pushed = []  # Jump points added to the open list in this step
+
+        for step in directions(current, parent[current]):
+            if step == 1 or step == -1:
+                jump_point = jump_horizontal(current, step)
+            else:
+                jump_point = jump_vertical(current, step)
+            if jump_point is None or jump_point in closed:
+                continue
+
+            distance = jump_point - current
+            if distance < 0:
+                distance = -distance
+            if distance >= stride:
+                distance //= stride
+            jump_g = g + distance
+            if jump_g >= best_g.get(jump_point, jump_g + 1):
+                if detail:
+                    log.add(DETAIL, "Skipping jump point {}: already in open list with lower cost",
+                            grid.position(jump_point))
+                continue
+
+            y, x = divmod(jump_point, stride)
+            jump_h = abs(x - goal_x) + abs(y - goal_y)
+            best_g[jump_point] = jump_g
+            parent[jump_point] = current
+            heapq.heappush(open_list, (jump_g + jump_h, jump_h, jump_point))
+            position = (x - 1, y - 1)
+            pushed.append(position)
+            if detail:
+                log.add(DETAIL, "Adding jump point {} to open list (f={}, g={}, h={})",
+                        position, jump_g + jump_h, jump_g, jump_h)
+
+        # Yield the changes for visualization
+        yield ("step", grid.position(current), pushed)
+
+    if level >= SUMMARY:
+        log.add(SUMMARY, "No path found")
+    yield ("no_path", None)
+
+
+def expand_path(grid, node, parent):
+    """Turn the chain of jump points ending at node into the full list of cells from the start."""
+    jump_points = []
+    while node is not None:
+        jump_points.append(node)
+        node = parent[node]
+    jump_points.reverse()
+    path = [grid.position(jump_points[0])]
+    for a, b in zip(jump_points, jump_points[1:]):
+        step = grid.stride if abs(b - a) >= grid.stride else 1
+        if b < a:
+            step = -step
+        for index in range(a + step, b + step, step):
+            path.append(grid.position(index))
+    return path
+
+
+def find_path(grid, start, goal, log=None):
+    """Run jps_steps to completion. Returns (path or None, number of jump points expanded)."""
+    expanded = 0
+    for result in jps_steps(grid, start, goal, log):
+        if result[0] == "step":
+            expanded += 1
+        else:
+            return result[1], expanded
+    return None, expanded
@@ -0,0 +1,218 @@
+"""
+K shortest loopless paths (Yen's algorithm)
+-------------------------------------------
+Alternative routes between two nodes, ranked by cost: the shortest path,
+then the second shortest that differs from it, and so on. No node is
+visited twice on any of them.
+
+Yen's algorithm takes each accepted path in turn and, for every node along
+it (the spur node), searches for a detour. The path up to the spur node (the
+root) is kept, the root's other nodes are removed, and so are the edges out
+of the spur node that earlier paths with the same root already took. Each
+detour is a fresh shortest-path search, and those searches are almost all of
+the cost. Here they are made cheap by computing one thing up front:
+
+ • a Dijkstra backwards from the target gives every node's exact distance
+   to it, plus the tree of next hops along those shortest paths.
+
+A spur search is then an A* that uses those distances as its heuristic. They
+stay admissible with nodes and edges removed, because removing things can
+only make paths longer. As soon as the search pops a node whose tree path
+to the target avoids everything removed, that tree path finishes the detour
+optimally, so the search stops there. Most spur searches never get further
+than the spur node itself.
+
+    for cost, path in k_shortest_paths(csr, 'A', 'F', 3):
+        ...
+
+k_shortest_paths also accepts an astar_core.Graph (as used by "astar graph.py"),
+whose paths are then lists of its Node objects.
+"""
+
+import heapq
+from itertools import count
+
+import numpy as np
+
+from csr_graph import CSRGraph
+
+INF = float('inf')
+
+
+class ReverseTree:
+    def __init__(self, csr, target):
+        """
+        Dijkstra from node id target over the reversed edges of a CSRGraph.
+        distances[v] is the cost from v to target and next_edges[v] the edge
+        v takes along its shortest path (-1 at the target or if unreachable).
+        """
+        self.csr = csr
+        self.target = target
+        num_nodes = csr.num_nodes
+        # Source node of every edge and the edges entering each node (a reverse CSR of edge ids)
+        sources = np.repeat(np.arange(num_nodes, dtype=np.int64), np.diff(csr.offsets))
+        in_edges = np.argsort(csr.targets, kind="stable")
+        in_offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(csr.targets, minlength=num_nodes), out=in_offsets[1:])
+        self.sources = sources
+        self.distances = np.full(num_nodes, INF)
+        self.next_edges = np.full(num_nodes, -1, dtype=np.int64)
+
+        distance_of = memoryview(self.distances)
+        next_of = memoryview(self.next_edges)
+        source_of = memoryview(sources)
+        weights = memoryview(csr.weights)
+        in_edge_of = memoryview(in_edges)
+        in_offset_of = memoryview(in_offsets)
+        distance_of[target] = 0
+        queue = [(0, target)]
+        while queue:
+            current_distance, current_node = heapq.heappop(queue)
+            if current_distance > distance_of[current_node]:
+                continue
+            for position in range(in_offset_of[current_node], in_offset_of[current_node + 1]):
+                edge = in_edge_of[position]
+                neighbor = source_of[edge]
+                distance = current_distance + weights[edge]
+                if distance < distance_of[neighbor]:
+                    distance_of[neighbor] = distance
+                    next_of[neighbor] = edge
+                    heapq.heappush(queue, (distance, neighbor))
+
+    def tree_path(self, node):
+        """(node ids, edge ids) of the tree path from node to the target (None if unreachable)."""
+        if self.distances[node] == INF:
+            return None
+        targets, next_edges = self.csr.targets, self.next_edges
+        nodes, edges = [node], []
+        while node != self.target:
+            edge = int(next_edges[node])
+            node = int(targets[edge])
+            edges.append(edge)
+            nodes.append(node)
+        return nodes, edges
+
+
+def spur_search(tree, spur, removed_nodes, removed_edges):
+    """
+    Cheapest path from node id spur to the tree's target that avoids the node
+    ids in removed_nodes and the edge ids in removed_edges. A* guided by the
+    tree's exact distances; stops at the first popped node whose tree path
+    is untouched by the removals.
+    Returns (cost, node ids, edge ids), or None if the target cannot be reached.
+    """
+    csr = tree.csr
+    offsets = memoryview(csr.offsets)
+    targets = memoryview(csr.targets)
+    weights = memoryview(csr.weights)
+    h = memoryview(tree.distances)
+    next_of = memoryview(tree.next_edges)
+    target = tree.target
+    clean = {target: True}  # node -> its tree path avoids every removed node and edge
+
+    def tree_is_clean(node):
+        walked = []
+        while node not in clean:
+            edge = next_of[node]
+            if edge < 0 or node in removed_nodes or edge in removed_edges:
+                clean[node] = False
+                break
+            walked.append(node)
+            node = targets[edge]
+        result = clean[node]
+        for node in walked:
+            clean[node] = result
+        return result
+
+    g = {spur: 0}
+    parent = {spur: None}  # node -> (previous node, edge) on the best known path
+    closed = set()
+    open_list = [(h[spur], spur)]
+    while open_list:
+        _, current = heapq.heappop(open_list)
+        if current in closed:
+            continue
+        if tree_is_clean(current):
+            # Finish along the reverse tree, which is optimal from here
+            nodes, edges = tree.tree_path(current)
+            cost = g[current] + h[current]
+            while parent[current] is not None:
+                current, edge = parent[current]
+                nodes.insert(0, current)
+                edges.insert(0, edge)
+            return cost, nodes, edges
+        closed.add(current)
+        current_g = g[current]
+        for edge in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[edge]
+            if neighbor in closed or neighbor in removed_nodes or edge in removed_edges or h[neighbor] == INF:
+                continue
+            tentative_g = current_g + weights[edge]
+            if tentative_g < g.get(neighbor, INF):
+                g[neighbor] = tentative_g
+                parent[neighbor] = (current, edge)
+                heapq.heappush(open_list, (tentative_g + h[neighbor], neighbor))
+    return None
+
+
+def yen_paths(csr, source, target, tree=None):
+    """
+    Generate the loopless paths from node id source to node id target of a
+    CSRGraph in order of cost, as (cost, node ids, edge ids) tuples.
+    :param tree: a ReverseTree for target to reuse (built if not given).
+    """
+    if tree is None:
+        tree = ReverseTree(csr, target)
+    first = tree.tree_path(source)
+    if first is None:
+        return
+    weights = csr.weights
+    accepted = [(float(tree.distances[source]),) + first]
+    candidates = []  # heap of (cost, tie-break, node ids, edge ids)
+    seen = {tuple(first[1])}  # edge sequences already accepted or queued
+    tie = count()
+    while True:
+        cost, nodes, edges = accepted[-1]
+        yield cost, nodes, edges
+        root_cost = 0
+        for i in range(len(nodes) - 1):
+            spur = nodes[i]
+            root_edges = edges[:i]
+            # Edges out of the spur node already used by accepted paths sharing this root. Roots
+            # are compared edge by edge: with parallel edges, the same nodes can be a different root
+            removed_edges = {accepted_edges[i] for _, _, accepted_edges in accepted
+                             if len(accepted_edges) > i and accepted_edges[:i] == root_edges}
+            removed_nodes = set(nodes[:i])
+            spur_result = spur_search(tree, spur, removed_nodes, removed_edges)
+            if spur_result is not None:
+                spur_cost, spur_nodes, spur_edges = spur_result
+                path_edges = tuple(edges[:i]) + tuple(spur_edges)
+                if path_edges not in seen:
+                    seen.add(path_edges)
+                    heapq.heappush(candidates, (root_cost + spur_cost, next(tie),
+                                                nodes[:i] + spur_nodes, list(path_edges)))
+            root_cost += weights[edges[i]]
+        if not candidates:
+            return
+        cost, _, nodes, edges = heapq.heappop(candidates)
+        accepted.append((float(cost), nodes, edges))
+
+
+def k_shortest_paths(graph, start, goal, k):
+    """
+    Up to k loopless paths from start to goal, cheapest first, as (cost, path) pairs.
+    :param graph: a CSRGraph (start, goal and the paths use node names) or an
+                  astar_core.Graph (they are Node objects; edges work both ways).
+    """
+    if isinstance(graph, CSRGraph):
+        csr = graph
+    else:
+        csr = CSRGraph.from_dict({node: graph.get_neighbors(node) for node in graph.nodes})
+    results = []
+    if k <= 0:
+        return results
+    for cost, nodes, _ in yen_paths(csr, csr.id_of(start), csr.id_of(goal)):
+        results.append((cost, [csr.name_of(node) for node in nodes]))
+        if len(results) == k:
+            break
+    return results
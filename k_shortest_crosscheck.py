@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Brute-force check for Yen's k shortest paths
+--------------------------------------------
+Builds small random graphs and compares k_shortest.yen_paths with every
+loopless path found by a depth-first enumeration. The two lists of costs
+must match, and each returned path must be loopless, distinct and cost what
+it says. Half the graphs are multigraphs with parallel edges between the
+same two nodes, as the editor in "astar graph.py" can build: there, two
+paths with the same nodes but different edges are different paths.
+
+The graph in PARALLEL_CASE lost its cost-9 path (6 -> 2 -> 4 -> 0 through the
+second parallel 2 -> 4 edge) when roots were compared by their nodes.
+
+Usage:  python k_shortest_crosscheck.py [--graphs N] [--max-nodes N] [--k N] [--seed N]
+"""
+
+import argparse
+import random
+
+from csr_graph import CSRGraph
+from k_shortest import yen_paths
+
+# (adjacency, source, target): the regression case for parallel edges
+PARALLEL_CASE = ({0: [(1, 5), (5, 4), (5, 6)], 1: [], 2: [(4, 0), (4, 6)], 3: [(4, 5), (5, 0)],
+                  4: [(0, 2), (0, 0), (3, 2)], 5: [(1, 0), (0, 4), (1, 4)], 6: [(2, 1), (0, 0)]}, 6, 0)
+
+
+def random_graph(rng, max_nodes, parallel):
+    """Adjacency dict of a random directed graph with integer weights (zero weights allowed)."""
+    num_nodes = rng.randint(2, max_nodes)
+    adjacency = {node: [] for node in range(num_nodes)}
+    for _ in range(rng.randint(0, 3 * num_nodes)):
+        u, v = rng.randrange(num_nodes), rng.randrange(num_nodes)
+        if u == v or (not parallel and any(target == v for target, _ in adjacency[u])):
+            continue
+        adjacency[u].append((v, rng.randint(0, 9)))
+    return adjacency
+
+
+def all_path_costs(csr, source, target):
+    """Sorted costs of every loopless path from node id source to node id target."""
+    costs = []
+    on_path = {source}
+
+    def extend(node, cost):
+        if node == target:
+            costs.append(cost)
+            return
+        targets, weights = csr.neighbors(node)
+        for neighbor, weight in zip(targets.tolist(), weights.tolist()):
+            if neighbor not in on_path:
+                on_path.add(neighbor)
+                extend(neighbor, cost + weight)
+                on_path.discard(neighbor)
+
+    extend(source, 0)
+    return sorted(costs)
+
+
+def check(adjacency, source, target, k):
+    """A description of the first problem with yen_paths on this graph, or None."""
+    csr = CSRGraph.from_dict(adjacency)
+    source, target = csr.id_of(source), csr.id_of(target)
+    found = []
+    for path in yen_paths(csr, source, target):
+        found.append(path)
+        if len(found) == k:
+            break
+    expected = all_path_costs(csr, source, target)[:k]
+    costs = [cost for cost, _, _ in found]
+    if costs != expected:
+        return f"costs {costs}, expected {expected}"
+    if len({tuple(edges) for _, _, edges in found}) != len(found):
+        return "the same path was returned twice"
+    for cost, nodes, edges in found:
+        if len(set(nodes)) != len(nodes):
+            return f"path {nodes} visits a node twice"
+        if [int(csr.targets[edge]) for edge in edges] != nodes[1:] or cost != csr.weights[edges].sum():
+            return f"path {nodes} does not match its edges {edges} or its cost {cost}"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--graphs", type=int, default=500, help="random graphs to check")
+    parser.add_argument("--max-nodes", type=int, default=8, help="most nodes in a random graph")
+    parser.add_argument("--k", type=int, default=10, help="paths asked for on each graph")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    failures = 0
+    problem = check(*PARALLEL_CASE, args.k)
+    if problem is not None:
+        failures += 1
+        print(f"parallel-edge case: {problem}")
+    rng = random.Random(args.seed)
+    for number in range(args.graphs):
+        parallel = number % 2 == 1
+        adjacency = random_graph(rng, args.max_nodes, parallel)
+        problem = check(adjacency, 0, len(adjacency) - 1, rng.randint(1, args.k))
+        if problem is not None:
+            failures += 1
+            print(f"graph {number} ({'parallel edges' if parallel else 'simple'}): {problem}")
+            print(f"  {adjacency}")
+    print(f"{args.graphs + 1} graphs checked, {failures} failed")
+
+
+if __name__ == "__main__":
+    main()
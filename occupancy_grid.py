@@ -0,0 +1,174 @@
+"""
+NumPy occupancy grid for grid pathfinding
+-----------------------------------------
+The A* visualiser used to keep its map as a list of lists filled one cell at a
+time, and every neighbour lookup had to be bounds-checked. OccupancyGrid stores
+the map in a single uint8 array instead:
+
+ • The map is padded with a one-cell border of walls, so a search can step off
+   any cell without a bounds check: the border simply reads as an obstacle.
+ • Cells are addressed by a flat index into the padded array. The neighbours of
+   index i are i - stride, i + stride, i - 1 and i + 1 (up, down, left, right).
+ • Maps are generated with whole-array operations (random obstacles, smooth
+   value-noise caves), so multi-million-cell maps take well under a second.
+
+Positions passed in and out are (x, y) in map coordinates, without the border.
+"""
+
+import numpy as np
+
+FREE = 0
+BLOCKED = 1
+
+
+class OccupancyGrid:
+    def __init__(self, width, height):
+        """An empty width x height map (every cell free), surrounded by a wall border."""
+        self.width = width
+        self.height = height
+        self.stride = width + 2  # row length of the padded array
+        self.cells = np.zeros((height + 2, width + 2), dtype=np.uint8)
+        self.cells[0, :] = BLOCKED
+        self.cells[-1, :] = BLOCKED
+        self.cells[:, 0] = BLOCKED
+        self.cells[:, -1] = BLOCKED
+        # Flat-index offsets of the neighbours: up, down, left, right
+        self.neighbor_offsets = (-self.stride, self.stride, -1, 1)
+
+    # --------------------------
+    # Map generation
+    # --------------------------
+    @classmethod
+    def random(cls, width, height, obstacle_probability=0.2, seed=None):
+        """Map where every cell is independently a wall with the given probability."""
+        grid = cls(width, height)
+        rng = np.random.default_rng(seed)
+        grid.interior[:] = rng.random((height, width)) < obstacle_probability
+        return grid
+
+    @classmethod
+    def noise(cls, width, height, feature_size=8, threshold=0.6, seed=None):
+        """
+        Cave-like map from smooth value noise: random values on a coarse lattice
+        (one point every feature_size cells) are bilinearly interpolated over the
+        map, and cells above threshold become walls.
+        """
+        grid = cls(width, height)
+        rng = np.random.default_rng(seed)
+        lattice = rng.random((height // feature_size + 2, width // feature_size + 2))
+        ys = np.arange(height) / feature_size
+        xs = np.arange(width) / feature_size
+        y0 = ys.astype(np.intp)
+        x0 = xs.astype(np.intp)
+        ty = (ys - y0)[:, None]
+        tx = (xs - x0)[None, :]
+        # Interpolate along x on the two lattice rows around each cell, then along y
+        top = lattice[y0][:, x0] * (1 - tx) + lattice[y0][:, x0 + 1] * tx
+        bottom = lattice[y0 + 1][:, x0] * (1 - tx) + lattice[y0 + 1][:, x0 + 1] * tx
+        values = top * (1 - ty) + bottom * ty
+        grid.interior[:] = values > threshold
+        return grid
+
+    @classmethod
+    def maze(cls, width, height, seed=None):
+        """
+        Perfect maze with one-cell corridors (a recursive backtracker, so this one
+        is a plain Python loop). Rooms sit on even (x, y); walls fill the rest.
+        """
+        grid = cls(width, height)
+        rng = np.random.default_rng(seed)
+        interior = grid.interior
+        interior[:] = BLOCKED
+        rooms_x, rooms_y = (width + 1) // 2, (height + 1) // 2
+        visited = np.zeros((rooms_y, rooms_x), dtype=bool)
+        visited[0, 0] = True
+        interior[0, 0] = FREE
+        stack = [(0, 0)]
+        while stack:
+            x, y = stack[-1]
+            options = [(x + dx, y + dy) for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0))
+                       if 0 <= x + dx < rooms_x and 0 <= y + dy < rooms_y and not visited[y + dy, x + dx]]
+            if not options:
+                stack.pop()
+                continue
+            nx, ny = options[rng.integers(len(options))]
+            visited[ny, nx] = True
+            interior[2 * ny, 2 * nx] = FREE
+            interior[y + ny, x + nx] = FREE  # knock down the wall between the two rooms
+            stack.append((nx, ny))
+        return grid
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Map from a list of lists (or 2-D array) with 1 for walls, as the visualiser used to keep it."""
+        array = np.asarray(rows, dtype=np.uint8)
+        grid = cls(array.shape[1], array.shape[0])
+        grid.interior[:] = array != 0
+        return grid
+
+    @classmethod
+    def from_movingai(cls, path):
+        """
+        Map from a MovingAI benchmark .map file ("type octile", "height H",
+        "width W", "map", then H rows of W characters). '.', 'G' and 'S' are
+        passable; everything else ('@', 'O', 'T', 'W') is a wall.
+        """
+        with open(path) as file:
+            header = {}
+            for line in file:
+                line = line.strip()
+                if line == "map":
+                    break
+                if line:
+                    key, value = line.split(None, 1)
+                    header[key] = value
+            height, width = int(header["height"]), int(header["width"])
+            rows = [line.rstrip("\r\n") for line in file][:height]
+        characters = np.frombuffer("".join(row.ljust(width, "@")[:width] for row in rows).encode("ascii"),
+                                   dtype=np.uint8).reshape(height, width)
+        grid = cls(width, height)
+        grid.interior[:] = ~np.isin(characters, np.frombuffer(b".GS", dtype=np.uint8))
+        return grid
+
+    # --------------------------
+    # Cell access
+    # --------------------------
+    @property
+    def interior(self):
+        """View of the map without its border, indexed [y, x]."""
+        return self.cells[1:-1, 1:-1]
+
+    def index(self, position):
+        """Flat index of the (x, y) position."""
+        return (position[1] + 1) * self.stride + position[0] + 1
+
+    def position(self, index):
+        """(x, y) position of a flat index."""
+        y, x = divmod(index, self.stride)
+        return (x - 1, y - 1)
+
+    def in_bounds(self, position):
+        return 0 <= position[0] < self.width and 0 <= position[1] < self.height
+
+    def is_blocked(self, position):
+        return self.cells[position[1] + 1, position[0] + 1] == BLOCKED
+
+    def set_blocked(self, position, blocked=True):
+        self.cells[position[1] + 1, position[0] + 1] = BLOCKED if blocked else FREE
+
+    def flat_cells(self):
+        """
+        The padded map as bytes, indexed by flat index (1 = wall).
+        Indexing bytes from Python is much faster than indexing a NumPy array one
+        element at a time, so search loops read from this copy.
+        """
+        return self.cells.tobytes()
+
+    def obstacle_positions(self):
+        """(x, y) positions of every wall inside the map."""
+        ys, xs = np.nonzero(self.interior)
+        return zip(xs.tolist(), ys.tolist())
+
+    def __len__(self):
+        """Number of flat indices (including the border)."""
+        return self.cells.size
@@ -0,0 +1,207 @@
+"""
+Shortest-path query cache
+-------------------------
+Routing services see the same popular queries over and over, and the A*
+teaching tool reruns astar_search when nothing has changed. PathCache
+remembers answers until the graph changes:
+
+ • An LRU cache maps (start, goal) to (cost, path). Once it holds capacity
+   entries, the least recently used one is dropped.
+ • Every graph carries a version counter (astar_core.Graph and
+   dynamic_sssp.DynamicGraph bump theirs on every mutation). The cache
+   records the version its entries were computed for and empties itself
+   when the version moves on. Graphs without a version, such as a plain
+   CSRGraph, never change.
+ • Origins asked about at least tree_threshold times get a full
+   shortest-path tree: one Dijkstra from the origin. After that, a query
+   from it to any goal is a walk up the tree, not a search. The trees are
+   kept in their own, smaller LRU.
+
+    cache = PathCache(graph)
+    cost, path = cache.shortest_path(start, goal)  # searched
+    cost, path = cache.shortest_path(start, goal)  # cached
+    graph.add_edge(edge)                           # version bump: next query searches again
+
+Paths are lists of Nodes for an astar_core.Graph and lists of node names for a
+CSRGraph, as astar_core.astar_search returns them. Every answer is an exact
+shortest path, whether it came from a search or a tree. On an
+astar_core.Graph, misses therefore run astar_search without the Manhattan
+heuristic, because edited edge costs can be lower than their Manhattan length.
+"""
+
+import heapq
+from collections import Counter, OrderedDict
+
+import numpy as np
+
+import astar_core
+from csr_graph import CSRGraph
+
+INF = float('inf')
+
+
+class ShortestPathTree:
+    def __init__(self, csr, source):
+        """Dijkstra from node id source over a CSRGraph, keeping each node's parent."""
+        self.csr = csr
+        self.source = source
+        self.distances = np.full(csr.num_nodes, INF)
+        self.parents = np.full(csr.num_nodes, -1, dtype=np.int64)
+        distance_of = memoryview(self.distances)
+        parent_of = memoryview(self.parents)
+        offsets = memoryview(csr.offsets)
+        targets = memoryview(csr.targets)
+        weights = memoryview(csr.weights)
+        distance_of[source] = 0
+        queue = [(0, source)]
+        while queue:
+            current_distance, current_node = heapq.heappop(queue)
+            if current_distance > distance_of[current_node]:
+                continue
+            start, end = offsets[current_node], offsets[current_node + 1]
+            for neighbor, weight in zip(targets[start:end], weights[start:end]):
+                distance = current_distance + weight
+                if distance < distance_of[neighbor]:
+                    distance_of[neighbor] = distance
+                    parent_of[neighbor] = current_node
+                    heapq.heappush(queue, (distance, neighbor))
+
+    def path_to(self, target):
+        """(cost, node ids from the source to target), or (INF, None) if unreachable."""
+        cost = float(self.distances[target])
+        if cost == INF:
+            return INF, None
+        path = [target]
+        while target != self.source:
+            target = int(self.parents[target])
+            path.append(target)
+        return cost, path[::-1]
+
+
+class PathCache:
+    def __init__(self, graph, capacity=1024, tree_capacity=8, tree_threshold=3):
+        """
+        :param graph: an astar_core.Graph, a CSRGraph or a dynamic_sssp.DynamicGraph.
+        :param capacity: most (start, goal) answers kept.
+        :param tree_capacity: most shortest-path trees kept.
+        :param tree_threshold: queries from one origin before it gets a tree (0 disables trees).
+        """
+        self.graph = graph
+        self.capacity = capacity
+        self.tree_capacity = tree_capacity
+        self.tree_threshold = tree_threshold
+        self.paths = OrderedDict()     # (start, goal) -> (cost, path), least recently used first
+        self.trees = OrderedDict()     # start -> ShortestPathTree, least recently used first
+        self.origin_counts = Counter()  # start -> queries since the last invalidation
+        self.csr = None                # CSR form of the graph for the trees, built when first needed
+        self.version = self.graph_version()
+        self.hits = 0                  # answered from the (start, goal) cache
+        self.tree_hits = 0             # answered from a shortest-path tree
+        self.misses = 0                # needed a search
+
+    def graph_version(self):
+        return getattr(self.graph, "version", 0)
+
+    def invalidate(self):
+        """Forget every cached answer and tree."""
+        self.paths.clear()
+        self.trees.clear()
+        self.origin_counts.clear()
+        self.csr = None
+        self.version = self.graph_version()
+
+    def check_version(self):
+        """Drop everything if the graph has changed since it was cached."""
+        if self.graph_version() != self.version:
+            self.invalidate()
+
+    # --------------------------
+    # The (start, goal) LRU
+    # --------------------------
+    def lookup(self, start, goal):
+        """Cached (cost, path) for the current graph version, or None (nothing is searched)."""
+        self.check_version()
+        entry = self.paths.get((start, goal))
+        if entry is not None:
+            self.paths.move_to_end((start, goal))
+            self.hits += 1
+        return entry
+
+    def store(self, start, goal, cost, path):
+        """Remember an answer computed elsewhere (for example by an animated search)."""
+        self.check_version()
+        self.paths[(start, goal)] = (cost, path)
+        self.paths.move_to_end((start, goal))
+        if len(self.paths) > self.capacity:
+            self.paths.popitem(last=False)
+
+    # --------------------------
+    # Queries
+    # --------------------------
+    def shortest_path(self, start, goal):
+        """(cost, path) from start to goal, or (INF, None); searched only when not cached."""
+        entry = self.lookup(start, goal)
+        if entry is not None:
+            return entry
+        self.origin_counts[start] += 1
+        tree = self.tree_for(start)
+        if tree is not None:
+            self.tree_hits += 1
+            cost, path = tree.path_to(self.csr.id_of(goal))
+            if path is not None:
+                path = [self.csr.name_of(node) for node in path]
+        else:
+            self.misses += 1
+            cost, path = self.search(start, goal)
+        self.store(start, goal, cost, path)
+        return cost, path
+
+    def tree_for(self, start):
+        """The shortest-path tree from start, built once start is a frequent origin (else None)."""
+        tree = self.trees.get(start)
+        if tree is not None:
+            self.trees.move_to_end(start)
+            return tree
+        if not self.tree_threshold or self.origin_counts[start] < self.tree_threshold:
+            return None
+        if self.csr is None:
+            self.csr = csr_of(self.graph)
+        tree = self.trees[start] = ShortestPathTree(self.csr, self.csr.id_of(start))
+        if len(self.trees) > self.tree_capacity:
+            self.trees.popitem(last=False)
+        return tree
+
+    def search(self, start, goal):
+        """
+        One exact search with astar_core.astar_search. Returns (cost, path).
+        A Graph is searched with no heuristic (a Dijkstra that stops at the goal);
+        a CSRGraph with its scaled position heuristic, which is admissible.
+        """
+        graph = self.graph
+        if isinstance(graph, astar_core.Graph):
+            path = astar_core.astar_search(graph, start, goal, heuristic=no_heuristic)
+            return (goal.g, path) if path is not None else (INF, None)
+        csr = csr_of(graph)
+        path = astar_core.astar_search_csr(csr, start, goal)
+        if path is None:
+            return INF, None
+        cost = 0
+        ids = [csr.id_of(name) for name in path]
+        for u, v in zip(ids, ids[1:]):
+            targets, weights = csr.neighbors(u)
+            cost += weights[targets == v].min()
+        return float(cost), path
+
+
+def no_heuristic(node, goal):
+    """Heuristic of 0 everywhere, for exact searches whatever the edge costs are."""
+    return 0
+
+
+def csr_of(graph):
+    """The CSRGraph behind an astar_core.Graph (converted, nodes as names), a DynamicGraph or a CSRGraph."""
+    if isinstance(graph, CSRGraph):
+        return graph
+    if hasattr(graph, "csr"):
+        return graph.csr  # a DynamicGraph: shares the live weights
+    return CSRGraph.from_dict({node: graph.get_neighbors(node) for node in graph.nodes})
@@ -0,0 +1,151 @@
+"""
+Flow field for the enemies
+--------------------------
+Running A* for every enemy every frame is too slow, so one breadth-first
+search is run backwards from the player instead, and only when the player
+reaches a new tile. Afterwards every tile knows which neighbouring tile is
+one step closer to the player. Each enemy just looks up the tile it is
+standing on, which costs the same no matter how many enemies there are.
+
+The field is built from world_data (the level's tile ids):
+ - a tile is walkable if it is empty, has no water in it and has a solid
+   tile (ids 0-8) right below it
+ - from a walkable tile an enemy can walk one tile left or right, walk off
+   a ledge and fall to the first walkable tile below, or jump up to a
+   walkable tile up to JUMP_TILES higher in the next column
+
+Sprites are placed on the field with sprite_tile(), so the player and the
+enemies are mapped to tiles the same way.
+"""
+
+from collections import deque
+
+SOLID_TILES = range(0, 9)  # tile ids the World puts in obstacle_list
+WATER_TILES = (9, 10)
+JUMP_TILES = 2  # a jump (vel_y -15, gravity 0.7) clears about 4 tiles, so 2 leaves room for the sprite
+
+
+def sprite_tile(x, bottom, tile_size):
+    #(col, row) of a sprite from its world x and rect.bottom. The row is sampled half a tile above
+    #its feet: a sprite standing on the floor sits up to a pixel into it, so bottom - 1 would
+    #flip between the tile it stands on and the solid tile below from one frame to the next
+    return x // tile_size, (bottom - tile_size // 2) // tile_size
+
+
+class FlowField():
+    def __init__(self, world_data, max_distance=None):
+        #max_distance: tiles further than this many steps from the player get no direction
+        self.rows = len(world_data)
+        self.cols = len(world_data[0])
+        self.max_distance = max_distance
+        self.solid = [[tile in SOLID_TILES for tile in row] for row in world_data]
+        self.water = [[tile in WATER_TILES for tile in row] for row in world_data]
+        #the moves into each walkable tile, so the search can run backwards from the player
+        self.moves_into = {}
+        for row in range(self.rows):
+            for col in range(self.cols):
+                if self.walkable(col, row):
+                    for target in self.moves_from(col, row):
+                        self.moves_into.setdefault(target, []).append((col, row))
+        self.player_tile = None  # tile the field was last built for
+        self.target = None       # walkable tile the player stands on (or will land on)
+        self.next_tile = {}      # tile -> next tile on the way to the player
+
+    def walkable(self, col, row):
+        if not (0 <= col < self.cols and 0 <= row < self.rows - 1):
+            return False
+        return not self.solid[row][col] and not self.water[row][col] and self.solid[row + 1][col]
+
+    def ground_tile(self, col, row):
+        #first walkable tile at or below (col, row), or None if there is only water or a drop off the map
+        if not 0 <= col < self.cols:
+            return None
+        for row in range(max(row, 0), self.rows):
+            if self.solid[row][col] or self.water[row][col]:
+                return None
+            if self.walkable(col, row):
+                return (col, row)
+        return None
+
+    def moves_from(self, col, row):
+        #walkable tiles an enemy can reach in one step from the walkable tile (col, row)
+        moves = []
+        for next_col in (col - 1, col + 1):
+            if not 0 <= next_col < self.cols or self.solid[row][next_col]:
+                #blocked: try jumping up onto it
+                for height in range(1, JUMP_TILES + 1):
+                    if row - height < 0 or self.solid[row - height][col]:
+                        break  # no headroom
+                    if self.walkable(next_col, row - height):
+                        moves.append((next_col, row - height))
+                        break
+                continue
+            #walk across, or off the ledge and down to whatever is below
+            landing = self.ground_tile(next_col, row)
+            if landing is not None:
+                moves.append(landing)
+        return moves
+
+    def update(self, col, row):
+        #rebuild the field if the player is on a different tile. Returns True if it was rebuilt.
+        #Over water or a drop off the map there is nothing to head for, so the last field is kept
+        if (col, row) == self.player_tile:
+            return False
+        self.player_tile = (col, row)
+        target = self.ground_tile(col, row)
+        if target is None or target == self.target:
+            return False
+        self.target = target
+        self.next_tile = {}
+        #breadth first search backwards from the player's tile
+        distance = {target: 0}
+        queue = deque([target])
+        while queue:
+            tile = queue.popleft()
+            if self.max_distance is not None and distance[tile] >= self.max_distance:
+                continue
+            for previous in self.moves_into.get(tile, []):
+                if previous not in distance:
+                    distance[previous] = distance[tile] + 1
+                    self.next_tile[previous] = tile
+                    queue.append(previous)
+        return True
+
+    def direction(self, col, row):
+        #(direction, jump) for an enemy at (col, row): direction is -1 or 1 and jump says
+        #it has to jump to get there. An enemy in the air (jumping or falling) follows the
+        #tile it will land on. None if there is no route to the player from there
+        tile = (col, row) if (col, row) in self.next_tile else self.ground_tile(col, row)
+        next_tile = self.next_tile.get(tile)
+        if next_tile is None:
+            return None
+        return (1 if next_tile[0] > tile[0] else -1), next_tile[1] < tile[1]
+
+
+if __name__ == '__main__':
+    #check on the levels that a sprite standing on a walkable tile maps to that tile, both when it
+    #rests exactly on the floor and when it has sunk a pixel into it, and that a player standing
+    #still never makes the field rebuild
+    import csv
+    import glob
+    import os
+
+    TILE_SIZE = 40  # platformer.py: SCREEN_HEIGHT // ROWS
+    folder = os.path.dirname(os.path.abspath(__file__))
+    for path in sorted(glob.glob(os.path.join(folder, 'level_data*.csv'))):
+        with open(path, newline='') as csvfile:
+            world_data = [[int(tile) for tile in row] for row in csv.reader(csvfile)]
+        field = FlowField(world_data)
+        wrong = rebuilds = 0
+        for row in range(field.rows):
+            for col in range(field.cols):
+                if not field.walkable(col, row):
+                    continue
+                x = col * TILE_SIZE + TILE_SIZE // 2
+                floor = (row + 1) * TILE_SIZE
+                tiles = [sprite_tile(x, floor + sunk, TILE_SIZE) for sunk in (0, 1, 0, 1)]
+                wrong += any(tile != (col, row) for tile in tiles)
+                field.update(*tiles[0])
+                rebuilds += sum(field.update(*tile) for tile in tiles[1:])
+        print(f'{os.path.basename(path)}: {wrong} standing tiles mapped wrongly, '
+              f'{rebuilds} rebuilds while standing still')
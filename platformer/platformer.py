@@ -4,6 +4,7 @@ import os
 import random
 import csv
 import button
+from flow_field import FlowField, sprite_tile
 
 
 pygame.init()
@@ -27,6 +28,7 @@ COLS = 150
 TILE_SIZE = SCREEN_HEIGHT // ROWS
 TILE_TYPES = 21
 MAX_LEVELS = 2
+CHASE_DISTANCE = 15 #enemies this many steps (tiles) or fewer from the player follow the flow field to them
 screen_scroll = 0
 bg_scroll = 0
 level = 0
@@ -153,6 +155,7 @@ class Soldier(pygame.sprite.Sprite):
 
         #create ai specific variables
         self.move_counter = 0
+        self.field_step = False  # following the flow field rather than patrolling
         self.vision = pygame.Rect(0,0,150,20)
         self.idling = False
         self.idling_counter = 0
@@ -217,8 +220,8 @@ class Soldier(pygame.sprite.Sprite):
             #check for collision in the x direction
             if tile[1].colliderect(self.rect.x + dx, self.rect.y, self.width, self.height):
                 dx =0
-                #if ai has hit the wall then make it turn around
-                if self.char_type == 'enemy':
+                #if ai has hit the wall then make it turn around (unless the flow field says to jump it)
+                if self.char_type == 'enemy' and not self.field_step:
                     self.direction *= -1
                     self.move_counter = 0
             #check for y collision
@@ -277,6 +280,10 @@ class Soldier(pygame.sprite.Sprite):
             self.ammo -= 1
             shot_fx.play()
 
+    def tile(self):
+        #the tile the soldier is in on the flow field (same for the player and the enemies)
+        return sprite_tile(self.rect.centerx + bg_scroll, self.rect.bottom, TILE_SIZE)
+
     def ai(self):
         if self.alive and player.alive:
             if self.idling == False and random.randint(1,200) == 1:
@@ -290,6 +297,18 @@ class Soldier(pygame.sprite.Sprite):
                 self.shoot()
             else:
                 if self.idling == False:
+                    #follow the flow field if there is a route to the player, otherwise keep patrolling
+                    step = world.flow_field.direction(*self.tile())
+                    if step is not None:
+                        self.direction, jump = step
+                        self.field_step = True
+                        if jump and self.in_air == False:
+                            self.jump = True
+                    elif self.in_air == False:
+                        self.field_step = False
+                    #in the air with no step: keep the last field direction until landing
+                    if self.field_step:
+                        self.move_counter = 0
                     if self.direction == 1:
                         ai_moving_right = True
                     else:
@@ -352,6 +371,8 @@ class World():
         self.obstacle_list = []
     def process_data(self, data):
         self.level_length = len(data[0])
+        #enemies find their way to the player with this (see flow_field.py)
+        self.flow_field = FlowField(data, CHASE_DISTANCE)
         #iterate through each value in the data file
         for y, row in enumerate(data):
             for x, tile in enumerate(row):
@@ -683,6 +704,8 @@ while run:
         player.update()
         player.draw()
 
+        #rebuild the enemies' flow field if the player has moved to another tile
+        world.flow_field.update(*player.tile())
         for enemy in enemy_group:
             enemy.ai()
             enemy.update()
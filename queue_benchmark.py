@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark the bucket queue against heapq
+----------------------------------------
+Times dijkstra() over a random CSR graph with small integer weights, and grid
+A* over a random occupancy grid, once with each priority queue
+(bucket_queue.BucketQueue vs bucket_queue.HeapQueue), and checks that both give
+the same answers.
+
+Usage:  python queue_benchmark.py [--nodes 200000] [--degree 8] [--max-weight 10]
+                                  [--grid 1000] [--queries 5] [--seed 0]
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+import grid_astar
+from csr_graph import CSRGraph
+from dijkstra import shortest_distances
+from occupancy_grid import OccupancyGrid
+
+QUEUES = ("heap", "bucket")
+
+
+def random_csr(num_nodes, degree, max_weight, seed):
+    """Directed random graph with num_nodes * degree edges and integer weights 1..max_weight."""
+    rng = np.random.default_rng(seed)
+    num_edges = num_nodes * degree
+    return CSRGraph.from_edges(rng.integers(0, num_nodes, num_edges),
+                               rng.integers(0, num_nodes, num_edges),
+                               rng.integers(1, max_weight + 1, num_edges), num_nodes)
+
+
+def time_dijkstra(csr, sources):
+    """Returns {queue: (seconds, list of distance arrays)}."""
+    results = {}
+    for queue in QUEUES:
+        start_time = time.perf_counter()
+        distances = [shortest_distances(csr, source, queue) for source in sources]
+        results[queue] = (time.perf_counter() - start_time, distances)
+    return results
+
+
+def time_grid_astar(grid, pairs):
+    """Returns {queue: (seconds, expansions, list of path lengths)}."""
+    results = {}
+    for queue in QUEUES:
+        expansions = 0
+        lengths = []
+        start_time = time.perf_counter()
+        for start, goal in pairs:
+            path, expanded = grid_astar.find_path(grid, start, goal, queue=queue)
+            expansions += expanded
+            lengths.append(None if path is None else len(path))
+        results[queue] = (time.perf_counter() - start_time, expansions, lengths)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the bucket queue with heapq")
+    parser.add_argument("--nodes", type=int, default=200000, help="nodes in the random graph")
+    parser.add_argument("--degree", type=int, default=8, help="edges per node")
+    parser.add_argument("--max-weight", type=int, default=10, help="largest edge weight")
+    parser.add_argument("--grid", type=int, default=1000, help="width and height of the grid")
+    parser.add_argument("--queries", type=int, default=5, help="sources / start-goal pairs")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    csr = random_csr(args.nodes, args.degree, args.max_weight, args.seed)
+    sources = [rng.randrange(args.nodes) for _ in range(args.queries)]
+    results = time_dijkstra(csr, sources)
+    same = all(np.array_equal(a, b) for a, b in zip(results["heap"][1], results["bucket"][1]))
+    print(f"dijkstra: {args.nodes} nodes, {csr.num_edges} edges, weights 1..{args.max_weight}, "
+          f"{args.queries} sources (same distances: {same})")
+    for queue in QUEUES:
+        print(f"  {queue:>6} {results[queue][0]:8.2f} s")
+
+    grid = OccupancyGrid.random(args.grid, args.grid, 0.2, args.seed)
+    pairs = []
+    while len(pairs) < args.queries:
+        start = (rng.randrange(args.grid), rng.randrange(args.grid))
+        goal = (rng.randrange(args.grid), rng.randrange(args.grid))
+        if not grid.is_blocked(start) and not grid.is_blocked(goal):
+            pairs.append((start, goal))
+    results = time_grid_astar(grid, pairs)
+    same = results["heap"][2] == results["bucket"][2]
+    print(f"grid A*: {args.grid}x{args.grid} random map, {args.queries} queries (same path lengths: {same})")
+    for queue in QUEUES:
+        print(f"  {queue:>6} {results[queue][0]:8.2f} s {results[queue][1]:>10} expansions")
+
+
+if __name__ == "__main__":
+    main()
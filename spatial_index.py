@@ -0,0 +1,117 @@
+"""
+Uniform-grid spatial index for hit-testing nodes and edges
+-----------------------------------------------------------
+Clicking used to test Node.is_clicked / Edge.is_clicked against every node and
+edge in the graph. SpatialGrid buckets them into square cells instead, so a click
+only tests the few items in the cells around the cursor.
+
+ • A node is stored in the cell containing its centre. Queries look at the
+   neighbouring cells too, so cell_size must be at least the node radius.
+ • An edge is stored in every cell its bounding box (grown by the click
+   tolerance) overlaps.
+
+Call move_node() whenever a node is dragged (it also re-indexes the node's edges)
+and keep adds/removes in step with the graph.
+"""
+
+import math
+
+
+class SpatialGrid:
+    def __init__(self, cell_size=50, edge_tolerance=10):
+        """
+        :param cell_size: width/height of a cell in pixels (>= the largest node radius).
+        :param edge_tolerance: how far from an edge a click still counts (matches Edge.is_clicked).
+        """
+        self.cell_size = cell_size
+        self.edge_tolerance = edge_tolerance
+        self.node_cells = {}   # (cx, cy) -> set of nodes
+        self.edge_cells = {}   # (cx, cy) -> set of edges
+        self.node_cell = {}    # node -> its cell
+        self.edge_cell_list = {}  # edge -> list of cells it is stored in
+
+    def cell_of(self, pos):
+        return (int(pos[0] // self.cell_size), int(pos[1] // self.cell_size))
+
+    # --------------------------
+    # Nodes
+    # --------------------------
+    def add_node(self, node):
+        cell = self.cell_of(node.pos)
+        self.node_cells.setdefault(cell, set()).add(node)
+        self.node_cell[node] = cell
+
+    def remove_node(self, node):
+        cell = self.node_cell.pop(node)
+        self.node_cells[cell].discard(node)
+
+    def move_node(self, node, edges=()):
+        """Re-index a node after its position changed, together with its edges."""
+        cell = self.cell_of(node.pos)
+        if self.node_cell.get(node) != cell:
+            self.remove_node(node)
+            self.add_node(node)
+        for edge in edges:
+            self.remove_edge(edge)
+            self.add_edge(edge)
+
+    def node_at(self, pos):
+        """Return the clicked node closest to pos, or None."""
+        cx, cy = self.cell_of(pos)
+        best, best_distance = None, None
+        for x in (cx - 1, cx, cx + 1):
+            for y in (cy - 1, cy, cy + 1):
+                for node in self.node_cells.get((x, y), ()):
+                    if node.is_clicked(pos):
+                        distance = (node.pos[0] - pos[0]) ** 2 + (node.pos[1] - pos[1]) ** 2
+                        if best is None or distance < best_distance:
+                            best, best_distance = node, distance
+        return best
+
+    # --------------------------
+    # Edges
+    # --------------------------
+    def cells_for_edge(self, edge):
+        """Every cell overlapped by the edge's bounding box, grown by the click tolerance."""
+        (x1, y1), (x2, y2) = edge.node1.pos, edge.node2.pos
+        pad = self.edge_tolerance
+        min_x, min_y = self.cell_of((min(x1, x2) - pad, min(y1, y2) - pad))
+        max_x, max_y = self.cell_of((max(x1, x2) + pad, max(y1, y2) + pad))
+        return [(x, y) for x in range(min_x, max_x + 1) for y in range(min_y, max_y + 1)]
+
+    def add_edge(self, edge):
+        cells = self.cells_for_edge(edge)
+        for cell in cells:
+            self.edge_cells.setdefault(cell, set()).add(edge)
+        self.edge_cell_list[edge] = cells
+
+    def remove_edge(self, edge):
+        for cell in self.edge_cell_list.pop(edge):
+            self.edge_cells[cell].discard(edge)
+
+    def edge_at(self, pos):
+        """Return the clicked edge closest to pos, or None."""
+        best, best_distance = None, None
+        for edge in self.edge_cells.get(self.cell_of(pos), ()):
+            if edge.is_clicked(pos):
+                distance = point_segment_distance(pos, edge.node1.pos, edge.node2.pos)
+                if best is None or distance < best_distance:
+                    best, best_distance = edge, distance
+        return best
+
+    def clear(self):
+        self.node_cells.clear()
+        self.edge_cells.clear()
+        self.node_cell.clear()
+        self.edge_cell_list.clear()
+
+
+def point_segment_distance(pos, p1, p2):
+    """Distance from pos to the line segment p1-p2."""
+    dx, dy = p2[0] - p1[0], p2[1] - p1[1]
+    length_squared = dx * dx + dy * dy
+    if length_squared == 0:
+        return math.hypot(pos[0] - p1[0], pos[1] - p1[1])
+    u = ((pos[0] - p1[0]) * dx + (pos[1] - p1[1]) * dy) / length_squared
+    u = max(0.0, min(1.0, u))
+    return math.hypot(pos[0] - (p1[0] + u * dx), pos[1] - (p1[1] + u * dy))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Update-throughput benchmark for dynamic shortest paths
+------------------------------------------------------
+Builds a road-like grid graph (each cell joined to its 4 neighbours in both
+directions, random weights), tracks shortest-path trees from a few sources with
+dynamic_sssp.DynamicSSSP, and applies a stream of random traffic updates that
+scale edge weights by 0.5x - 2x. It reports updates per second, compares that
+with rerunning dijkstra for every source after each update, and checks the
+repaired distances against a fresh run at the end.
+
+Usage:  python sssp_benchmark.py [--size 300] [--sources 4] [--updates 2000] [--seed 0]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from dijkstra import shortest_distances
+from dynamic_sssp import DynamicGraph, DynamicSSSP
+
+
+def road_grid(size, seed):
+    """size x size grid graph with weights 10..30 on every directed edge."""
+    rng = np.random.default_rng(seed)
+    ids = np.arange(size * size).reshape(size, size)
+    pairs = [(ids[:, :-1], ids[:, 1:]), (ids[:-1, :], ids[1:, :])]  # right and down neighbours
+    sources = np.concatenate([a.ravel() for a, b in pairs] + [b.ravel() for a, b in pairs])
+    targets = np.concatenate([b.ravel() for a, b in pairs] + [a.ravel() for a, b in pairs])
+    weights = rng.integers(10, 31, len(sources)).astype(np.float64)
+    return CSRGraph.from_edges(sources, targets, weights, size * size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DynamicSSSP weight updates")
+    parser.add_argument("--size", type=int, default=300, help="grid width/height (size^2 nodes)")
+    parser.add_argument("--sources", type=int, default=4, help="tracked sources")
+    parser.add_argument("--updates", type=int, default=2000, help="random weight updates")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+
+    csr = road_grid(args.size, args.seed)
+    start_time = time.perf_counter()
+    graph = DynamicGraph(csr)
+    sources = rng.choice(csr.num_nodes, args.sources, replace=False).tolist()
+    trees = [DynamicSSSP(graph, source) for source in sources]
+    build_seconds = time.perf_counter() - start_time
+    print(f"{csr.num_nodes} nodes, {csr.num_edges} edges, {args.sources} sources "
+          f"(initial trees {build_seconds:.2f} s)")
+
+    edges = rng.integers(0, csr.num_edges, args.updates)
+    factors = rng.uniform(0.5, 2.0, args.updates)
+    settled_before = sum(tree.settled for tree in trees)
+    start_time = time.perf_counter()
+    for edge, factor in zip(edges.tolist(), factors.tolist()):
+        graph.set_weight(edge, graph.weights[edge] * factor)
+    update_seconds = time.perf_counter() - start_time
+    settled = sum(tree.settled for tree in trees) - settled_before
+
+    # Rerunning from scratch: time a few updates' worth of full searches and extrapolate
+    samples = min(3, args.updates)
+    start_time = time.perf_counter()
+    for _ in range(samples):
+        for source in sources:
+            shortest_distances(graph.csr, source)
+    rerun_seconds = (time.perf_counter() - start_time) / samples
+
+    print(f"dynamic: {args.updates / update_seconds:10.1f} updates/s "
+          f"({settled / args.updates:.1f} nodes re-settled per update over all trees)")
+    print(f"rerun:   {1 / rerun_seconds:10.1f} updates/s (dijkstra from every source each time)")
+    wrong = sum(int(not np.allclose(tree.distances, shortest_distances(graph.csr, tree.source)))
+                for tree in trees)
+    print(f"trees that differ from a fresh dijkstra: {wrong}")
+
+
+if __name__ == "__main__":
+    main()